@@ -17,11 +17,72 @@ CACHES = {
     "default": {},
     "local": {
         "backend": "spaceone.core.cache.local_cache.LocalCache",
-        "max_size": 128,
+        "max_size": 1024,
         "ttl": 300,
     },
 }
 
+# Connector Health Check Settings
+# Interval (seconds) of the health check of pooled connectors (0: disabled)
+CONNECTOR_HEALTH_CHECK_INTERVAL = 30
+
+# Secret Data Cache Settings
+# Read-through cache of backend data in SecretConnectorManager (process-wide)
+SECRET_DATA_CACHE = {
+    "enabled": False,
+    "max_size": 10000,
+    "ttl": 60,
+}
+
+# Circuit Breaker Settings
+# Calls to a backend fail fast with ERROR_SECRET_BACKEND_UNAVAILABLE for reset_timeout seconds
+# after failure_threshold consecutive failures (process-wide, per backend)
+CIRCUIT_BREAKER = {
+    "enabled": False,
+    "failure_threshold": 5,
+    "reset_timeout": 30,
+}
+
+# Hedged Read Settings
+# Reads are also sent to the secondary backend if the backend doesn't respond
+# in the percentile of its recent latencies (min_delay ~ max_delay seconds)
+HEDGED_READ = {
+    "enabled": False,
+    "backends": {
+        # "AWSSecretManagerConnector": "ReplicaAWSSecretManagerConnector",
+    },
+    "percentile": 95,
+    "min_delay": 0.01,
+    "max_delay": 1,
+    # Workers of reads of the backend (default: MAX_WORKERS) and of the secondary backend,
+    # reads are not hedged if the workers are busy
+    # "primary_max_workers": 100,
+    "max_workers": 16,
+}
+
+# Backend Retry Settings
+# Reads and deletes are retried on errors which the connector reports as retryable,
+# with jittered exponential backoff (base_delay * 2^n, up to max_delay seconds)
+# within the remaining time of the gRPC deadline
+BACKEND_RETRY = {
+    "max_retries": 2,
+    "base_delay": 0.05,
+    "max_delay": 1,
+}
+
+# Identity Cache Settings
+# Lookups of IdentityManager on the "local" cache, stale entries are served while refreshing
+IDENTITY_CACHE = {
+    "enabled": True,
+    "ttl": 30,
+    "stale_ttl": 30,
+}
+
+# Data Hash Settings
+# Base64 key of HMAC-SHA256 data_hash of plain data, if EncryptMutationHandler is not used
+# Without the key, data_hash is not kept and writes of unchanged data are not suppressed
+DATA_HASH_KEY = ""
+
 # Handler Settings
 HANDLERS = {
     # "authentication": [{
@@ -38,6 +99,14 @@ HANDLERS = {
 
 # Connector Settings
 BACKEND = "AWSSecretManagerConnector"
+BACKEND_MAX_WORKERS = 8
+# Backend of new resources, in order of domains, resource_types and domain_hash (default: BACKEND)
+# The backend is recorded on each resource, so reads and writes go to the backend where it was created
+BACKEND_ROUTING = {
+    # "domains": {"domain-xxx": "DedicatedConnector"},
+    # "resource_types": {"UserSecret": "UserSecretConnector"},
+    # "domain_hash": ["AWSSecretManagerConnector", "SecondAWSSecretManagerConnector"],
+}
 CONNECTORS = {
     "SpaceConnector": {
         "backend": "spaceone.core.connector.space_connector:SpaceConnector",
@@ -48,14 +117,47 @@ CONNECTORS = {
         # 'url': 'http://vault:8200',
         # 'token': 'myroot'
     },
-    "ConsulConnector": {"host": "consul", "port": 8500},
-    "EtcdConnector": {"host": "localhost", "port": 2379},
+    "ConsulConnector": {
+        "host": "consul",
+        "port": 8500,
+        # "mirror": {
+        #     "enabled": True,
+        #     "key_prefixes": ["secret-", "trusted-secret-", "user-secret-"],
+        #     "max_staleness": 10,
+        #     "wait": "5s",
+        # },
+    },
+    "EtcdConnector": {
+        "host": "localhost",
+        "port": 2379,
+        # "mirror": {
+        #     "enabled": True,
+        #     "key_prefixes": ["secret-", "trusted-secret-", "user-secret-"],
+        #     "max_staleness": 10,
+        #     "check_interval": 5,
+        # },
+    },
     "MongoDBConnector": {
         "host": "localhost",
         "port": 27017,
         "username": "",
         "password": "",
     },
+    "TieredSecretConnector": {
+        "durable": "AWSSecretManagerConnector",
+        "local": "MongoDBConnector",
+        # "local_plain_data": False,
+        # "reconcile_interval": 10,
+        # Seconds until a local copy is read again from the durable tier
+        # "local_ttl": 60,
+    },
+    "InMemorySecretConnector": {},
+    "SQLiteSecretConnector": {
+        "path": "/var/lib/spaceone/secret_data.db",
+        # "timeout": 5,
+        # "synchronous": "NORMAL",
+        # "max_batch_size": 500,
+    },
 }
 
 LOG = {
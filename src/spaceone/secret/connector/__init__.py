@@ -1,5 +1,29 @@
-from spaceone.secret.connector.aws_secret_manager_connector import *
-from spaceone.secret.connector.vault_connector import *
-from spaceone.secret.connector.consul_connector import *
-from spaceone.secret.connector.identity_connector import *
-from spaceone.secret.connector.mongodb_connector import *
+import importlib
+
+# Connectors are imported on first use, so that only the SDK of the configured BACKEND is loaded
+_CONNECTORS = {
+    "AWSSecretManagerConnector": "spaceone.secret.connector.aws_secret_manager_connector",
+    "VaultConnector": "spaceone.secret.connector.vault_connector",
+    "ConsulConnector": "spaceone.secret.connector.consul_connector",
+    "EtcdConnector": "spaceone.secret.connector.etcd_connector",
+    "IdentityConnector": "spaceone.secret.connector.identity_connector",
+    "MongoDBConnector": "spaceone.secret.connector.mongodb_connector",
+    "TieredSecretConnector": "spaceone.secret.connector.tiered_secret_connector",
+    "InMemorySecretConnector": "spaceone.secret.connector.in_memory_secret_connector",
+    "SQLiteSecretConnector": "spaceone.secret.connector.sqlite_secret_connector",
+}
+
+__all__ = list(_CONNECTORS)
+
+
+def __getattr__(name):
+    if name not in _CONNECTORS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    connector = getattr(importlib.import_module(_CONNECTORS[name]), name)
+    globals()[name] = connector
+    return connector
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
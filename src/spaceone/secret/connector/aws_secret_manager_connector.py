@@ -1,6 +1,8 @@
 import logging
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
 
 from spaceone.core.error import *
 from spaceone.core.connector import BaseConnector
@@ -8,6 +10,13 @@ from spaceone.core.connector import BaseConnector
 __all__ = ['AWSSecretManagerConnector']
 _LOGGER = logging.getLogger(__name__)
 
+# BatchGetSecretValue accepts up to 20 secret ids per request
+_BATCH_SIZE = 20
+
+_RETRYABLE_ERROR_CODES = ['ThrottlingException', 'InternalServiceError', 'RequestTimeout']
+# Throttled requests are rejected before they are applied, so writes are retried on them as well
+_THROTTLING_ERROR_CODES = ['ThrottlingException']
+
 
 class AWSSecretManagerConnector(BaseConnector):
 
@@ -21,11 +30,42 @@ class AWSSecretManagerConnector(BaseConnector):
         if region_name is None:
             raise ERROR_CONNECTOR_CONFIGURATION(backend='AWSSecretManagerConnector')
 
+        # botocore has no timeout per request, so the deadline of a request is not applied to the client.
+        # Retries of botocore are disabled by default, since SecretConnectorManager retries within the deadline,
+        # reads on retryable errors and writes on throttling (is_throttled).
+        client_config = Config(
+            connect_timeout=self.config.get('connect_timeout', 5),
+            read_timeout=self.config.get('read_timeout', 10),
+            retries={'max_attempts': self.config.get('max_attempts', 1), 'mode': 'standard'}
+        )
+
         if aws_access_key_id and aws_secret_access_key:
             self.client = boto3.client('secretsmanager', aws_access_key_id=aws_access_key_id,
-                                       aws_secret_access_key=aws_secret_access_key, region_name=region_name)
+                                       aws_secret_access_key=aws_secret_access_key, region_name=region_name,
+                                       config=client_config)
         else:
-            self.client = boto3.client('secretsmanager', region_name=region_name)
+            self.client = boto3.client('secretsmanager', region_name=region_name, config=client_config)
+
+    def health_check(self):
+        self.client.list_secrets(MaxResults=1)
+
+    def close(self):
+        self.client.close()
+
+    @staticmethod
+    def is_retryable(error):
+        if isinstance(error, (BotoConnectionError, ReadTimeoutError)):
+            return True
+
+        if isinstance(error, ClientError):
+            return error.response.get('Error', {}).get('Code') in _RETRYABLE_ERROR_CODES
+
+        return False
+
+    @staticmethod
+    def is_throttled(error):
+        return isinstance(error, ClientError) and \
+            error.response.get('Error', {}).get('Code') in _THROTTLING_ERROR_CODES
 
     @staticmethod
     def _convert_tags(tags):
@@ -74,3 +114,24 @@ class AWSSecretManagerConnector(BaseConnector):
 
     def get_secret(self, secret_id):
         return self._response_value(self.client.get_secret_value(SecretId=secret_id))
+
+    def get_secrets(self, secret_ids):
+        results = {}
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            params = {'SecretIdList': secret_ids[index:index + _BATCH_SIZE]}
+
+            while True:
+                response = self.client.batch_get_secret_value(**params)
+
+                for secret_value in response.get('SecretValues', []):
+                    results[secret_value['Name']] = self._response_value(secret_value)
+
+                for error in response.get('Errors', []):
+                    _LOGGER.error(f'[get_secrets] {error.get("SecretId")}: {error.get("ErrorCode")}')
+
+                if 'NextToken' not in response:
+                    break
+
+                params['NextToken'] = response['NextToken']
+
+        return results
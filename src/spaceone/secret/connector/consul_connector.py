@@ -1,21 +1,37 @@
 import logging
 import json
+import base64
+import time
 import consul
+import requests
 
 from spaceone.core.error import *
 from spaceone.core.connector import BaseConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+from spaceone.secret.lib.deadline import DeadlineSession
+from spaceone.secret.lib.secret_mirror import create_mirrors, find_mirror, read_mirrors
 
 __all__ = ['ConsulConnector']
 _LOGGER = logging.getLogger(__name__)
 
+# Consul limits a transaction to 64 operations
+_BATCH_SIZE = 64
+
 
 class ConsulConnector(BaseConnector):
     """ Consul Backend
     """
 
+    # create_secret and update_secret return ModifyIndex of the key,
+    # create_secrets and update_secrets return errors and ModifyIndex of the keys
+    supports_revision = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        mirror_conf = self.config.get('mirror') or {}
+        self.mirror_wait = mirror_conf.get('wait', '5s')
+        timeout = self.config.get('timeout')
         self.config = self._validate_config(self.config)
 
         # No configuration
@@ -25,6 +41,24 @@ class ConsulConnector(BaseConnector):
         # Create client
         self.client = consul.Consul(**self.config)
 
+        # Timeout of each request is bounded by the deadline of the gRPC request.
+        # timeout should be longer than the wait of mirror, which is a blocking query.
+        self.client.http.session = DeadlineSession(timeout)
+        self.mirrors = create_mirrors('ConsulConnector', mirror_conf, self._watch_mirror)
+
+    def health_check(self):
+        self.client.status.leader()
+
+    def close(self):
+        for mirror in self.mirrors:
+            mirror.stop()
+
+        self.client.http.session.close()
+
+    @staticmethod
+    def is_retryable(error):
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, consul.base.Timeout))
+
     def _validate_config(self, config):
         """
         Parameter for Consul
@@ -46,39 +80,187 @@ class ConsulConnector(BaseConnector):
 
         return False
 
-    @staticmethod
-    def _response_value(response):
+    @classmethod
+    def _response_value(cls, response):
         index, data = response
         # TODO: error check
         if 'Value' not in data:
             return False
-        value = data['Value'].decode('ascii')
-        secret = json.loads(value)
-        print("##################")
-        print(secret)
-        print("-----------------")
+        return cls._parse_value(data['Value'])
+
+    @staticmethod
+    def _parse_value(value):
+        secret = json.loads(value.decode('ascii'))
         name = secret.get("Name", None)
         secret_string = secret.get("SecretString", None)
         if name == None or secret_string == None:
-            _LOGGER.error(f'[_response_value] {secret}')
-        return json.loads( secret_string)
+            _LOGGER.error(f'[_parse_value] invalid secret format (Name={name})')
+        return json.loads(secret_string)
 
-    def create_secret(self, secret_id, data):
+    @staticmethod
+    def _make_value(secret_id, data):
         secret_params = {
             'Name': secret_id,
             'SecretString': json.dumps(data),
         }
-        return self._response(self.client.kv.put(secret_id, json.dumps(secret_params)))
+        return base64.b64encode(json.dumps(secret_params).encode()).decode()
+
+    def create_secret(self, secret_id, data):
+        return self._put_secret(secret_id, data)
+
+    def create_secrets(self, secrets_data):
+        return self._set_secrets(secrets_data)
+
+    def update_secrets(self, secrets_data, expected_revisions=None):
+        # set replaces the value of an existing key, cas checks its ModifyIndex
+        return self._set_secrets(secrets_data, expected_revisions or {})
+
+    def _set_secrets(self, secrets_data, expected_revisions=None):
+        errors = {}
+        revisions = {}
+        secret_ids = list(secrets_data)
+        expected_revisions = expected_revisions or {}
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            chunk = secret_ids[index:index + _BATCH_SIZE]
+            operations = []
+            for secret_id in chunk:
+                operation = {'Verb': 'set', 'Key': secret_id, 'Value': self._make_value(secret_id, secrets_data[secret_id])}
+                if expected_revisions.get(secret_id) is not None:
+                    operation.update({'Verb': 'cas', 'Index': int(expected_revisions[secret_id])})
+
+                operations.append({'KV': operation})
+
+            try:
+                response = self.client.txn.put(operations)
+            except consul.base.ClientError as e:
+                if not str(e).startswith('409'):
+                    _LOGGER.error(f'[_set_secrets] txn failed: {e}')
+                    errors.update({secret_id: str(e) for secret_id in chunk})
+                    continue
+
+                # Consul rolls back the whole txn if an index of cas is not matched,
+                # so keys of the chunk are written one by one, and only conflicted keys fail
+                _LOGGER.debug('[_set_secrets] index is changed, fall back to single updates')
+                for secret_id in chunk:
+                    try:
+                        revisions[secret_id] = self._put_secret(
+                            secret_id, secrets_data[secret_id], expected_revisions.get(secret_id))
+                    except Exception as e:
+                        errors[secret_id] = e
+                continue
+            except Exception as e:
+                _LOGGER.error(f'[_set_secrets] txn failed: {e}')
+                errors.update({secret_id: str(e) for secret_id in chunk})
+                continue
+
+            # Results are in the order of operations
+            for secret_id, result in zip(chunk, response['Results']):
+                revision = result['KV']['ModifyIndex']
+                if mirror := find_mirror(self.mirrors, secret_id):
+                    mirror.put(secret_id, secrets_data[secret_id], revision)
+
+                revisions[secret_id] = str(revision)
+
+        return errors, revisions
 
     def delete_secret(self, secret_id):
         response = self.client.kv.delete(secret_id)
+        self._delete_mirror(secret_id)
         return self._response(response)
 
-    def update_secret(self, secret_id, data):
-        self.delete_secret(secret_id)
-        response = self.create_secret(secret_id, data)
+    def update_secret(self, secret_id, data, expected_revision=None):
+        return self._put_secret(secret_id, data, expected_revision)
 
-        return self._response(response)
+    def _put_secret(self, secret_id, data, expected_revision=None):
+        # kv.put doesn't return ModifyIndex, so a txn of one set or cas operation is used
+        operation = {'Verb': 'set', 'Key': secret_id, 'Value': self._make_value(secret_id, data)}
+        if expected_revision is not None:
+            operation.update({'Verb': 'cas', 'Index': int(expected_revision)})
+
+        try:
+            response = self.client.txn.put([{'KV': operation}])
+        except consul.base.ClientError as e:
+            # Consul rolls back a txn with 409 if the index of cas is not matched
+            if str(e).startswith('409'):
+                raise ERROR_SECRET_DATA_CONFLICT(secret_id=secret_id)
+            raise
+
+        revision = response['Results'][0]['KV']['ModifyIndex']
+
+        # Changes of this process are applied at once, the watch applies changes of the others
+        if mirror := find_mirror(self.mirrors, secret_id):
+            mirror.put(secret_id, data, revision)
+
+        return str(revision)
+
+    def get_secret_revision(self, secret_id):
+        _, item = self.client.kv.get(secret_id)
+        return None if item is None else str(item['ModifyIndex'])
 
     def get_secret(self, secret_id):
+        if mirror := find_mirror(self.mirrors, secret_id):
+            found, data = mirror.get(secret_id)
+            if found:
+                return data
+
         return self._response_value(self.client.kv.get(secret_id))
+
+    def get_secrets(self, secret_ids):
+        results, secret_ids = read_mirrors(self.mirrors, secret_ids)
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            chunk = secret_ids[index:index + _BATCH_SIZE]
+            try:
+                response = self.client.txn.put([{'KV': {'Verb': 'get', 'Key': secret_id}} for secret_id in chunk])
+            except Exception as e:
+                # The whole txn fails if one of the keys does not exist
+                _LOGGER.debug(f'[get_secrets] txn failed, fall back to single reads: {e}')
+                for secret_id in chunk:
+                    _, data = self.client.kv.get(secret_id)
+                    if data and data.get('Value'):
+                        results[secret_id] = self._parse_value(data['Value'])
+                continue
+
+            for result in response.get('Results') or []:
+                kv = result.get('KV', {})
+                if kv.get('Value'):
+                    results[kv['Key']] = self._parse_value(base64.b64decode(kv['Value']))
+
+        return results
+
+    def _delete_mirror(self, secret_id):
+        if mirror := find_mirror(self.mirrors, secret_id):
+            mirror.delete(secret_id)
+
+    def _watch_mirror(self, mirror):
+        """Load the key prefix of the mirror with blocking queries
+
+        A blocking query returns when the prefix is changed or after wait,
+        so the mirror is reloaded on changes and marked as synced otherwise.
+        """
+
+        index = None
+        while not mirror.stopped.is_set():
+            started_at = time.monotonic()
+            new_index, items = self.client.kv.get(mirror.key_prefix, recurse=True, index=index, wait=self.mirror_wait)
+            new_index = int(new_index)
+
+            if index is not None and new_index == index:
+                mirror.mark_synced(started_at)
+                continue
+
+            mirror.load(
+                {item['Key']: (item['ModifyIndex'], self._parse_mirror_value(item)) for item in items or []},
+                new_index,
+                started_at
+            )
+
+            # The index can go backwards (e.g. snapshot restore), then the prefix is loaded again
+            index = new_index if new_index > (index or 0) else None
+
+    @classmethod
+    def _parse_mirror_value(cls, item):
+        try:
+            return cls._parse_value(item['Value'])
+        except Exception as e:
+            _LOGGER.error(f'[_parse_mirror_value] invalid value of {item["Key"]}: {e}')
+            return None
@@ -1,17 +1,62 @@
 import logging
 import json
+import queue
+import time
 import etcd3
+from etcd3.events import DeleteEvent
+from etcd3.exceptions import ConnectionFailedError, ConnectionTimeoutError, InternalServerError
 from spaceone.core.connector import BaseConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+from spaceone.secret.lib.deadline import get_timeout
+from spaceone.secret.lib.secret_mirror import create_mirrors, find_mirror, read_mirrors
 
 __all__ = ['EtcdConnector']
 _LOGGER = logging.getLogger(__name__)
 
+# etcd limits the number of operations in a txn (--max-txn-ops, default 128)
+_BATCH_SIZE = 128
+
+
+class _DeadlineEtcd3Client(etcd3.Etcd3Client):
+    """ Timeout of each request is bounded by the deadline of the gRPC request
+    """
+
+    @property
+    def timeout(self):
+        return get_timeout(self._timeout)
+
+    @timeout.setter
+    def timeout(self, timeout):
+        self._timeout = timeout
+
 
 class EtcdConnector(BaseConnector):
+    # create_secret and update_secret return mod_revision of the key,
+    # create_secrets and update_secrets return errors and mod_revision of the keys
+    supports_revision = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.client = etcd3.client(host=self.config.get('host'), port=self.config.get('port'))
+        self.client = _DeadlineEtcd3Client(host=self.config.get('host', 'localhost'),
+                                           port=self.config.get('port', 2379),
+                                           timeout=self.config.get('timeout'))
+
+        mirror_conf = self.config.get('mirror') or {}
+        self.mirror_check_interval = mirror_conf.get('check_interval', 5)
+        self.mirrors = create_mirrors('EtcdConnector', mirror_conf, self._watch_mirror)
+
+    def health_check(self):
+        self.client.status()
+
+    def close(self):
+        for mirror in self.mirrors:
+            mirror.stop()
+
+        self.client.close()
+
+    @staticmethod
+    def is_retryable(error):
+        return isinstance(error, (ConnectionFailedError, ConnectionTimeoutError, InternalServerError))
 
     @staticmethod
     def _response_value(response):
@@ -28,14 +73,167 @@ class EtcdConnector(BaseConnector):
             return {}
 
     def create_secret(self, secret_id, data):
-        self.client.put(secret_id, json.dumps(data))
+        response = self.client.put(secret_id, json.dumps(data))
+        return self._put_mirror(secret_id, data, response.header.revision)
+
+    def create_secrets(self, secrets_data):
+        return self._put_secrets(secrets_data)
+
+    def update_secrets(self, secrets_data, expected_revisions=None):
+        # put replaces the value of an existing key
+        return self._put_secrets(secrets_data, expected_revisions or {})
+
+    def _put_secrets(self, secrets_data, expected_revisions=None):
+        errors = {}
+        revisions = {}
+        secret_ids = list(secrets_data)
+        expected_revisions = expected_revisions or {}
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            chunk = secret_ids[index:index + _BATCH_SIZE]
+            try:
+                succeeded, responses = self.client.transaction(
+                    compare=[
+                        self.client.transactions.mod(secret_id) == int(expected_revisions[secret_id])
+                        for secret_id in chunk if expected_revisions.get(secret_id) is not None
+                    ],
+                    success=[
+                        self.client.transactions.put(secret_id, json.dumps(secrets_data[secret_id]))
+                        for secret_id in chunk
+                    ],
+                    failure=[]
+                )
+            except Exception as e:
+                _LOGGER.error(f'[_put_secrets] txn failed: {e}')
+                errors.update({secret_id: str(e) for secret_id in chunk})
+                continue
+
+            if not succeeded:
+                # Keys of the chunk are written one by one, so that only conflicted keys fail
+                _LOGGER.debug('[_put_secrets] revision is changed, fall back to single updates')
+                for secret_id in chunk:
+                    try:
+                        revisions[secret_id] = self.update_secret(
+                            secret_id, secrets_data[secret_id], expected_revisions.get(secret_id))
+                    except Exception as e:
+                        errors[secret_id] = e
+                continue
+
+            # Responses are in the order of operations, keys of a txn have the revision of the txn
+            for secret_id, response in zip(chunk, responses):
+                revisions[secret_id] = self._put_mirror(
+                    secret_id, secrets_data[secret_id], response.response_put.header.revision)
+
+        return errors, revisions
 
     def delete_secret(self, secret_id):
-        self.client.delete(secret_id)
+        response = self.client.delete(secret_id, return_response=True)
+        self._delete_mirror(secret_id, response.header.revision)
 
-    def update_secret(self, secret_id, data):
-        self.delete_secret(secret_id)
-        self.create_secret(secret_id, data)
+    def update_secret(self, secret_id, data, expected_revision=None):
+        if expected_revision is None:
+            # put replaces the value of an existing key
+            return self.create_secret(secret_id, data)
+
+        succeeded, responses = self.client.transaction(
+            compare=[self.client.transactions.mod(secret_id) == int(expected_revision)],
+            success=[self.client.transactions.put(secret_id, json.dumps(data))],
+            failure=[]
+        )
+
+        if not succeeded:
+            raise ERROR_SECRET_DATA_CONFLICT(secret_id=secret_id)
+
+        return self._put_mirror(secret_id, data, responses[0].response_put.header.revision)
+
+    def get_secret_revision(self, secret_id):
+        _, metadata = self.client.get(secret_id)
+        return None if metadata is None else str(metadata.mod_revision)
 
     def get_secret(self, secret_id):
+        if mirror := find_mirror(self.mirrors, secret_id):
+            found, data = mirror.get(secret_id)
+            if found:
+                return data
+
         return self._response_value(self.client.get(secret_id))
+
+    def get_secrets(self, secret_ids):
+        results, secret_ids = read_mirrors(self.mirrors, secret_ids)
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            chunk = secret_ids[index:index + _BATCH_SIZE]
+            succeeded, responses = self.client.transaction(
+                compare=[],
+                success=[self.client.transactions.get(secret_id) for secret_id in chunk],
+                failure=[]
+            )
+
+            for secret_id, response in zip(chunk, responses):
+                if response:
+                    results[secret_id] = self._response_value(response[0])
+
+        return results
+
+    def _put_mirror(self, secret_id, data, revision):
+        # Changes of this process are applied at once, the watch applies changes of the others
+        if mirror := find_mirror(self.mirrors, secret_id):
+            mirror.put(secret_id, data, revision)
+
+        return str(revision)
+
+    def _delete_mirror(self, secret_id, revision):
+        if mirror := find_mirror(self.mirrors, secret_id):
+            mirror.delete(secret_id, revision)
+
+    def _watch_mirror(self, mirror):
+        """Load the key prefix of the mirror and apply changes from a watch of the next revision
+
+        The watch has no heartbeat, so the mirror is marked as synced every check_interval
+        if it has the latest mod_revision and the count of keys in the prefix.
+        """
+
+        synced_at = time.monotonic()
+        response = self.client.get_prefix_response(mirror.key_prefix)
+        mirror.load(
+            {kv.key.decode(): (kv.mod_revision, self._parse_mirror_value(kv)) for kv in response.kvs},
+            response.header.revision,
+            synced_at
+        )
+
+        errors = queue.Queue()
+
+        def _on_response(watch_response):
+            if isinstance(watch_response, Exception):
+                errors.put(watch_response)
+                return
+
+            for event in watch_response.events:
+                if isinstance(event, DeleteEvent):
+                    mirror.delete(event.key.decode(), event.mod_revision)
+                else:
+                    mirror.put(event.key.decode(), self._parse_mirror_value(event), event.mod_revision)
+
+        watch_id = self.client.add_watch_prefix_callback(
+            mirror.key_prefix, _on_response, start_revision=response.header.revision + 1)
+
+        try:
+            while not mirror.stopped.wait(self.mirror_check_interval):
+                if not errors.empty():
+                    raise errors.get()
+
+                synced_at = time.monotonic()
+                response = self.client.get_prefix_response(
+                    mirror.key_prefix, sort_order='descend', sort_target='mod', limit=1, keys_only=True)
+                latest_revision = response.kvs[0].mod_revision if response.kvs else 0
+
+                if mirror.revision >= latest_revision and mirror.size == response.count:
+                    mirror.mark_synced(synced_at)
+        finally:
+            self.client.cancel_watch(watch_id)
+
+    @staticmethod
+    def _parse_mirror_value(kv):
+        try:
+            return json.loads(kv.value)
+        except Exception as e:
+            _LOGGER.error(f'[_parse_mirror_value] invalid value of {kv.key}: {e}')
+            return None
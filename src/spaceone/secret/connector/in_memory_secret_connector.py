@@ -0,0 +1,108 @@
+import copy
+import logging
+import threading
+from spaceone.core.error import *
+from spaceone.core.connector import BaseConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+
+__all__ = ['InMemorySecretConnector']
+_LOGGER = logging.getLogger(__name__)
+
+
+class InMemorySecretConnector(BaseConnector):
+    """ Secret data in a dict of this process, for tests, benchmarks and local development
+
+    Data is lost when the process exits and is not shared between processes.
+    """
+
+    # create_secret and update_secret return the revision of the secret, which starts from 1,
+    # create_secrets and update_secrets return errors and revisions of the secrets
+    supports_revision = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {secret_id: (revision, data)}, data is copied so that callers can't change stored data
+        self._secrets = {}
+        self._lock = threading.Lock()
+
+    def health_check(self):
+        pass
+
+    def close(self):
+        pass
+
+    def create_secret(self, secret_id, data):
+        with self._lock:
+            return self._create_secret(secret_id, data)
+
+    def create_secrets(self, secrets_data):
+        with self._lock:
+            return self._call_many(self._create_secret, secrets_data)
+
+    def update_secret(self, secret_id, data, expected_revision=None):
+        with self._lock:
+            return self._update_secret(secret_id, data, expected_revision)
+
+    def update_secrets(self, secrets_data, expected_revisions=None):
+        expected_revisions = expected_revisions or {}
+        with self._lock:
+            return self._call_many(
+                lambda secret_id, data: self._update_secret(secret_id, data, expected_revisions.get(secret_id)),
+                secrets_data
+            )
+
+    def delete_secret(self, secret_id):
+        with self._lock:
+            self._secrets.pop(secret_id, None)
+
+    def get_secret_revision(self, secret_id):
+        with self._lock:
+            if secret_id not in self._secrets:
+                return None
+
+            return str(self._secrets[secret_id][0])
+
+    def get_secret(self, secret_id):
+        with self._lock:
+            if secret_id not in self._secrets:
+                raise ERROR_NOT_FOUND(key='secret_id', value=secret_id)
+
+            return copy.deepcopy(self._secrets[secret_id][1])
+
+    def get_secrets(self, secret_ids):
+        with self._lock:
+            return {
+                secret_id: copy.deepcopy(self._secrets[secret_id][1])
+                for secret_id in secret_ids if secret_id in self._secrets
+            }
+
+    def _create_secret(self, secret_id, data):
+        if secret_id in self._secrets:
+            raise ERROR_NOT_UNIQUE(key='secret_id', value=secret_id)
+
+        self._secrets[secret_id] = (1, copy.deepcopy(data))
+        return '1'
+
+    def _update_secret(self, secret_id, data, expected_revision=None):
+        if secret_id not in self._secrets:
+            raise ERROR_NOT_FOUND(key='secret_id', value=secret_id)
+
+        revision = self._secrets[secret_id][0]
+        if expected_revision is not None and str(revision) != str(expected_revision):
+            raise ERROR_SECRET_DATA_CONFLICT(secret_id=secret_id)
+
+        self._secrets[secret_id] = (revision + 1, copy.deepcopy(data))
+        return str(revision + 1)
+
+    @staticmethod
+    def _call_many(method, secrets_data):
+        errors = {}
+        revisions = {}
+        for secret_id, data in secrets_data.items():
+            try:
+                revisions[secret_id] = method(secret_id, data)
+            except Exception as e:
+                errors[secret_id] = e
+
+        return errors, revisions
@@ -1,5 +1,10 @@
+import copy
 import logging
-from pymongo import MongoClient
+import threading
+from mongoengine.connection import get_db
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+from spaceone.core import config
 from spaceone.core.connector import BaseConnector
 
 
@@ -11,14 +16,79 @@ class MongoDBConnector(BaseConnector):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        client = MongoClient(**self.config)
-        db = client.secret_data
+        client_conf = copy.deepcopy(self.config)
+        create_index = client_conf.pop('create_index', True)
+        indexes = client_conf.pop('indexes', [])
+        self.co_located = client_conf.pop('co_located', False)
+        db_alias = client_conf.pop('db_alias', 'default')
+
+        if self.co_located:
+            # Keep secret data in the database of the Secret model,
+            # so that metadata and data can be read with one aggregation.
+            db = get_db(db_alias)
+            self.client = db.client
+        else:
+            self.client = MongoClient(**client_conf)
+            db = self.client.secret_data
+
         self.secret_data = db.secret_data
 
+        if create_index and config.get_global('DATABASE_AUTO_CREATE_INDEX', True):
+            threading.Thread(target=self._create_index, args=(indexes,), daemon=True).start()
+
+    def health_check(self):
+        self.client.admin.command('ping')
+
+    def close(self):
+        # The client of co-located mode is owned by the database connection of models
+        if not self.co_located:
+            self.client.close()
+
+    @staticmethod
+    def is_retryable(error):
+        # NetworkTimeout is a subclass of AutoReconnect
+        return isinstance(error, AutoReconnect)
+
+    def _create_index(self, indexes):
+        """
+        Parameter for Index
+        - indexes: list of field name or {field: 1 | -1 | 'hashed'}
+          (e.g. [{'secret_id': 'hashed'}] for the shard key of a sharded cluster)
+        """
+        _LOGGER.debug(f'Create MongoDB Indexes (secret_data: {len(indexes) + 1} Indexes)')
+
+        try:
+            self.secret_data.create_index('secret_id', unique=True, background=True)
+        except Exception as e:
+            _LOGGER.error(f'Unique Index Creation Failure: {e}')
+
+        for index in indexes:
+            try:
+                if isinstance(index, dict):
+                    keys = list(index.items())
+                else:
+                    keys = [(index, 1)]
+
+                self.secret_data.create_index(keys, background=True)
+            except Exception as e:
+                _LOGGER.error(f'Index Creation Failure: {e}')
+
     def create_secret(self, secret_id, data):
         _document = {'secret_id': secret_id, 'data': data}
         return self.secret_data.insert_one(_document)
 
+    def create_secrets(self, secrets_data):
+        documents = [{'secret_id': secret_id, 'data': data} for secret_id, data in secrets_data.items()]
+        try:
+            self.secret_data.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            return {
+                documents[write_error['index']]['secret_id']: write_error.get('errmsg')
+                for write_error in e.details.get('writeErrors', [])
+            }
+
+        return {}
+
     def delete_secret(self, secret_id):
         self.secret_data.delete_one({'secret_id': secret_id})
 
@@ -26,8 +96,26 @@ class MongoDBConnector(BaseConnector):
         _query = {'secret_id': secret_id}
         self.secret_data.update_one(_query, {'$set': {'data': data}})
 
+    def update_secrets(self, secrets_data):
+        secret_ids = list(secrets_data)
+        operations = [
+            UpdateOne({'secret_id': secret_id}, {'$set': {'data': secrets_data[secret_id]}})
+            for secret_id in secret_ids
+        ]
+        try:
+            self.secret_data.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            return {
+                secret_ids[write_error['index']]: write_error.get('errmsg')
+                for write_error in e.details.get('writeErrors', [])
+            }
+
+        return {}
+
     def get_secret(self, secret_id):
         secret_data_info = self.secret_data.find_one({'secret_id': secret_id})
         return secret_data_info.get('data', {})
 
-
+    def get_secrets(self, secret_ids):
+        cursor = self.secret_data.find({'secret_id': {'$in': secret_ids}}, {'secret_id': 1, 'data': 1})
+        return {secret_data_info['secret_id']: secret_data_info.get('data', {}) for secret_data_info in cursor}
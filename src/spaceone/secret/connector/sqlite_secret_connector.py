@@ -0,0 +1,246 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from spaceone.core.error import *
+from spaceone.core.connector import BaseConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+from spaceone.secret.lib.deadline import get_timeout
+
+__all__ = ['SQLiteSecretConnector']
+_LOGGER = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters in a statement (999 before 3.32)
+_BATCH_SIZE = 500
+
+_CREATE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS secret_data ('
+    'secret_id TEXT PRIMARY KEY, data TEXT NOT NULL, revision INTEGER NOT NULL)'
+)
+
+
+class SQLiteSecretConnector(BaseConnector):
+    """ Secret data in a SQLite database file (WAL mode), for edge installs and local benchmarks
+
+    Writes are queued to one writer thread, which commits all queued writes in one transaction
+    (group commit), so concurrent writes share the fsync of a commit.
+    Each write has its own savepoint, so a failed write doesn't roll back the others.
+    Reads use a connection per thread, which is not blocked by the writer in WAL mode.
+    """
+
+    # create_secret and update_secret return the revision of the secret, which starts from 1,
+    # create_secrets and update_secrets return errors and revisions of the secrets
+    supports_revision = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.path = self.config.get('path')
+        if not self.path:
+            raise ERROR_CONNECTOR_CONFIGURATION(connector='SQLiteSecretConnector', reason='path is required.')
+
+        # Seconds to wait for the lock of the database held by another process
+        self.timeout = self.config.get('timeout', 5)
+        # NORMAL doesn't lose data on a crash of the process, FULL also on a power loss
+        self.synchronous = self.config.get('synchronous', 'NORMAL')
+        self.max_batch_size = self.config.get('max_batch_size', 500)
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._writes = queue.Queue()
+        self._closed = False
+
+        self._get_connection().execute(_CREATE_TABLE)
+        self._writer = threading.Thread(target=self._write_loop, name='sqlite-writer', daemon=True)
+        self._writer.start()
+
+    def health_check(self):
+        self._get_connection().execute('SELECT 1')
+
+    def close(self):
+        self._closed = True
+        self._writes.put(None)
+        self._writer.join(self.timeout)
+
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+    @staticmethod
+    def is_retryable(error):
+        # "database is locked" if the lock is held by another process longer than timeout
+        return isinstance(error, sqlite3.OperationalError) and 'locked' in str(error)
+
+    def create_secret(self, secret_id, data):
+        return self._wait(self._submit('create', secret_id, data))
+
+    def create_secrets(self, secrets_data):
+        return self._write_many('create', secrets_data)
+
+    def update_secret(self, secret_id, data, expected_revision=None):
+        return self._wait(self._submit('update', secret_id, data, expected_revision))
+
+    def update_secrets(self, secrets_data, expected_revisions=None):
+        return self._write_many('update', secrets_data, expected_revisions)
+
+    def delete_secret(self, secret_id):
+        self._wait(self._submit('delete', secret_id))
+
+    def get_secret_revision(self, secret_id):
+        row = self._get_connection().execute(
+            'SELECT revision FROM secret_data WHERE secret_id = ?', (secret_id,)
+        ).fetchone()
+
+        return None if row is None else str(row[0])
+
+    def get_secret(self, secret_id):
+        row = self._get_connection().execute(
+            'SELECT data FROM secret_data WHERE secret_id = ?', (secret_id,)
+        ).fetchone()
+
+        if row is None:
+            raise ERROR_NOT_FOUND(key='secret_id', value=secret_id)
+
+        return json.loads(row[0])
+
+    def get_secrets(self, secret_ids):
+        conn = self._get_connection()
+        results = {}
+        for index in range(0, len(secret_ids), _BATCH_SIZE):
+            chunk = secret_ids[index:index + _BATCH_SIZE]
+            cursor = conn.execute(
+                f'SELECT secret_id, data FROM secret_data WHERE secret_id IN ({",".join("?" * len(chunk))})',
+                chunk
+            )
+            results.update({secret_id: json.loads(data) for secret_id, data in cursor})
+
+        return results
+
+    def _connect(self):
+        # isolation_level=None leaves transactions to BEGIN and COMMIT of the writer
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+
+        with self._lock:
+            self._connections.append(conn)
+
+        return conn
+
+    def _get_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+
+        return conn
+
+    def _submit(self, method, secret_id, data=None, expected_revision=None):
+        if self._closed:
+            raise ERROR_CONNECTOR_CONFIGURATION(connector='SQLiteSecretConnector', reason='connector is closed.')
+
+        future = Future()
+        self._writes.put((method, secret_id, data, expected_revision, future))
+        return future
+
+    @staticmethod
+    def _wait(future):
+        # A write which is not committed in the deadline may still be committed later
+        return future.result(timeout=get_timeout())
+
+    def _write_many(self, method, secrets_data, expected_revisions=None):
+        # Queued together, so the writes are committed in the same transaction unless max_batch_size is exceeded
+        expected_revisions = expected_revisions or {}
+        futures = {
+            secret_id: self._submit(method, secret_id, data, expected_revisions.get(secret_id))
+            for secret_id, data in secrets_data.items()
+        }
+
+        errors = {}
+        revisions = {}
+        for secret_id, future in futures.items():
+            try:
+                revisions[secret_id] = self._wait(future)
+            except Exception as e:
+                errors[secret_id] = e
+
+        return errors, revisions
+
+    def _write_loop(self):
+        conn = self._connect()
+        stopped = False
+
+        while not stopped:
+            writes = [self._writes.get()]
+            while len(writes) < self.max_batch_size:
+                try:
+                    writes.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopped = None in writes
+            writes = [write for write in writes if write is not None]
+            if writes:
+                self._commit(conn, writes)
+
+    def _commit(self, conn, writes):
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for method, secret_id, data, expected_revision, future in writes:
+                conn.execute('SAVEPOINT write')
+                try:
+                    results.append((future, self._apply(conn, method, secret_id, data, expected_revision), None))
+                except Exception as e:
+                    conn.execute('ROLLBACK TO write')
+                    results.append((future, None, e))
+                conn.execute('RELEASE write')
+            conn.execute('COMMIT')
+        except Exception as e:
+            _LOGGER.error(f'[_commit] failed to commit {len(writes)} writes: {e}')
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+
+            for write in writes:
+                write[-1].set_exception(e)
+            return
+
+        # Results are returned after the commit, so that a returned write is durable
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    @staticmethod
+    def _apply(conn, method, secret_id, data, expected_revision):
+        if method == 'delete':
+            conn.execute('DELETE FROM secret_data WHERE secret_id = ?', (secret_id,))
+            return None
+
+        if method == 'create':
+            try:
+                conn.execute('INSERT INTO secret_data (secret_id, data, revision) VALUES (?, ?, 1)',
+                             (secret_id, json.dumps(data)))
+            except sqlite3.IntegrityError:
+                raise ERROR_NOT_UNIQUE(key='secret_id', value=secret_id)
+            return '1'
+
+        query = 'UPDATE secret_data SET data = ?, revision = revision + 1 WHERE secret_id = ?'
+        params = [json.dumps(data), secret_id]
+        if expected_revision is not None:
+            query += ' AND revision = ?'
+            params.append(int(expected_revision))
+
+        if conn.execute(query, params).rowcount == 0:
+            row = conn.execute('SELECT revision FROM secret_data WHERE secret_id = ?', (secret_id,)).fetchone()
+            if row is None:
+                raise ERROR_NOT_FOUND(key='secret_id', value=secret_id)
+            raise ERROR_SECRET_DATA_CONFLICT(secret_id=secret_id)
+
+        row = conn.execute('SELECT revision FROM secret_data WHERE secret_id = ?', (secret_id,)).fetchone()
+        return str(row[0])
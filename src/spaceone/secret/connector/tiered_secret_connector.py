@@ -0,0 +1,308 @@
+import logging
+import threading
+import time
+from spaceone.core.error import *
+from spaceone.core.connector import BaseConnector
+from spaceone.secret.lib.connector_pool import get_connector
+
+__all__ = ['TieredSecretConnector']
+_LOGGER = logging.getLogger(__name__)
+
+# Write generations are counted per slot of secret ids, so that their memory is bounded
+_GENERATION_SLOTS = 1024
+
+
+class TieredSecretConnector(BaseConnector):
+    """ Durable backend with a local write-through tier
+
+    Writes go to the durable tier first and then to the local tier,
+    and reads hit the local tier first and fill it from the durable tier on a miss.
+    Keys whose local copy may be stale (a local write failed) are read from the durable tier
+    and evicted from the local tier by the reconciler, so that the next read fills them again.
+
+    Local copies expire after local_ttl seconds, which bounds the staleness of a copy
+    whose secret is updated by other processes, if the local tier is not shared by them.
+    A fill is dropped if the secret is written or evicted in this process during the durable read,
+    so that it can't overwrite the newer data.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        durable = self.config.get('durable')
+        local = self.config.get('local')
+
+        if durable is None or local is None or durable == local:
+            raise ERROR_CONNECTOR_CONFIGURATION(connector='TieredSecretConnector',
+                                                reason='durable and local must be different connectors.')
+
+        # Tiers are pooled connectors of their own backend name and configuration
+        self.durable_conn = get_connector(durable)
+        self.local_conn = get_connector(local)
+
+        # Only ciphertext of EncryptMutationHandler is kept in the local tier by default
+        self.local_plain_data = self.config.get('local_plain_data', False)
+        self.reconcile_interval = self.config.get('reconcile_interval', 10)
+        self.local_ttl = self.config.get('local_ttl', 60)
+
+        # check-and-set is done by the durable tier
+        self.supports_revision = getattr(self.durable_conn, 'supports_revision', False)
+
+        # Batch methods are only exposed if the durable tier has them,
+        # otherwise SecretConnectorManager calls single methods in parallel
+        for batch_method in ['create_secrets', 'update_secrets', 'get_secrets']:
+            if hasattr(self.durable_conn, batch_method):
+                setattr(self, batch_method, getattr(self, f'_{batch_method}'))
+
+        self._stale_secret_ids = set()
+        self._generations = [0] * _GENERATION_SLOTS
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._reconcile_loop, name='tiered-reconciler', daemon=True).start()
+
+    def health_check(self):
+        self.durable_conn.health_check()
+
+    def close(self):
+        # Tiers are closed by the connector pool
+        self._stopped.set()
+
+    def is_retryable(self, error):
+        is_retryable = getattr(self.durable_conn, 'is_retryable', None)
+        return is_retryable is not None and is_retryable(error)
+
+    def is_throttled(self, error):
+        is_throttled = getattr(self.durable_conn, 'is_throttled', None)
+        return is_throttled is not None and is_throttled(error)
+
+    def create_secret(self, secret_id, data):
+        response = self.durable_conn.create_secret(secret_id, data)
+        self._write_local(secret_id, data, self.local_conn.create_secret)
+        return response
+
+    def _create_secrets(self, secrets_data):
+        # Batch methods of a durable tier with revision return (errors, revisions)
+        response = self.durable_conn.create_secrets(secrets_data)
+        errors = response[0] if self.supports_revision else response
+        self._write_local_many(secrets_data, errors, 'create_secrets', 'create_secret')
+        return response
+
+    def update_secret(self, secret_id, data, expected_revision=None):
+        if self.supports_revision:
+            response = self.durable_conn.update_secret(secret_id, data, expected_revision=expected_revision)
+        else:
+            response = self.durable_conn.update_secret(secret_id, data)
+
+        self._write_local(secret_id, data, self.local_conn.update_secret)
+        return response
+
+    def _update_secrets(self, secrets_data, expected_revisions=None):
+        if self.supports_revision:
+            response = self.durable_conn.update_secrets(secrets_data, expected_revisions=expected_revisions)
+            errors = response[0]
+        else:
+            response = errors = self.durable_conn.update_secrets(secrets_data)
+
+        self._write_local_many(secrets_data, errors, 'update_secrets', 'update_secret')
+        return response
+
+    def get_secret_revision(self, secret_id):
+        return self.durable_conn.get_secret_revision(secret_id)
+
+    def delete_secret(self, secret_id):
+        response = self.durable_conn.delete_secret(secret_id)
+        self._evict_local(secret_id)
+        return response
+
+    def get_secret(self, secret_id):
+        generations = {secret_id: self._get_generation(secret_id)}
+        expired_secret_ids = set()
+
+        if secret_id not in self._stale_secret_ids:
+            try:
+                data = self._unwrap_local(secret_id, self.local_conn.get_secret(secret_id), expired_secret_ids)
+                if data:
+                    return data
+            except Exception as e:
+                _LOGGER.debug(f'[get_secret] local tier miss ({secret_id}): {e}')
+
+        data = self.durable_conn.get_secret(secret_id)
+        self._fill_local({secret_id: data}, generations, expired_secret_ids)
+        return data
+
+    def _get_secrets(self, secret_ids):
+        results = {}
+        generations = {secret_id: self._get_generation(secret_id) for secret_id in secret_ids}
+        expired_secret_ids = set()
+        local_secret_ids = [secret_id for secret_id in secret_ids if secret_id not in self._stale_secret_ids]
+
+        try:
+            if hasattr(self.local_conn, 'get_secrets'):
+                local_results = self.local_conn.get_secrets(local_secret_ids)
+            else:
+                local_results = {secret_id: self.local_conn.get_secret(secret_id) for secret_id in local_secret_ids}
+
+            for secret_id, local_data in local_results.items():
+                data = self._unwrap_local(secret_id, local_data, expired_secret_ids)
+                if data:
+                    results[secret_id] = data
+        except Exception as e:
+            _LOGGER.error(f'[get_secrets] local tier failed, read from durable tier: {e}')
+
+        missing_secret_ids = [secret_id for secret_id in secret_ids if secret_id not in results]
+        if missing_secret_ids:
+            durable_results = self.durable_conn.get_secrets(missing_secret_ids)
+            self._fill_local(durable_results, generations, expired_secret_ids)
+            results.update(durable_results)
+
+        return results
+
+    def _is_local_data(self, data):
+        return bool(data) and (self.local_plain_data or 'encrypted_data' in data)
+
+    def _wrap_local(self, data):
+        return {'data': data, 'expires_at': time.time() + self.local_ttl}
+
+    @staticmethod
+    def _unwrap_local(secret_id, local_data, expired_secret_ids):
+        """ Data of an unexpired local copy, None and secret_id is added to expired_secret_ids if expired """
+
+        if not local_data:
+            return None
+
+        if local_data.get('expires_at', 0) > time.time():
+            return local_data.get('data')
+
+        expired_secret_ids.add(secret_id)
+        return None
+
+    def _get_generation(self, secret_id):
+        return self._generations[hash(secret_id) % _GENERATION_SLOTS]
+
+    def _increase_generation(self, secret_id):
+        with self._lock:
+            self._generations[hash(secret_id) % _GENERATION_SLOTS] += 1
+
+    def _write_local(self, secret_id, data, write):
+        # Before the local write, so that fills which read the previous data are dropped
+        self._increase_generation(secret_id)
+
+        if not self._is_local_data(data):
+            self._evict_local(secret_id)
+            return
+
+        try:
+            write(secret_id, self._wrap_local(data))
+        except Exception as e:
+            _LOGGER.error(f'[_write_local] local tier write failed ({secret_id}): {e}')
+            self._evict_local(secret_id)
+
+    def _write_local_many(self, secrets_data, durable_errors, batch_method, method):
+        local_data = {}
+        for secret_id, data in secrets_data.items():
+            if secret_id in durable_errors:
+                continue
+
+            self._increase_generation(secret_id)
+            if self._is_local_data(data):
+                local_data[secret_id] = self._wrap_local(data)
+            else:
+                self._evict_local(secret_id)
+
+        if local_data:
+            errors = self._call_many(self.local_conn, batch_method, method, local_data)
+            for secret_id, error in errors.items():
+                _LOGGER.error(f'[_write_local_many] local tier write failed ({secret_id}): {error}')
+                self._evict_local(secret_id)
+
+    def _fill_local(self, secrets_data, generations, expired_secret_ids):
+        """ Insert data read from the durable tier, unless it is written in this process since generations
+
+        Expired copies are replaced, and others are inserted only,
+        so that a newer copy written by create or update_data is not overwritten.
+        """
+
+        for secret_id, data in secrets_data.items():
+            if secret_id in self._stale_secret_ids or not self._is_local_data(data):
+                continue
+
+            if self._get_generation(secret_id) != generations[secret_id]:
+                continue
+
+            try:
+                if secret_id in expired_secret_ids:
+                    self.local_conn.update_secret(secret_id, self._wrap_local(data))
+                else:
+                    self.local_conn.create_secret(secret_id, self._wrap_local(data))
+            except Exception as e:
+                _LOGGER.debug(f'[_fill_local] skip local tier fill ({secret_id}): {e}')
+                continue
+
+            # A write may have started after the check, and failed to update the filled copy
+            if self._get_generation(secret_id) != generations[secret_id]:
+                self._evict_local(secret_id)
+
+    def _evict_local(self, secret_id):
+        self._increase_generation(secret_id)
+
+        try:
+            self.local_conn.delete_secret(secret_id)
+        except Exception as e:
+            _LOGGER.error(f'[_evict_local] local tier delete failed, reconcile later ({secret_id}): {e}')
+            with self._lock:
+                self._stale_secret_ids.add(secret_id)
+
+    def _reconcile_loop(self):
+        while not self._stopped.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception as e:
+                _LOGGER.error(f'[_reconcile_loop] reconcile failed: {e}')
+
+    def reconcile(self):
+        """Evict stale copies of the local tier, which are filled again from the durable tier on read
+
+        Returns:
+            stale_secret_ids (list): secret ids which are not repaired yet
+        """
+
+        with self._lock:
+            stale_secret_ids = list(self._stale_secret_ids)
+
+        for secret_id in stale_secret_ids:
+            try:
+                self.local_conn.delete_secret(secret_id)
+            except Exception as e:
+                _LOGGER.debug(f'[reconcile] local tier delete failed ({secret_id}): {e}')
+                continue
+
+            with self._lock:
+                self._stale_secret_ids.discard(secret_id)
+
+        with self._lock:
+            if stale_secret_ids:
+                _LOGGER.info(f'[reconcile] repaired: {len(stale_secret_ids) - len(self._stale_secret_ids)}, '
+                             f'stale: {len(self._stale_secret_ids)}')
+
+            return list(self._stale_secret_ids)
+
+    @staticmethod
+    def _call_many(connector, batch_method, method, secrets_data):
+        """ Batch write of the local tier, single writes one by one if it has no batch method
+
+        Returns:
+            errors (dict)
+        """
+
+        if hasattr(connector, batch_method):
+            response = getattr(connector, batch_method)(secrets_data)
+            return response[0] if getattr(connector, 'supports_revision', False) else response
+
+        errors = {}
+        for secret_id, data in secrets_data.items():
+            try:
+                getattr(connector, method)(secret_id, data)
+            except Exception as e:
+                errors[secret_id] = e
+
+        return errors
@@ -1,9 +1,13 @@
 import logging
 import json
 import hvac
+import requests
+from hvac.exceptions import InternalServerError, InvalidPath, InvalidRequest, RateLimitExceeded, VaultDown
 
 from spaceone.core.error import *
 from spaceone.core.connector import BaseConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+from spaceone.secret.lib.deadline import DeadlineSession
 
 __all__ = ['VaultConnector']
 _LOGGER = logging.getLogger(__name__)
@@ -13,17 +17,38 @@ class VaultConnector(BaseConnector):
     """ Vault backend is for develop use
     """
 
+    # create_secret and update_secret return the version of KV v2
+    supports_revision = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         vault_url = self.config.get('url')
         token = self.config.get('token')
         if vault_url and token:
-            self.client = hvac.Client(url=vault_url)
+            # Timeout of each request is bounded by the deadline of the gRPC request
+            self.client = hvac.Client(url=vault_url, timeout=self.config.get('timeout', 30),
+                                      session=DeadlineSession())
             self.client.token = token
         else:
             raise ERROR_CONNECTOR_CONFIGURATION(backend='VaultConnector')
 
+    def health_check(self):
+        if not self.client.is_authenticated():
+            raise ERROR_CONNECTOR_CONFIGURATION(backend='VaultConnector')
+
+    def close(self):
+        self.client.adapter.close()
+
+    @staticmethod
+    def is_retryable(error):
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, VaultDown, InternalServerError))
+
+    @staticmethod
+    def is_throttled(error):
+        # Vault rejects requests over the rate limit quota with 429 before they are applied
+        return isinstance(error, RateLimitExceeded)
+
     @staticmethod
     def _response(response):
         # TODO: error check
@@ -48,22 +73,40 @@ class VaultConnector(BaseConnector):
         return data_string
 
     def create_secret(self, secret_id, data):
+        return self._put_secret(secret_id, data)
+
+    def delete_secret(self, secret_id):
+        response = self.client.secrets.kv.delete_metadata_and_all_versions(secret_id)
+        return self._response(response)
+
+    def update_secret(self, secret_id, data, expected_revision=None):
+        # create_or_update_secret adds a new version, so version history is kept
+        return self._put_secret(secret_id, data, expected_revision)
+
+    def _put_secret(self, secret_id, data, expected_revision=None):
         secret_params = {
             'Name': secret_id,
             'SecretString': json.dumps(data),
         }
+        cas = None if expected_revision is None else int(expected_revision)
 
-        return self._response(self.client.secrets.kv.v2.create_or_update_secret(path=secret_id, secret=secret_params))
+        try:
+            response = self.client.secrets.kv.v2.create_or_update_secret(
+                path=secret_id, secret=secret_params, cas=cas)
+        except InvalidRequest as e:
+            if cas is not None and 'check-and-set' in str(e):
+                raise ERROR_SECRET_DATA_CONFLICT(secret_id=secret_id)
+            raise
 
-    def delete_secret(self, secret_id):
-        response = self.client.secrets.kv.delete_metadata_and_all_versions(secret_id)
-        return self._response(response)
+        return str(response['data']['version'])
 
-    def update_secret(self, secret_id, data):
-        self.delete_secret(secret_id)
-        response = self.create_secret(secret_id, data)
+    def get_secret_revision(self, secret_id):
+        try:
+            response = self.client.secrets.kv.v2.read_secret_metadata(path=secret_id)
+        except InvalidPath:
+            return None
 
-        return self._response(response)
+        return str(response['data']['current_version'])
 
     def get_secret(self, secret_id):
         return self._response_value(self.client.secrets.kv.read_secret_version(path=secret_id))
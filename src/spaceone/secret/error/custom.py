@@ -19,3 +19,30 @@ class ERROR_EXIST_RELATED_SECRET(ERROR_BASE):
 
 class ERROR_DIFF_SECRET_AND_TRUSTED_SECRET_ENCRYPTED(ERROR_BASE):
     _message = "The encryption algorithm of Secret and Trusted Secret are different."
+
+
+class ERROR_UNKNOWN_ENCRYPT_KEY_VERSION(ERROR_HANDLER_CONFIGURATION):
+    _message = "Encrypt key version({key_version}) is not configured."
+
+
+class ERROR_INVALID_ENCRYPTED_DATA(ERROR_BASE):
+    _message = "Encrypted data is invalid. ({reason})"
+
+
+class ERROR_SAVE_SECRET_DATA(ERROR_BASE):
+    _message = "Failed to save secret data. (secret_id={secret_id}, reason={reason})"
+
+
+class ERROR_SECRET_DATA_CONFLICT(ERROR_BASE):
+    _status_code = "ABORTED"
+    _message = "Secret data is changed by another request, get the secret and retry. (secret_id={secret_id})"
+
+
+class ERROR_SECRET_BACKEND_UNAVAILABLE(ERROR_BASE):
+    _status_code = "UNAVAILABLE"
+    _message = "Secret backend is unavailable, retry later. (backend={backend})"
+
+
+class ERROR_SECRET_BACKEND_DEADLINE_EXCEEDED(ERROR_BASE):
+    _status_code = "DEADLINE_EXCEEDED"
+    _message = "Deadline of the request is exceeded while calling secret backend. (backend={backend})"
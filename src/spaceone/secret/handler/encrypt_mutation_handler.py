@@ -1,68 +1,234 @@
 import base64
+import hashlib
+import hmac
 import os
 import json
+import threading
 
+from cachetools import TTLCache
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from spaceone.core.handler import BaseMutationHandler
-from spaceone.secret.error.custom import ERROR_WRONG_ENCRYPT_ALGORITHM
+from spaceone.core.handler import BaseMutationHandler, get_mutation_handlers
+from spaceone.secret.error.custom import (
+    ERROR_WRONG_ENCRYPT_ALGORITHM,
+    ERROR_UNKNOWN_ENCRYPT_KEY_VERSION,
+    ERROR_INVALID_ENCRYPTED_DATA,
+)
+from spaceone.secret.lib.data_hash import make_data_hash
+from spaceone.secret.lib.key_provider import create_key_provider
 
-__all__ = ["EncryptMutationHandler"]
+__all__ = ["EncryptMutationHandler", "get_encrypt_mutation_handler"]
 
 _encrypt_verb = ["create", "update_data"]
-_decrypt_verb = ["get_data"]
+_encrypt_many_verb = ["create_many", "update_data_many"]
 
 _SUPPORTED_ENCRYPT_ALGORITHM = ["AES"]
 
+# Envelope: magic(2) + format version(1) + key version(1) + nonce(12) + ciphertext
+# - format version 1: encrypted with encrypt_key of the key version
+# - format version 2: encrypted with a data key, wrapped key is stored in encrypt_options.wrapped_data_key
+#   (encrypted_data_key is the key of data encrypted by the client)
+_ENVELOPE_MAGIC = b"SE"
+_ENVELOPE_FORMAT_VERSION = 1
+_DATA_KEY_ENVELOPE_FORMAT_VERSION = 2
+_ENVELOPE_HEADER_SIZE = 4
+_NONCE_SIZE = 12
+
+# Key version of data encrypted before key versions were introduced
+_DEFAULT_KEY_VERSION = 1
+
 
 class EncryptMutationHandler(BaseMutationHandler):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.encrypt_algorithm = self.config.get("ENCRYPT_ALGORITHM")
+        self.encrypt_key_version = int(
+            self.config.get("encrypt_key_version", _DEFAULT_KEY_VERSION)
+        )
+        self.encrypt_keys = {
+            int(key_version): encrypt_key
+            for key_version, encrypt_key in self.config.get("encrypt_keys", {}).items()
+        }
+        self.use_envelope = self.config.get("use_envelope", False)
         self._check_config(self.encrypt_algorithm)
+        self.data_hash_key = self._get_data_hash_key()
+
+        self._ciphers = {}
+        self._cipher_lock = threading.Lock()
+
+        self.key_provider = None
+        if key_provider_conf := self.config.get("key_provider"):
+            self.key_provider = create_key_provider(key_provider_conf)
+
+        data_key_cache_size = self.config.get("data_key_cache_size", 10000)
+        self._domain_data_keys = TTLCache(
+            maxsize=data_key_cache_size, ttl=self.config.get("data_key_ttl", 300)
+        )
+        self._data_key_ciphers = TTLCache(
+            maxsize=data_key_cache_size,
+            ttl=self.config.get("data_key_cache_ttl", 600),
+        )
 
     def request(self, params: dict) -> dict:
-        if not (
-            self.transaction.resource == "Secret"
-            and self.transaction.verb in _encrypt_verb
-        ):
+        if self.transaction.resource != "Secret":
             return params
 
-        encrypted_data, nonce = self._encrypt(params["data"])
-        params["data"] = {"encrypted_data": encrypted_data}
-        params["encrypted"] = (True,)
-        params["encrypt_options"] = {
-            "encrypt_algorithm": self.encrypt_algorithm,
-            "nonce": nonce,
-        }
+        if self.transaction.verb in _encrypt_verb:
+            self._encrypt_params(params, params.get("domain_id"))
+        elif self.transaction.verb in _encrypt_many_verb:
+            # Data keys and ciphers are shared by all secrets of the batch
+            for secret_params in params.get("secrets", []):
+                if "data" in secret_params:
+                    self._encrypt_params(secret_params, params.get("domain_id"))
+
         return params
 
-    def response(self, result: dict) -> dict:
-        if not (
-            self.transaction.resource == "Secret"
-            and self.transaction.verb in _decrypt_verb
-        ):
-            return result
+    def is_decrypted_by_server(
+        self, encrypted_data: str, encrypt_options: dict
+    ) -> bool:
+        """Whether data is in a format which clients can't decrypt by themselves
+
+        Clients decrypt the legacy format with encrypt_options.nonce and encrypt_key,
+        data encrypted with a data key or as an envelope is decrypted by get_data.
+        """
+
+        if "wrapped_data_key" in encrypt_options:
+            return True
+
+        if "nonce" in encrypt_options:
+            # Data of a secret being rotated may already be an envelope
+            return "key_version" in encrypt_options and self._is_envelope(
+                base64.b64decode(encrypted_data)
+            )
 
-        if result["encrypted"] is not True:
-            return result
+        # Data encrypted by the client has neither nonce nor key_version
+        return "key_version" in encrypt_options
 
-        encrypt_options = result.get("encrypt_options", {})
+    def decrypt(self, encrypted_data: str, encrypt_options: dict) -> dict:
         encrypt_algorithm = encrypt_options.get("encrypt_algorithm")
         if encrypt_algorithm not in _SUPPORTED_ENCRYPT_ALGORITHM:
             raise ERROR_WRONG_ENCRYPT_ALGORITHM(
                 encrypt_algorithm=str(encrypt_algorithm)
             )
 
-        plain_data = self._decrypt(result["data"]["encrypted_data"], encrypt_options)
+        return self._decrypt(encrypted_data, encrypt_options)
+
+    def get_current_key_id(self) -> str:
+        if self.key_provider:
+            return "data_key"
+
+        return f"v{self.encrypt_key_version}"
+
+    def is_rotated(self, encrypt_options: dict) -> bool:
+        """Whether data is encrypted with the current key"""
+
+        if self.key_provider:
+            return "wrapped_data_key" in encrypt_options
 
-        result = {"encrypted": False, "encrypt_options": {}, "data": plain_data}
+        if "wrapped_data_key" in encrypt_options:
+            return False
 
-        return result
+        if self.use_envelope and "nonce" in encrypt_options:
+            return False
+
+        key_version = int(encrypt_options.get("key_version", _DEFAULT_KEY_VERSION))
+        return key_version == self.encrypt_key_version
+
+    def rotate(self, data: dict, encrypt_options: dict, domain_id: str = None):
+        """Re-encrypt data with the current key
+
+        Returns:
+            data (dict): re-encrypted data
+            encrypt_options (dict): encrypt options of re-encrypted data
+            transition_encrypt_options (dict): encrypt options which can decrypt
+                both previous and re-encrypted data while the data is written to backend
+        """
+
+        plain_data = self._decrypt(data["encrypted_data"], encrypt_options)
+        encrypted_data, new_encrypt_options = self._encrypt(plain_data, domain_id)
+        del plain_data
+
+        transition_encrypt_options = {
+            **new_encrypt_options,
+            **encrypt_options,
+            "key_version": encrypt_options.get("key_version", _DEFAULT_KEY_VERSION),
+        }
+
+        return (
+            {"encrypted_data": encrypted_data},
+            new_encrypt_options,
+            transition_encrypt_options,
+        )
 
     def _check_config(self, encrypt_algorithm: str) -> None:
         if encrypt_algorithm not in _SUPPORTED_ENCRYPT_ALGORITHM:
             raise ERROR_WRONG_ENCRYPT_ALGORITHM(encrypt_algorithm)
 
+        if not 0 <= self.encrypt_key_version <= 255:
+            raise ERROR_UNKNOWN_ENCRYPT_KEY_VERSION(
+                key_version=self.encrypt_key_version
+            )
+
+    def _get_cipher(self, key_version: int) -> AESGCM:
+        cipher = self._ciphers.get(key_version)
+
+        if cipher is None:
+            with self._cipher_lock:
+                cipher = self._ciphers.get(key_version)
+                if cipher is None:
+                    data_key = base64.b64decode(self._get_encrypt_key(key_version))
+                    cipher = AESGCM(data_key)
+                    del data_key
+                    self._ciphers[key_version] = cipher
+
+        return cipher
+
+    def _get_encrypt_key(self, key_version: int) -> str:
+        if key_version == self.encrypt_key_version:
+            return self.config.get("encrypt_key")
+
+        # Previous keys are kept to decrypt data which is not rotated yet
+        if key_version in self.encrypt_keys:
+            return self.encrypt_keys[key_version]
+
+        raise ERROR_UNKNOWN_ENCRYPT_KEY_VERSION(key_version=key_version)
+
+    def _get_domain_data_key(self, domain_id: str) -> (AESGCM, str):
+        """Data key of the domain is reused until data_key_ttl expires"""
+
+        with self._cipher_lock:
+            domain_data_key = self._domain_data_keys.get(domain_id)
+
+        if domain_data_key is None:
+            plain_data_key, wrapped_data_key = self.key_provider.generate_data_key()
+            encrypted_data_key = base64.b64encode(wrapped_data_key).decode()
+            domain_data_key = (AESGCM(plain_data_key), encrypted_data_key)
+            del plain_data_key
+
+            with self._cipher_lock:
+                self._domain_data_keys[domain_id] = domain_data_key
+                self._data_key_ciphers[encrypted_data_key] = domain_data_key[0]
+
+        return domain_data_key
+
+    def _get_data_key_cipher(self, encrypted_data_key: str) -> AESGCM:
+        if self.key_provider is None:
+            raise ERROR_INVALID_ENCRYPTED_DATA(reason="key_provider is not configured")
+
+        with self._cipher_lock:
+            cipher = self._data_key_ciphers.get(encrypted_data_key)
+
+        if cipher is None:
+            plain_data_key = self.key_provider.unwrap_data_key(
+                base64.b64decode(encrypted_data_key)
+            )
+            cipher = AESGCM(plain_data_key)
+            del plain_data_key
+
+            with self._cipher_lock:
+                self._data_key_ciphers[encrypted_data_key] = cipher
+
+        return cipher
+
     def _dict_to_b64(self, data: dict) -> bytes:
         return base64.b64encode(json.dumps(data).encode())
 
@@ -70,27 +236,126 @@ class EncryptMutationHandler(BaseMutationHandler):
         _data = data if isinstance(data, bytes) else data.encode()
         return json.loads(base64.b64decode(_data).decode())
 
-    def _encrypt(self, plain_data: dict) -> (str, str):
-        nonce = os.urandom(12)
-        data_key = base64.b64decode(self.config.get("encrypt_key"))
+    def _get_data_hash_key(self):
+        """Key of data_hash, so that plain data can't be guessed from the hash in the database"""
+
+        if data_hash_key := self.config.get("data_hash_key"):
+            return base64.b64decode(data_hash_key)
+
+        if encrypt_key := self.config.get("encrypt_key"):
+            return hmac.new(
+                base64.b64decode(encrypt_key), b"data_hash", hashlib.sha256
+            ).digest()
 
-        aesgcm = AESGCM(data_key)
-        del data_key
-        encrypted_data = aesgcm.encrypt(nonce, self._dict_to_b64(plain_data), None)
+        return None
+
+    def _encrypt_params(self, params: dict, domain_id: str = None) -> None:
+        # Encrypted data differs on every request, so the hash is made from plain data
+        if self.data_hash_key:
+            params["data_hash"] = make_data_hash(params["data"], self.data_hash_key)
+        else:
+            params.pop("data_hash", None)
+
+        encrypted_data, encrypt_options = self._encrypt(params["data"], domain_id)
+        params["data"] = {"encrypted_data": encrypted_data}
+        params["encrypted"] = True
+        params["encrypt_options"] = encrypt_options
+
+    def _encrypt(self, plain_data: dict, domain_id: str = None) -> (str, dict):
+        key_version = self.encrypt_key_version
+        nonce = os.urandom(_NONCE_SIZE)
+        encrypt_options = {"encrypt_algorithm": self.encrypt_algorithm}
+
+        if self.key_provider and domain_id:
+            cipher, wrapped_data_key = self._get_domain_data_key(domain_id)
+            encrypt_options["wrapped_data_key"] = wrapped_data_key
+            header = _ENVELOPE_MAGIC + bytes([_DATA_KEY_ENVELOPE_FORMAT_VERSION, 0])
+        else:
+            cipher = self._get_cipher(key_version)
+            encrypt_options["key_version"] = key_version
+
+            if not self.use_envelope:
+                encrypted_data = cipher.encrypt(
+                    nonce, self._dict_to_b64(plain_data), None
+                )
+                encrypt_options["nonce"] = base64.b64encode(nonce).decode()
+                return base64.b64encode(encrypted_data).decode(), encrypt_options
+
+            header = _ENVELOPE_MAGIC + bytes([_ENVELOPE_FORMAT_VERSION, key_version])
+
+        encrypted_data = cipher.encrypt(
+            nonce, json.dumps(plain_data, separators=(",", ":")).encode(), header
+        )
+        envelope = b"".join([header, nonce, encrypted_data])
 
-        encrypted_data_b64 = base64.b64encode(encrypted_data).decode()
-        nonce_b64 = base64.b64encode(nonce).decode()
-        return encrypted_data_b64, nonce_b64
+        return base64.b64encode(envelope).decode(), encrypt_options
 
     def _decrypt(self, encrypted_data: str, encrypt_options: dict) -> dict:
-        nonce = base64.b64decode(encrypt_options["nonce"])
-        data_key = base64.b64decode(self.config.get("encrypt_key"))
+        envelope = base64.b64decode(encrypted_data)
+        is_envelope = self._is_envelope(envelope)
+
+        # Legacy format keeps the nonce in encrypt_options.
+        # While a secret is rotated, encrypt_options may contain options of both formats.
+        if "nonce" in encrypt_options:
+            if not is_envelope:
+                return self._decrypt_legacy(encrypted_data, encrypt_options)
+
+            try:
+                return self._decrypt_envelope(envelope, encrypt_options)
+            except Exception:
+                return self._decrypt_legacy(encrypted_data, encrypt_options)
+
+        if not is_envelope:
+            raise ERROR_INVALID_ENCRYPTED_DATA(reason="unknown format")
+
+        return self._decrypt_envelope(envelope, encrypt_options)
 
-        aesgcm = AESGCM(data_key)
-        del data_key
+    @staticmethod
+    def _is_envelope(envelope: bytes) -> bool:
+        return len(
+            envelope
+        ) > _ENVELOPE_HEADER_SIZE + _NONCE_SIZE and envelope.startswith(_ENVELOPE_MAGIC)
+
+    def _decrypt_envelope(self, envelope: bytes, encrypt_options: dict) -> dict:
+        header = envelope[:_ENVELOPE_HEADER_SIZE]
+
+        if header[2] == _ENVELOPE_FORMAT_VERSION:
+            cipher = self._get_cipher(header[3])
+        elif header[2] == _DATA_KEY_ENVELOPE_FORMAT_VERSION:
+            if "wrapped_data_key" not in encrypt_options:
+                raise ERROR_INVALID_ENCRYPTED_DATA(reason="wrapped_data_key is missing")
+
+            cipher = self._get_data_key_cipher(encrypt_options["wrapped_data_key"])
+        else:
+            raise ERROR_INVALID_ENCRYPTED_DATA(
+                reason=f"unsupported envelope version {header[2]}"
+            )
+
+        nonce = envelope[_ENVELOPE_HEADER_SIZE : _ENVELOPE_HEADER_SIZE + _NONCE_SIZE]
+        plain_data = cipher.decrypt(
+            nonce, envelope[_ENVELOPE_HEADER_SIZE + _NONCE_SIZE :], header
+        )
+
+        return json.loads(plain_data)
+
+    def _decrypt_legacy(self, encrypted_data: str, encrypt_options: dict) -> dict:
+        nonce = base64.b64decode(encrypt_options["nonce"])
+        cipher = self._get_cipher(
+            int(encrypt_options.get("key_version", _DEFAULT_KEY_VERSION))
+        )
 
         plain_data = self._b64_to_dict(
-            aesgcm.decrypt(nonce, base64.b64decode(encrypted_data), None)
+            cipher.decrypt(nonce, base64.b64decode(encrypted_data), None)
         )
 
         return plain_data
+
+
+def get_encrypt_mutation_handler() -> EncryptMutationHandler:
+    """EncryptMutationHandler of HANDLERS, None if it is not configured"""
+
+    for handler in get_mutation_handlers():
+        if isinstance(handler, EncryptMutationHandler):
+            return handler
+
+    return None
@@ -1,7 +1,7 @@
 from google.protobuf.empty_pb2 import Empty
 from spaceone.core.pygrpc.message_type import *
 
-__all__ = ['EmptyInfo', 'StatisticsInfo']
+__all__ = ['EmptyInfo', 'StatisticsInfo', 'DataVersionMetadata', 'DataWriteMetadata', 'PageTokenMetadata']
 
 
 def EmptyInfo():
@@ -10,3 +10,25 @@ def EmptyInfo():
 
 def StatisticsInfo(result):
     return change_struct_type(result)
+
+
+def DataVersionMetadata(secret_data):
+    # SecretDataInfo has no version field, so data version is returned as trailing metadata
+    return (
+        ('data-version', secret_data.get('data_version', '')),
+        ('not-modified', 'true' if secret_data.get('not_modified') else 'false'),
+    )
+
+
+def DataWriteMetadata(result):
+    # update_data returns Empty, so whether the write to backend was suppressed is returned as trailing metadata
+    return (
+        ('write-suppressed', 'true' if result.get('write_suppressed') else 'false'),
+    )
+
+
+def PageTokenMetadata(next_token):
+    # Query has no page token field, so next token is returned as trailing metadata (empty on the last page)
+    return (
+        ('next-token', next_token or ''),
+    )
@@ -1,5 +1,4 @@
 import logging
-import functools
 from spaceone.api.secret.v1 import secret_pb2
 from spaceone.core.pygrpc.message_type import *
 from spaceone.core import utils
@@ -8,6 +7,15 @@ from spaceone.secret.model.secret_model import Secret
 __all__ = ["SecretInfo", "SecretsInfo", "SecretDataInfo"]
 _LOGGER = logging.getLogger(__name__)
 
+_MINIMAL_FIELDS = ["secret_id", "name", "schema_id", "provider"]
+_FIELDS = _MINIMAL_FIELDS + [
+    "trusted_secret_id",
+    "service_account_id",
+    "project_id",
+    "workspace_id",
+    "domain_id",
+]
+
 
 def SecretDataInfo(secret_data):
     info = {
@@ -44,7 +52,33 @@ def SecretInfo(secret_vo: Secret, minimal=False):
     return secret_pb2.SecretInfo(**info)
 
 
-def SecretsInfo(secret_vos, total_count, **kwargs):
-    results = list(map(functools.partial(SecretInfo, **kwargs), secret_vos))
+def SecretsInfo(secret_vos, total_count, minimal=False, **kwargs):
+    # Messages are filled in place, so that each result isn't built and copied
+    secrets_info = secret_pb2.SecretsInfo(total_count=total_count)
+
+    for secret_vo in secret_vos:
+        _fill_secret_info(secrets_info.results.add(), secret_vo, minimal)
+
+    return secrets_info
+
+
+def _fill_secret_info(info, secret_vo, minimal):
+    fields = _MINIMAL_FIELDS if minimal else _FIELDS
+
+    for field in fields:
+        value = getattr(secret_vo, field)
+        if value is not None:
+            setattr(info, field, value)
+
+    if minimal is False:
+        if secret_vo.resource_group:
+            info.resource_group = secret_pb2.SecretInfo.ResourceGroup.Value(
+                secret_vo.resource_group
+            )
+
+        info.tags.SetInParent()
+        if secret_vo.tags:
+            info.tags.update(secret_vo.tags)
 
-    return secret_pb2.SecretsInfo(results=results, total_count=total_count)
+        if secret_vo.created_at:
+            info.created_at = utils.datetime_to_iso8601(secret_vo.created_at)
@@ -0,0 +1,9 @@
+from spaceone.core.pygrpc import BaseAPI
+from spaceone.secret.lib.deadline import set_deadline
+
+
+class BaseSecretAPI(BaseAPI):
+    def parse_request(self, request_or_iterator, context):
+        # Remaining time of the gRPC deadline is the budget of backend calls in this request
+        set_deadline(context.time_remaining())
+        return super().parse_request(request_or_iterator, context)
@@ -1,8 +1,8 @@
 from spaceone.api.secret.v1 import secret_pb2, secret_pb2_grpc
-from spaceone.core.pygrpc import BaseAPI
+from spaceone.secret.interface.grpc.base import BaseSecretAPI
 
 
-class Secret(BaseAPI, secret_pb2_grpc.SecretServicer):
+class Secret(BaseSecretAPI, secret_pb2_grpc.SecretServicer):
 
     pb2 = secret_pb2
     pb2_grpc = secret_pb2_grpc
@@ -30,14 +30,19 @@ class Secret(BaseAPI, secret_pb2_grpc.SecretServicer):
         params, metadata = self.parse_request(request, context)
 
         with self.locator.get_service('SecretService', metadata) as secret_service:
-            secret_service.update_data(params)
+            result = secret_service.update_data(params)
+            context.set_trailing_metadata(self.locator.get_info('DataWriteMetadata', result))
             return self.locator.get_info('EmptyInfo')
 
     def get_data(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if 'if-version' in metadata:
+            params['if_version'] = metadata['if-version']
+
         with self.locator.get_service('SecretService', metadata) as secret_service:
             secret_data = secret_service.get_data(params)
+            context.set_trailing_metadata(self.locator.get_info('DataVersionMetadata', secret_data))
             return self.locator.get_info('SecretDataInfo', secret_data)
 
     def get(self, request, context):
@@ -49,8 +54,16 @@ class Secret(BaseAPI, secret_pb2_grpc.SecretServicer):
     def list(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if 'page-token' in metadata:
+            params['page_token'] = metadata['page-token']
+            params['include_count'] = metadata.get('include-count') == 'true'
+
         with self.locator.get_service('SecretService', metadata) as secret_service:
-            secret_vos, total_count = secret_service.list(params)
+            secret_vos, total_count, next_token = secret_service.list(params)
+
+            if 'page_token' in params:
+                context.set_trailing_metadata(self.locator.get_info('PageTokenMetadata', next_token))
+
             return self.locator.get_info('SecretsInfo', secret_vos, total_count,
                                          minimal=self.get_minimal(params))
 
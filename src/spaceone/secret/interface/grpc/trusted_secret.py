@@ -1,8 +1,8 @@
 from spaceone.api.secret.v1 import trusted_secret_pb2, trusted_secret_pb2_grpc
-from spaceone.core.pygrpc import BaseAPI
+from spaceone.secret.interface.grpc.base import BaseSecretAPI
 
 
-class TrustedSecret(BaseAPI, trusted_secret_pb2_grpc.TrustedSecretServicer):
+class TrustedSecret(BaseSecretAPI, trusted_secret_pb2_grpc.TrustedSecretServicer):
 
     pb2 = trusted_secret_pb2
     pb2_grpc = trusted_secret_pb2_grpc
@@ -30,14 +30,19 @@ class TrustedSecret(BaseAPI, trusted_secret_pb2_grpc.TrustedSecretServicer):
         params, metadata = self.parse_request(request, context)
 
         with self.locator.get_service('TrustedSecretService', metadata) as trusted_secret_service:
-            trusted_secret_service.update_data(params)
+            result = trusted_secret_service.update_data(params)
+            context.set_trailing_metadata(self.locator.get_info('DataWriteMetadata', result))
             return self.locator.get_info('EmptyInfo')
 
     def get_data(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if 'if-version' in metadata:
+            params['if_version'] = metadata['if-version']
+
         with self.locator.get_service('TrustedSecretService', metadata) as trusted_secret_service:
             trusted_secret_data = trusted_secret_service.get_data(params)
+            context.set_trailing_metadata(self.locator.get_info('DataVersionMetadata', trusted_secret_data))
             return self.locator.get_info('TrustedSecretDataInfo', trusted_secret_data)
 
     def get(self, request, context):
@@ -49,8 +54,16 @@ class TrustedSecret(BaseAPI, trusted_secret_pb2_grpc.TrustedSecretServicer):
     def list(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if 'page-token' in metadata:
+            params['page_token'] = metadata['page-token']
+            params['include_count'] = metadata.get('include-count') == 'true'
+
         with self.locator.get_service('TrustedSecretService', metadata) as trusted_secret_service:
-            trusted_secret_vos, total_count = trusted_secret_service.list(params)
+            trusted_secret_vos, total_count, next_token = trusted_secret_service.list(params)
+
+            if 'page_token' in params:
+                context.set_trailing_metadata(self.locator.get_info('PageTokenMetadata', next_token))
+
             return self.locator.get_info('TrustedSecretsInfo', trusted_secret_vos, total_count,
                                          minimal=self.get_minimal(params))
 
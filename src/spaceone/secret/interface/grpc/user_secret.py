@@ -1,8 +1,8 @@
 from spaceone.api.secret.v1 import user_secret_pb2, user_secret_pb2_grpc
-from spaceone.core.pygrpc import BaseAPI
+from spaceone.secret.interface.grpc.base import BaseSecretAPI
 
 
-class UserSecret(BaseAPI, user_secret_pb2_grpc.UserSecretServicer):
+class UserSecret(BaseSecretAPI, user_secret_pb2_grpc.UserSecretServicer):
     pb2 = user_secret_pb2
     pb2_grpc = user_secret_pb2_grpc
 
@@ -41,16 +41,25 @@ class UserSecret(BaseAPI, user_secret_pb2_grpc.UserSecretServicer):
         with self.locator.get_service(
             "UserSecretService", metadata
         ) as user_secret_service:
-            user_secret_service.update_data(params)
+            result = user_secret_service.update_data(params)
+            context.set_trailing_metadata(
+                self.locator.get_info("DataWriteMetadata", result)
+            )
             return self.locator.get_info("EmptyInfo")
 
     def get_data(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if "if-version" in metadata:
+            params["if_version"] = metadata["if-version"]
+
         with self.locator.get_service(
             "UserSecretService", metadata
         ) as user_secret_service:
             user_secret_data = user_secret_service.get_data(params)
+            context.set_trailing_metadata(
+                self.locator.get_info("DataVersionMetadata", user_secret_data)
+            )
             return self.locator.get_info("UserSecretDataInfo", user_secret_data)
 
     def get(self, request, context):
@@ -66,10 +75,20 @@ class UserSecret(BaseAPI, user_secret_pb2_grpc.UserSecretServicer):
     def list(self, request, context):
         params, metadata = self.parse_request(request, context)
 
+        if "page-token" in metadata:
+            params["page_token"] = metadata["page-token"]
+            params["include_count"] = metadata.get("include-count") == "true"
+
         with self.locator.get_service(
             "UserSecretService", metadata
         ) as user_secret_service:
-            user_secret_vos, total_count = user_secret_service.list(params)
+            user_secret_vos, total_count, next_token = user_secret_service.list(params)
+
+            if "page_token" in params:
+                context.set_trailing_metadata(
+                    self.locator.get_info("PageTokenMetadata", next_token)
+                )
+
             return self.locator.get_info(
                 "UserSecretsInfo",
                 user_secret_vos,
@@ -0,0 +1,34 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from spaceone.core import config
+
+__all__ = ["get_backend_executor"]
+
+_LOGGER = logging.getLogger(__name__)
+_EXECUTOR_LOCK = threading.Lock()
+_EXECUTOR = None
+_EXECUTOR_PID = None
+
+
+def get_backend_executor() -> ThreadPoolExecutor:
+    """Process-wide bounded executor for concurrent backend calls
+
+    Tasks submitted to this executor must not wait on other tasks of the same executor.
+    """
+
+    global _EXECUTOR, _EXECUTOR_PID
+
+    if _EXECUTOR is None or _EXECUTOR_PID != os.getpid():
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None or _EXECUTOR_PID != os.getpid():
+                max_workers = config.get_global("BACKEND_MAX_WORKERS", 8)
+                _LOGGER.debug(f"[get_backend_executor] create executor: {max_workers} workers")
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="secret-backend"
+                )
+                _EXECUTOR_PID = os.getpid()
+
+    return _EXECUTOR
@@ -0,0 +1,41 @@
+import hashlib
+
+from spaceone.core import config
+
+__all__ = ["get_backend", "has_backend_routing"]
+
+_DEFAULT_BACKEND = "AWSSecretManagerConnector"
+
+
+def get_backend(resource_type: str, domain_id: str) -> str:
+    """Backend of CONNECTORS where secret data of a new resource is stored
+
+    BACKEND_ROUTING is applied in order of domains, resource_types and domain_hash,
+    and BACKEND is used if none of them is matched.
+
+    Args:
+        resource_type (str): Secret | TrustedSecret | UserSecret
+        domain_id (str)
+    """
+
+    routing_conf = config.get_global("BACKEND_ROUTING") or {}
+
+    if backend := (routing_conf.get("domains") or {}).get(domain_id):
+        return backend
+
+    if backend := (routing_conf.get("resource_types") or {}).get(resource_type):
+        return backend
+
+    if backends := routing_conf.get("domain_hash"):
+        # hash() of str is randomized per process, so sha256 is used to be stable
+        domain_hash = int(hashlib.sha256(domain_id.encode()).hexdigest(), 16)
+        return backends[domain_hash % len(backends)]
+
+    return config.get_global("BACKEND", _DEFAULT_BACKEND)
+
+
+def has_backend_routing() -> bool:
+    routing_conf = config.get_global("BACKEND_ROUTING") or {}
+    return any(
+        routing_conf.get(key) for key in ["domains", "resource_types", "domain_hash"]
+    )
@@ -0,0 +1,71 @@
+import logging
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+from spaceone.core import utils
+from spaceone.core.error import *
+
+__all__ = ["insert_many"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def insert_many(model, data_list: list) -> list:
+    """Create documents of a MongoModel with one unordered insert_many
+
+    Fields are filled like MongoModel.create (generate_id, auto_now, auto_now_add).
+
+    Returns:
+        results (list): vo or ERROR_BASE of each data, in the order of data_list
+    """
+
+    results = [None] * len(data_list)
+    documents = []
+    indexes = []
+
+    for index, data in enumerate(data_list):
+        try:
+            vo = model(**_make_create_data(model, data))
+            vo.validate()
+            documents.append(vo.to_mongo().to_dict())
+            indexes.append(index)
+        except Exception as e:
+            results[index] = ERROR_DB_QUERY(reason=e)
+
+    if len(documents) == 0:
+        return results
+
+    write_errors = {}
+    try:
+        model._get_collection().insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            write_errors[write_error["index"]] = write_error.get("errmsg")
+
+    for position, (index, document) in enumerate(zip(indexes, documents)):
+        if position in write_errors:
+            _LOGGER.error(f"[insert_many] {model.__name__}: {write_errors[position]}")
+            results[index] = ERROR_DB_QUERY(reason=write_errors[position])
+        else:
+            results[index] = model._from_son(document)
+
+    return results
+
+
+def _make_create_data(model, data):
+    create_data = {}
+    now = datetime.utcnow()
+
+    for name, field in model._fields.items():
+        if name in data:
+            create_data[name] = model._trim_value(data[name])
+        else:
+            if generate_id := getattr(field, "generate_id", None):
+                create_data[name] = utils.generate_id(generate_id)
+
+            if getattr(field, "auto_now", False) or getattr(
+                field, "auto_now_add", False
+            ):
+                create_data[name] = now
+
+    return create_data
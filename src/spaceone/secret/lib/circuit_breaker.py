@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+from spaceone.core import config
+
+__all__ = ["CircuitBreaker", "get_circuit_breaker"]
+
+_LOGGER = logging.getLogger(__name__)
+_BREAKER_LOCK = threading.Lock()
+_CIRCUIT_BREAKERS = {}
+_STATES = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
+
+
+class CircuitBreaker(object):
+    """Consecutive failure counter of a backend
+
+    The circuit opens after failure_threshold consecutive failures and rejects calls
+    for reset_timeout seconds. Then one trial call is allowed (half-open),
+    which closes the circuit if it succeeds or opens it again if it fails.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at = None
+        self._trial_at = None
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._get_state()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._get_state()
+
+            if state == "CLOSED":
+                return True
+
+            # Another trial call is allowed if the previous one doesn't return in reset_timeout
+            if state == "HALF_OPEN" and (
+                self._trial_at is None
+                or time.monotonic() - self._trial_at >= self.reset_timeout
+            ):
+                self._trial_at = time.monotonic()
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                _LOGGER.info(f"[CircuitBreaker] {self.name} is closed")
+
+            self._failures = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+            if self._trial_at is not None or (
+                self._opened_at is None and self._failures >= self.failure_threshold
+            ):
+                _LOGGER.error(
+                    f"[CircuitBreaker] {self.name} is open for {self.reset_timeout}s "
+                    f"({self._failures} consecutive failures)"
+                )
+                self._opened_at = time.monotonic()
+                self._trial_at = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._get_state(),
+                "failures": self._failures,
+                "rejected": self._rejected,
+            }
+
+    def _get_state(self) -> str:
+        if self._opened_at is None:
+            return "CLOSED"
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "HALF_OPEN"
+
+        return "OPEN"
+
+
+def get_circuit_breaker(backend: str) -> [CircuitBreaker, None]:
+    """Process-wide circuit breaker of the backend, None if CIRCUIT_BREAKER is disabled"""
+
+    circuit_breaker = _CIRCUIT_BREAKERS.get(backend)
+
+    if circuit_breaker is None:
+        breaker_conf = config.get_global("CIRCUIT_BREAKER", {})
+        if not breaker_conf.get("enabled", False):
+            return None
+
+        with _BREAKER_LOCK:
+            circuit_breaker = _CIRCUIT_BREAKERS.get(backend)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(
+                    backend,
+                    failure_threshold=breaker_conf.get("failure_threshold", 5),
+                    reset_timeout=breaker_conf.get("reset_timeout", 30),
+                )
+                _CIRCUIT_BREAKERS[backend] = circuit_breaker
+
+    return circuit_breaker
+
+
+def _observe_states(options):
+    for backend, circuit_breaker in list(_CIRCUIT_BREAKERS.items()):
+        state = circuit_breaker.get_stats()["state"]
+        yield Observation(_STATES[state], {"backend": backend})
+
+
+def _observe_rejected(options):
+    for backend, circuit_breaker in list(_CIRCUIT_BREAKERS.items()):
+        yield Observation(circuit_breaker.get_stats()["rejected"], {"backend": backend})
+
+
+_METER = metrics.get_meter(__name__)
+_METER.create_observable_gauge(
+    "secret.backend.circuit_breaker.state",
+    callbacks=[_observe_states],
+    description="State of circuit breaker (0: CLOSED, 1: HALF_OPEN, 2: OPEN)",
+)
+_METER.create_observable_counter(
+    "secret.backend.circuit_breaker.rejected",
+    callbacks=[_observe_rejected],
+    description="Backend calls rejected by open circuit breaker",
+)
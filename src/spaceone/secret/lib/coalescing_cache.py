@@ -0,0 +1,114 @@
+import copy
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from spaceone.core import cache, config
+
+from spaceone.secret.lib.backend_executor import get_backend_executor
+
+__all__ = ["CoalescingCache", "get_identity_cache"]
+
+_LOGGER = logging.getLogger(__name__)
+_CACHE_LOCK = threading.Lock()
+_IDENTITY_CACHE = None
+
+
+class CoalescingCache(object):
+    """TTL cache on a CACHES alias with request coalescing and stale serving
+
+    - fresh (age < ttl): cached value is returned
+    - stale (age < ttl + stale_ttl): cached value is returned and refreshed in the background
+    - expired or missing: value is loaded, and concurrent loads of the same key wait for one call
+    """
+
+    def __init__(
+        self,
+        key_prefix: str,
+        ttl: int = 30,
+        stale_ttl: int = 30,
+        alias: str = "local",
+    ):
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.alias = alias
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable):
+        cache_key = f"{self.key_prefix}:{key}"
+
+        if not cache.is_set(self.alias):
+            return loader()
+
+        cached = cache.get(cache_key, alias=self.alias)
+
+        if cached is not None:
+            loaded_at, value = cached
+            age = time.monotonic() - loaded_at
+
+            if age < self.ttl:
+                return copy.deepcopy(value)
+
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(cache_key, loader)
+                return copy.deepcopy(value)
+
+        future, is_leader = self._get_in_flight(cache_key)
+
+        if is_leader:
+            self._load(cache_key, loader, future)
+
+        return copy.deepcopy(future.result())
+
+    def _get_in_flight(self, cache_key: str) -> (Future, bool):
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._in_flight[cache_key] = future
+            return future, True
+
+    def _refresh_in_background(self, cache_key: str, loader: Callable) -> None:
+        future, is_leader = self._get_in_flight(cache_key)
+
+        if is_leader:
+            get_backend_executor().submit(self._load, cache_key, loader, future)
+
+    def _load(self, cache_key: str, loader: Callable, future: Future) -> None:
+        try:
+            value = loader()
+            cache.set(cache_key, (time.monotonic(), value), alias=self.alias)
+            future.set_result(value)
+        except Exception as e:
+            _LOGGER.debug(f"[CoalescingCache._load] failed to load {cache_key}: {e}")
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+
+
+def get_identity_cache() -> [CoalescingCache, None]:
+    global _IDENTITY_CACHE
+
+    if _IDENTITY_CACHE is None:
+        cache_conf = config.get_global("IDENTITY_CACHE", {})
+        if not cache_conf.get("enabled", False):
+            return None
+
+        with _CACHE_LOCK:
+            if _IDENTITY_CACHE is None:
+                _LOGGER.debug(f"[get_identity_cache] create cache: {cache_conf}")
+                _IDENTITY_CACHE = CoalescingCache(
+                    "secret:identity",
+                    ttl=cache_conf.get("ttl", 30),
+                    stale_ttl=cache_conf.get("stale_ttl", 30),
+                    alias=cache_conf.get("alias", "local"),
+                )
+
+    return _IDENTITY_CACHE
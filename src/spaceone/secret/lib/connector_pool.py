@@ -0,0 +1,139 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+from spaceone.core import config, utils
+from spaceone.core.locator import Locator
+
+__all__ = ["get_connector", "check_connectors", "close_connectors"]
+
+_LOGGER = logging.getLogger(__name__)
+# Reentrant, so that a connector can get its own connectors from the pool (e.g. TieredSecretConnector)
+_POOL_LOCK = threading.RLock()
+_CONNECTORS = {}
+_POOL_PID = os.getpid()
+_HEALTH_RESULTS = {}
+_HEALTH_CHECKER = None
+
+
+def _make_pool_key(backend: str) -> tuple:
+    return backend, utils.dict_to_hash(config.get_connector(backend))
+
+
+def _reset_after_fork() -> None:
+    # Clients inherited from the parent process share its sockets, so they are
+    # dropped without being closed and created again on first use.
+    global _POOL_LOCK, _CONNECTORS, _POOL_PID, _HEALTH_RESULTS, _HEALTH_CHECKER
+
+    _POOL_LOCK = threading.RLock()
+    _CONNECTORS = {}
+    _POOL_PID = os.getpid()
+    _HEALTH_RESULTS = {}
+    _HEALTH_CHECKER = None
+
+
+def get_connector(backend: str):
+    """Get a backend connector shared by all transactions of this process
+
+    Connectors are keyed by backend name and the hash of its configuration,
+    so a changed configuration creates a new connector.
+    """
+
+    if _POOL_PID != os.getpid():
+        _reset_after_fork()
+
+    pool_key = _make_pool_key(backend)
+    connector = _CONNECTORS.get(pool_key)
+
+    if connector is None:
+        with _POOL_LOCK:
+            connector = _CONNECTORS.get(pool_key)
+            if connector is None:
+                _LOGGER.debug(f"[get_connector] create connector: {backend}")
+                connector = Locator.get_connector(backend)
+                _CONNECTORS[pool_key] = connector
+                _start_health_checker()
+
+    return connector
+
+
+def check_connectors() -> dict:
+    """Run the health check of all pooled connectors
+
+    The results are kept as the last health of each backend,
+    which is reported by the secret.backend.healthy gauge.
+
+    Returns:
+        results (dict): {backend: True | False}
+    """
+
+    global _HEALTH_RESULTS
+
+    results = {}
+    for (backend, config_hash), connector in list(_CONNECTORS.items()):
+        try:
+            if hasattr(connector, "health_check"):
+                connector.health_check()
+            results[backend] = True
+        except Exception as e:
+            _LOGGER.error(f"[check_connectors] {backend} is unhealthy: {e}")
+            results[backend] = False
+
+    _HEALTH_RESULTS = results
+    return results
+
+
+def _start_health_checker() -> None:
+    # Health checks can block on an unreachable backend, so they run periodically
+    # by a daemon thread instead of the metric collection.
+    global _HEALTH_CHECKER
+
+    interval = config.get_global("CONNECTOR_HEALTH_CHECK_INTERVAL", 30)
+    if _HEALTH_CHECKER is not None or not interval:
+        return
+
+    def _check_periodically():
+        while True:
+            time.sleep(interval)
+            check_connectors()
+
+    _HEALTH_CHECKER = threading.Thread(
+        target=_check_periodically, name="connector-health-check", daemon=True
+    )
+    _HEALTH_CHECKER.start()
+
+
+def _observe_health(options):
+    for backend, healthy in _HEALTH_RESULTS.items():
+        yield Observation(1 if healthy else 0, {"backend": backend})
+
+
+_METER = metrics.get_meter(__name__)
+_METER.create_observable_gauge(
+    "secret.backend.healthy",
+    callbacks=[_observe_health],
+    description="Health check of pooled backend connectors (1: healthy, 0: unhealthy)",
+)
+
+
+def close_connectors() -> None:
+    with _POOL_LOCK:
+        connectors = list(_CONNECTORS.items())
+        _CONNECTORS.clear()
+
+    for (backend, config_hash), connector in connectors:
+        try:
+            if hasattr(connector, "close"):
+                _LOGGER.debug(f"[close_connectors] close connector: {backend}")
+                connector.close()
+        except Exception as e:
+            _LOGGER.error(f"[close_connectors] failed to close {backend}: {e}")
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(close_connectors)
@@ -0,0 +1,39 @@
+import base64
+import hashlib
+import hmac
+import json
+
+from spaceone.core import config
+
+__all__ = ["make_data_hash", "get_data_hash"]
+
+
+def make_data_hash(data: dict, key: bytes) -> str:
+    """HMAC-SHA256 of data canonicalized as JSON with sorted keys"""
+
+    canonical_data = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+    return hmac.new(key, canonical_data, hashlib.sha256).hexdigest()
+
+
+def get_data_hash(params: dict):
+    """data_hash of create or update_data params
+
+    EncryptMutationHandler sets data_hash of plain data before it is encrypted.
+    Otherwise plain data is hashed with DATA_HASH_KEY, and data_hash is None without the key,
+    so that plain data can't be guessed from an unkeyed hash in the database.
+    Data encrypted by the client can't be compared, so its data_hash is None.
+    """
+
+    if "data_hash" in params:
+        return params["data_hash"]
+
+    if params.get("encrypted"):
+        return None
+
+    if data_hash_key := config.get_global("DATA_HASH_KEY"):
+        return make_data_hash(params["data"], base64.b64decode(data_hash_key))
+
+    return None
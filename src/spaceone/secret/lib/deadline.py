@@ -0,0 +1,126 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from opentelemetry import metrics
+
+from spaceone.core import config
+from spaceone.secret.error.custom import ERROR_SECRET_BACKEND_DEADLINE_EXCEEDED
+
+__all__ = [
+    "set_deadline",
+    "get_deadline",
+    "deadline_scope",
+    "get_timeout",
+    "call_with_retry",
+    "DeadlineSession",
+]
+
+_LOGGER = logging.getLogger(__name__)
+_LOCAL = threading.local()
+
+_METER = metrics.get_meter(__name__)
+_RETRY_COUNTER = _METER.create_counter(
+    "secret.backend.retries", description="Retried backend calls"
+)
+_TIMEOUT_COUNTER = _METER.create_counter(
+    "secret.backend.timeouts", description="Backend calls stopped by the deadline"
+)
+
+
+def set_deadline(time_remaining: [float, None]) -> None:
+    """Set the deadline of the current request from context.time_remaining() of gRPC"""
+
+    if time_remaining is None:
+        _LOCAL.deadline = None
+    else:
+        _LOCAL.deadline = time.monotonic() + time_remaining
+
+
+def get_deadline() -> [float, None]:
+    """Deadline of the current thread (time.monotonic()), None if there is no deadline"""
+    return getattr(_LOCAL, "deadline", None)
+
+
+@contextmanager
+def deadline_scope(deadline: [float, None]):
+    """Apply the deadline of a request to backend calls in another thread (e.g. an executor)"""
+
+    previous_deadline = get_deadline()
+    _LOCAL.deadline = deadline
+
+    try:
+        yield
+    finally:
+        _LOCAL.deadline = previous_deadline
+
+
+def get_timeout(timeout: [float, None] = None) -> [float, None]:
+    """Timeout of a backend call, bounded by the remaining time of the deadline"""
+
+    deadline = get_deadline()
+    if deadline is None:
+        return timeout
+
+    remaining_time = max(deadline - time.monotonic(), 0.001)
+    if timeout is None:
+        return remaining_time
+
+    return min(timeout, remaining_time)
+
+
+def call_with_retry(func, backend: str, is_retryable=None):
+    """Call func() and retry with jittered exponential backoff within the deadline
+
+    Args:
+        func (callable)
+        backend (str): name of the backend for metrics
+        is_retryable (callable): error => bool, func is not retried if None
+    """
+
+    retry_conf = config.get_global("BACKEND_RETRY", {})
+    max_retries = retry_conf.get("max_retries", 2) if is_retryable else 0
+    base_delay = retry_conf.get("base_delay", 0.05)
+    max_delay = retry_conf.get("max_delay", 1)
+    deadline = get_deadline()
+    attempt = 0
+
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            _TIMEOUT_COUNTER.add(1, {"backend": backend})
+            raise ERROR_SECRET_BACKEND_DEADLINE_EXCEEDED(backend=backend)
+
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+
+            # Full jitter, so that retries of many requests are spread
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                _TIMEOUT_COUNTER.add(1, {"backend": backend})
+                raise
+
+            _LOGGER.debug(
+                f"[call_with_retry] retry {backend} after {delay:.3f}s "
+                f"({attempt + 1}/{max_retries}): {e}"
+            )
+            _RETRY_COUNTER.add(1, {"backend": backend})
+            time.sleep(delay)
+            attempt += 1
+
+
+class DeadlineSession(requests.Session):
+    """requests session whose timeout is bounded by the deadline of the current thread"""
+
+    def __init__(self, timeout: float = None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs["timeout"] = get_timeout(kwargs.get("timeout") or self.timeout)
+        return super().request(*args, **kwargs)
@@ -0,0 +1,249 @@
+import collections
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+from spaceone.core import config
+
+__all__ = ["HedgedRead", "get_hedged_read"]
+
+_LOGGER = logging.getLogger(__name__)
+_HEDGE_LOCK = threading.Lock()
+_HEDGED_READS = {}
+_EXECUTORS = None
+_EXECUTORS_PID = None
+
+# The delay is max_delay until the percentile of latencies can be estimated
+_MIN_SAMPLES = 20
+
+
+class HedgedRead(object):
+    """Read from a secondary backend if the primary backend doesn't respond in time
+
+    The delay is the percentile of recent latencies of the primary backend,
+    so about (100 - percentile)% of reads send a second request.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        secondary_backend: str,
+        percentile: float = 95,
+        min_delay: float = 0.01,
+        max_delay: float = 1,
+        window: int = 1000,
+    ):
+        self.backend = backend
+        self.secondary_backend = secondary_backend
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._hedged = 0
+        self._secondary_wins = 0
+        self._skipped = 0
+
+    @property
+    def delay(self) -> float:
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        if len(latencies) < _MIN_SAMPLES:
+            return self.max_delay
+
+        index = min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)
+        return min(max(latencies[index], self.min_delay), self.max_delay)
+
+    def read(self, primary, secondary, is_complete=bool):
+        """Call primary(), and secondary() if primary is slower than delay or fails
+
+        A result of secondary is only returned if is_complete(result) is true,
+        so that data missing in the secondary backend (e.g. not replicated yet) is not returned.
+        Primaries and secondaries run on their own executors, which don't queue calls:
+        if the primary executor is full, primary is called without hedging,
+        and if the secondary executor is full, the result of primary is waited for.
+
+        Returns:
+            the first successful result, the error of primary if it fails and secondary has no result
+        """
+
+        primary_executor, secondary_executor = _get_hedge_executors()
+        start_time = time.monotonic()
+        primary_future = primary_executor.submit(primary)
+
+        if primary_future is None:
+            self._add_skipped()
+            return primary()
+
+        done, _ = wait([primary_future], timeout=self.delay)
+
+        if done and primary_future.exception() is None:
+            self._add_latency(time.monotonic() - start_time)
+            return primary_future.result()
+
+        secondary_future = secondary_executor.submit(secondary)
+        if secondary_future is None:
+            self._add_skipped()
+            return primary_future.result()
+
+        with self._lock:
+            self._hedged += 1
+
+        futures = {primary_future: "primary", secondary_future: "secondary"}
+        errors = {}
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                errors[futures[future]] = future.exception()
+                continue
+
+            if futures[future] == "primary":
+                self._add_latency(time.monotonic() - start_time)
+                return future.result()
+
+            if not is_complete(future.result()):
+                # Missing in secondary, so the result of primary is waited for
+                continue
+
+            with self._lock:
+                self._secondary_wins += 1
+
+            return future.result()
+
+        _LOGGER.error(
+            f"[HedgedRead] {self.backend} failed and {self.secondary_backend} "
+            f"has no result: {errors}"
+        )
+        raise errors["primary"]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "secondary_backend": self.secondary_backend,
+                "samples": len(self._latencies),
+                "hedged": self._hedged,
+                "secondary_wins": self._secondary_wins,
+                "skipped": self._skipped,
+            }
+
+    def _add_latency(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _add_skipped(self) -> None:
+        with self._lock:
+            self._skipped += 1
+
+
+def get_hedged_read(backend: str) -> [HedgedRead, None]:
+    """Process-wide hedged read of the backend, None if HEDGED_READ is disabled or has no secondary"""
+
+    hedged_read = _HEDGED_READS.get(backend)
+
+    if hedged_read is None:
+        hedge_conf = config.get_global("HEDGED_READ", {})
+        secondary_backend = (hedge_conf.get("backends") or {}).get(backend)
+        if not hedge_conf.get("enabled", False) or secondary_backend is None:
+            return None
+
+        with _HEDGE_LOCK:
+            hedged_read = _HEDGED_READS.get(backend)
+            if hedged_read is None:
+                hedged_read = HedgedRead(
+                    backend,
+                    secondary_backend,
+                    percentile=hedge_conf.get("percentile", 95),
+                    min_delay=hedge_conf.get("min_delay", 0.01),
+                    max_delay=hedge_conf.get("max_delay", 1),
+                    window=hedge_conf.get("window", 1000),
+                )
+                _HEDGED_READS[backend] = hedged_read
+
+    return hedged_read
+
+
+class _NonBlockingExecutor(object):
+    """ThreadPoolExecutor which doesn't queue calls, submit returns None if all workers are busy"""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def submit(self, func) -> [Future, None]:
+        if not self._slots.acquire(blocking=False):
+            return None
+
+        try:
+            future = self._executor.submit(func)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+def _get_hedge_executors() -> (_NonBlockingExecutor, _NonBlockingExecutor):
+    """Executors of primaries and secondaries
+
+    Separate from the backend executor, whose tasks may read with hedging.
+    A primary which hangs only holds a worker of the primary executor,
+    so secondaries can still be sent.
+    """
+
+    global _EXECUTORS, _EXECUTORS_PID
+
+    if _EXECUTORS is None or _EXECUTORS_PID != os.getpid():
+        with _HEDGE_LOCK:
+            if _EXECUTORS is None or _EXECUTORS_PID != os.getpid():
+                hedge_conf = config.get_global("HEDGED_READ", {})
+                primary_max_workers = hedge_conf.get(
+                    "primary_max_workers", config.get_global("MAX_WORKERS", 100)
+                )
+                _EXECUTORS = (
+                    _NonBlockingExecutor(primary_max_workers, "secret-hedge-primary"),
+                    _NonBlockingExecutor(
+                        hedge_conf.get("max_workers", 16), "secret-hedge-secondary"
+                    ),
+                )
+                _EXECUTORS_PID = os.getpid()
+
+    return _EXECUTORS
+
+
+def _observe_stats(key):
+    def _observe(options):
+        for backend, hedged_read in list(_HEDGED_READS.items()):
+            stats = hedged_read.get_stats()
+            yield Observation(
+                stats[key],
+                {"backend": backend, "secondary_backend": stats["secondary_backend"]},
+            )
+
+    return _observe
+
+
+_METER = metrics.get_meter(__name__)
+_METER.create_observable_counter(
+    "secret.backend.hedged_reads",
+    callbacks=[_observe_stats("hedged")],
+    description="Reads sent to the secondary backend",
+)
+_METER.create_observable_counter(
+    "secret.backend.hedged_read.secondary_wins",
+    callbacks=[_observe_stats("secondary_wins")],
+    description="Reads answered by the secondary backend",
+)
+_METER.create_observable_counter(
+    "secret.backend.hedged_read.skipped",
+    callbacks=[_observe_stats("skipped")],
+    description="Reads not hedged because the hedge executors are full",
+)
@@ -0,0 +1,31 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+__all__ = ["create_index_in_background"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_index_in_background(model_name: str, create_index: Callable) -> None:
+    """Build indexes of a model by a daemon thread
+
+    Index builds of large collections can take minutes, so startup isn't blocked by them.
+    Queries fall back to the existing indexes until the build is finished.
+    """
+
+    def _create_index():
+        start = time.perf_counter()
+        try:
+            create_index()
+            _LOGGER.debug(
+                f"[create_index_in_background] {model_name} indexes are built "
+                f"({time.perf_counter() - start:.2f}s)"
+            )
+        except Exception as e:
+            _LOGGER.error(f"[create_index_in_background] {model_name}: {e}")
+
+    threading.Thread(
+        target=_create_index, name=f"{model_name}-index", daemon=True
+    ).start()
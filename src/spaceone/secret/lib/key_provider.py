@@ -0,0 +1,128 @@
+import abc
+import base64
+import logging
+import os
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from spaceone.core.error import *
+
+__all__ = [
+    "BaseKeyProvider",
+    "LocalFileKeyProvider",
+    "AWSKMSKeyProvider",
+    "create_key_provider",
+]
+
+_LOGGER = logging.getLogger(__name__)
+_DATA_KEY_SIZE = 32
+_NONCE_SIZE = 12
+
+
+class BaseKeyProvider(abc.ABC):
+    """Master key provider which wraps and unwraps data keys"""
+
+    def __init__(self, provider_conf: dict):
+        self.config = provider_conf
+
+    @abc.abstractmethod
+    def generate_data_key(self) -> (bytes, bytes):
+        """
+        Returns:
+            plain_data_key (bytes), wrapped_data_key (bytes)
+        """
+        raise NotImplementedError("generate_data_key method not implemented!")
+
+    @abc.abstractmethod
+    def unwrap_data_key(self, wrapped_data_key: bytes) -> bytes:
+        raise NotImplementedError("unwrap_data_key method not implemented!")
+
+
+class LocalFileKeyProvider(BaseKeyProvider):
+    """Master key is read from a local file which contains a base64 encoded 256 bit key
+
+    This provider is intended for development and tests.
+    """
+
+    def __init__(self, provider_conf: dict):
+        super().__init__(provider_conf)
+        path = self.config.get("path")
+
+        if path is None:
+            raise ERROR_HANDLER_CONFIGURATION(
+                handler="LocalFileKeyProvider", reason="path is required."
+            )
+
+        with open(path, "r") as f:
+            self._master_key = AESGCM(base64.b64decode(f.read().strip()))
+
+    def generate_data_key(self) -> (bytes, bytes):
+        plain_data_key = AESGCM.generate_key(bit_length=_DATA_KEY_SIZE * 8)
+        nonce = os.urandom(_NONCE_SIZE)
+        wrapped_data_key = nonce + self._master_key.encrypt(nonce, plain_data_key, None)
+        return plain_data_key, wrapped_data_key
+
+    def unwrap_data_key(self, wrapped_data_key: bytes) -> bytes:
+        nonce = wrapped_data_key[:_NONCE_SIZE]
+        return self._master_key.decrypt(nonce, wrapped_data_key[_NONCE_SIZE:], None)
+
+
+class AWSKMSKeyProvider(BaseKeyProvider):
+    def __init__(self, provider_conf: dict):
+        super().__init__(provider_conf)
+        import boto3
+
+        self.key_id = self.config.get("key_id")
+        aws_access_key_id = self.config.get("aws_access_key_id")
+        aws_secret_access_key = self.config.get("aws_secret_access_key")
+        region_name = self.config.get("region_name")
+
+        if self.key_id is None or region_name is None:
+            raise ERROR_HANDLER_CONFIGURATION(
+                handler="AWSKMSKeyProvider", reason="key_id and region_name are required."
+            )
+
+        if aws_access_key_id and aws_secret_access_key:
+            self.client = boto3.client(
+                "kms",
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                region_name=region_name,
+            )
+        else:
+            self.client = boto3.client("kms", region_name=region_name)
+
+    def generate_data_key(self) -> (bytes, bytes):
+        response = self.client.generate_data_key(KeyId=self.key_id, KeySpec="AES_256")
+        return response["Plaintext"], response["CiphertextBlob"]
+
+    def unwrap_data_key(self, wrapped_data_key: bytes) -> bytes:
+        response = self.client.decrypt(
+            KeyId=self.key_id, CiphertextBlob=wrapped_data_key
+        )
+        return response["Plaintext"]
+
+
+_KEY_PROVIDERS = {
+    "LOCAL_FILE": LocalFileKeyProvider,
+    "AWS_KMS": AWSKMSKeyProvider,
+}
+
+
+def create_key_provider(provider_conf: dict) -> BaseKeyProvider:
+    """
+    Args:
+        provider_conf (dict): {
+            'type': 'LOCAL_FILE | AWS_KMS',
+            ...                                 # options of each provider
+        }
+    """
+
+    provider_type = provider_conf.get("type")
+
+    if provider_type not in _KEY_PROVIDERS:
+        raise ERROR_HANDLER_CONFIGURATION(
+            handler="KeyProvider", reason=f"type({provider_type}) is not supported."
+        )
+
+    _LOGGER.debug(f"[create_key_provider] create key provider: {provider_type}")
+    return _KEY_PROVIDERS[provider_type](provider_conf)
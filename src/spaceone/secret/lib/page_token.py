@@ -0,0 +1,92 @@
+import base64
+import json
+import logging
+
+from bson import ObjectId
+from mongoengine import Q
+from spaceone.core.error import *
+
+__all__ = ["query_by_page_token", "make_page"]
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_PAGE_SIZE = 100
+_MAX_PAGE_SIZE = 1000
+
+
+def query_by_page_token(
+    model, query: dict, page_token: str = None, include_count: bool = False
+):
+    """Query one page ordered by (name, id) after the position of page_token
+
+    Returns:
+        queryset (limit + 1 items), total_count, limit
+    """
+
+    query = dict(query)
+    page = query.pop("page", None) or {}
+    limit = min(page.get("limit") or _DEFAULT_PAGE_SIZE, _MAX_PAGE_SIZE)
+    _check_sort(query.pop("sort", None))
+
+    vos, total_count = model.query(**query, include_count=include_count)
+
+    if query.get("count_only"):
+        return [], total_count, limit
+
+    if not hasattr(vos, "order_by"):
+        raise ERROR_INVALID_PARAMETER(
+            key="query", reason="page_token can't be used with lookup or unwind."
+        )
+
+    if page_token:
+        vos = vos.filter(_make_position_filter(*_decode_page_token(page_token)))
+
+    return vos.order_by("name", "id").limit(limit + 1), total_count, limit
+
+
+def make_page(items: list, limit: int, get_position):
+    """
+    Args:
+        items (list): result of query_by_page_token
+        limit (int): page size
+        get_position (func): item => (name, id)
+
+    Returns:
+        items of page, next_token (None if last page)
+    """
+
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, _encode_page_token(*get_position(items[-1]))
+
+
+def _check_sort(sort):
+    for sort_option in sort or []:
+        if sort_option.get("key") != "name" or sort_option.get("desc", False):
+            raise ERROR_INVALID_PARAMETER(
+                key="query.sort", reason="page_token only supports ordering by name."
+            )
+
+
+def _make_position_filter(name, object_id):
+    # Missing names are ordered first, like MongoDB does
+    if name is None:
+        return Q(name=None, id__gt=object_id) | Q(name__ne=None)
+
+    # name__gte bounds the index scan, and the rest is filtered on the index keys
+    return Q(name__gte=name) & (Q(name__gt=name) | Q(id__gt=object_id))
+
+
+def _encode_page_token(name, object_id) -> str:
+    position = json.dumps([name, str(object_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def _decode_page_token(page_token: str):
+    try:
+        name, object_id = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+        return name, ObjectId(object_id)
+    except Exception as e:
+        _LOGGER.debug(f"[_decode_page_token] invalid page token: {e}")
+        raise ERROR_INVALID_PARAMETER(key="page_token", reason="page_token is invalid.")
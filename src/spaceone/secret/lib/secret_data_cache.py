@@ -0,0 +1,128 @@
+import copy
+import logging
+import threading
+
+from cachetools import TTLCache
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+from spaceone.core import config
+
+__all__ = ["SecretDataCache", "get_secret_data_cache"]
+
+_LOGGER = logging.getLogger(__name__)
+_CACHE_LOCK = threading.Lock()
+_SECRET_DATA_CACHE = None
+
+
+class SecretDataCache(object):
+    """Bounded LRU + TTL cache of secret data read from the backend
+
+    Invalidation is process-local. Other processes may serve stale data
+    until the entry expires, so keep the ttl short.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: int = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, secret_id: str):
+        with self._lock:
+            data = self._cache.get(secret_id)
+            if data is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+
+        return copy.deepcopy(data)
+
+    def set(self, secret_id: str, data, version: int = None) -> bool:
+        """Store secret data
+
+        If version is given and the cache has been invalidated since it was
+        read, the value is discarded so that a slow read can't overwrite a newer write.
+        """
+
+        data = copy.deepcopy(data)
+        with self._lock:
+            if version is not None and version != self._version:
+                return False
+
+            self._cache[secret_id] = data
+            return True
+
+    def delete(self, *secret_ids: str) -> None:
+        with self._lock:
+            self._version += 1
+            for secret_id in secret_ids:
+                self._cache.pop(secret_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+            }
+
+
+def get_secret_data_cache() -> [SecretDataCache, None]:
+    global _SECRET_DATA_CACHE
+
+    if _SECRET_DATA_CACHE is None:
+        cache_conf = config.get_global("SECRET_DATA_CACHE", {})
+        if not cache_conf.get("enabled", False):
+            return None
+
+        with _CACHE_LOCK:
+            if _SECRET_DATA_CACHE is None:
+                _LOGGER.debug(f"[get_secret_data_cache] create cache: {cache_conf}")
+                _SECRET_DATA_CACHE = SecretDataCache(
+                    max_size=cache_conf.get("max_size", 10000),
+                    ttl=cache_conf.get("ttl", 60),
+                )
+
+    return _SECRET_DATA_CACHE
+
+
+def _observe_stats(key):
+    def _observe(options):
+        if _SECRET_DATA_CACHE is not None:
+            yield Observation(_SECRET_DATA_CACHE.get_stats()[key])
+
+    return _observe
+
+
+_METER = metrics.get_meter(__name__)
+_METER.create_observable_counter(
+    "secret.data_cache.hits",
+    callbacks=[_observe_stats("hits")],
+    description="Reads of secret data served by the cache",
+)
+_METER.create_observable_counter(
+    "secret.data_cache.misses",
+    callbacks=[_observe_stats("misses")],
+    description="Reads of secret data missed in the cache",
+)
+_METER.create_observable_gauge(
+    "secret.data_cache.size",
+    callbacks=[_observe_stats("size")],
+    description="Secrets in the cache",
+)
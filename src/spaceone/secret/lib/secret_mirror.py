@@ -0,0 +1,250 @@
+import copy
+import logging
+import threading
+import time
+
+__all__ = ["SecretMirror", "create_mirrors", "find_mirror", "read_mirrors"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys of Secret, TrustedSecret and UserSecret in the backend
+_DEFAULT_KEY_PREFIXES = ["secret-", "trusted-secret-", "user-secret-"]
+
+
+class SecretMirror(object):
+    """In-memory replica of secret data under a key prefix of the backend
+
+    The backend connector loads all keys of the prefix with one range read and
+    follows changes with a watch (watch function). Data is served only while the mirror
+    has been confirmed to be current within max_staleness seconds,
+    otherwise get misses and the connector reads the backend directly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key_prefix: str,
+        max_staleness: float = 10,
+        retry_interval: float = 1,
+        max_retry_interval: float = 30,
+    ):
+        self.name = name
+        self.key_prefix = key_prefix
+        self.max_staleness = max_staleness
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.stopped = threading.Event()
+
+        self._entries = {}
+        self._deleted_keys = set()
+        self._revision = 0
+        self._synced_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def revision(self) -> int:
+        """The latest revision applied to the mirror"""
+        return self._revision
+
+    @property
+    def size(self) -> int:
+        """Count of keys in the backend, deleted keys are not counted"""
+        return len(self._entries) - len(self._deleted_keys)
+
+    def start(self, watch) -> None:
+        """Run watch(mirror) in a thread until the mirror is stopped
+
+        watch loads the mirror and applies changes of the backend,
+        and raises if the watch is broken. It is called again after retry_interval.
+        """
+
+        self._thread = threading.Thread(
+            target=self._run, args=(watch,), name=f"mirror-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.mark_unsynced()
+
+    def is_synced(self) -> bool:
+        synced_at = self._synced_at
+        return (
+            synced_at is not None
+            and time.monotonic() - synced_at <= self.max_staleness
+        )
+
+    def get(self, key: str):
+        """
+        Returns:
+            found (bool): False if the mirror is not synced or doesn't have the key
+            data (dict)
+        """
+
+        with self._lock:
+            entry = self._entries.get(key) if self.is_synced() else None
+            if entry is None or entry[1] is None:
+                self._misses += 1
+                return False, None
+
+            self._hits += 1
+
+        return True, copy.deepcopy(entry[1])
+
+    def load(self, entries: dict, revision: int, synced_at: float) -> None:
+        """Replace all entries with the result of a range read
+
+        Args:
+            entries (dict): {key: (revision, data)}, data is None if it can't be parsed
+            revision (int): revision of the backend at the range read
+            synced_at (float): time.monotonic() when the range read was sent
+        """
+
+        with self._lock:
+            self._entries = dict(entries)
+            self._deleted_keys = set()
+            self._revision = revision
+            self._synced_at = synced_at
+
+    def put(self, key: str, data, revision: int) -> None:
+        """Apply a change, unless the mirror has a newer revision or a deletion of the key"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if key in self._deleted_keys:
+                is_newer = entry[0] < revision
+            else:
+                is_newer = entry is None or entry[0] <= revision
+
+            if is_newer:
+                self._entries[key] = (revision, data)
+                self._deleted_keys.discard(key)
+
+            self._revision = max(self._revision, revision)
+
+    def delete(self, key: str, revision: int = None) -> None:
+        """Replace the entry with a tombstone, so that older changes of the key are not applied
+
+        Tombstones are kept until the next load. If revision is unknown (e.g. a delete of
+        this process), the latest revision applied to the mirror is used.
+        """
+
+        with self._lock:
+            if revision is None:
+                revision = self._revision
+
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= revision:
+                self._entries[key] = (revision, None)
+                self._deleted_keys.add(key)
+
+            self._revision = max(self._revision, revision)
+
+    def mark_synced(self, synced_at: float) -> None:
+        """The mirror had all changes of the backend at synced_at"""
+
+        with self._lock:
+            if self._synced_at is None or self._synced_at < synced_at:
+                self._synced_at = synced_at
+
+    def mark_unsynced(self) -> None:
+        with self._lock:
+            self._synced_at = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            synced_at = self._synced_at
+
+            return {
+                "key_prefix": self.key_prefix,
+                "synced": self.is_synced(),
+                "staleness": None
+                if synced_at is None
+                else time.monotonic() - synced_at,
+                "size": len(self._entries) - len(self._deleted_keys),
+                "revision": self._revision,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _run(self, watch) -> None:
+        retry_interval = self.retry_interval
+
+        while not self.stopped.is_set():
+            try:
+                watch(self)
+                retry_interval = self.retry_interval
+            except Exception as e:
+                _LOGGER.error(
+                    f"[SecretMirror] watch of {self.name} ({self.key_prefix}) is broken, "
+                    f"retry after {retry_interval}s: {e}"
+                )
+
+            # Reads go to the backend until the mirror is loaded again
+            self.mark_unsynced()
+            self.stopped.wait(retry_interval)
+            retry_interval = min(retry_interval * 2, self.max_retry_interval)
+
+
+def create_mirrors(name: str, mirror_conf: dict, watch) -> list:
+    """Create and start mirrors of the key prefixes in mirror_conf
+
+    Args:
+        mirror_conf (dict): {
+            'enabled': 'bool',
+            'key_prefixes': 'list',
+            'max_staleness': 'float',
+            'retry_interval': 'float',
+            'max_retry_interval': 'float'
+        }
+    """
+
+    mirror_conf = mirror_conf or {}
+    if not mirror_conf.get("enabled", False):
+        return []
+
+    mirrors = []
+    for key_prefix in mirror_conf.get("key_prefixes", _DEFAULT_KEY_PREFIXES):
+        mirror = SecretMirror(
+            name,
+            key_prefix,
+            max_staleness=mirror_conf.get("max_staleness", 10),
+            retry_interval=mirror_conf.get("retry_interval", 1),
+            max_retry_interval=mirror_conf.get("max_retry_interval", 30),
+        )
+        mirror.start(watch)
+        mirrors.append(mirror)
+
+    return mirrors
+
+
+def find_mirror(mirrors: list, key: str):
+    for mirror in mirrors:
+        if key.startswith(mirror.key_prefix):
+            return mirror
+
+    return None
+
+
+def read_mirrors(mirrors: list, keys: list):
+    """
+    Returns:
+        results (dict): {key: data} found in synced mirrors
+        missing_keys (list): keys to be read from the backend
+    """
+
+    results = {}
+    missing_keys = []
+
+    for key in keys:
+        mirror = find_mirror(mirrors, key)
+        found, data = mirror.get(key) if mirror else (False, None)
+        if found:
+            results[key] = data
+        else:
+            missing_keys.append(key)
+
+    return results, missing_keys
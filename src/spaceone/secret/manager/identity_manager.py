@@ -1,14 +1,18 @@
+import hashlib
+
 from spaceone.core import config
 from spaceone.core.auth.jwt import JWTUtil
 from spaceone.core.manager import BaseManager
 from spaceone.core.connector.space_connector import SpaceConnector
 
+from spaceone.secret.lib.coalescing_cache import get_identity_cache
+
 
 class IdentityManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        token = self.transaction.get_meta("token")
-        self.token_type = JWTUtil.get_value_from_token(token, "typ")
+        self.token = self.transaction.get_meta("token")
+        self.token_type = JWTUtil.get_value_from_token(self.token, "typ")
 
         self.identity_conn: SpaceConnector = self.locator.get_connector(
             "SpaceConnector", service="identity"
@@ -16,39 +20,118 @@ class IdentityManager(BaseManager):
 
     def check_workspace(self, workspace_id, domain_id):
         system_token = config.get_global("TOKEN")
-        return self.identity_conn.dispatch(
-            "Workspace.check",
-            {"workspace_id": workspace_id, "domain_id": domain_id},
-            token=system_token,
+        return self._get_with_cache(
+            f"system:workspace:{domain_id}:{workspace_id}",
+            lambda: self.identity_conn.dispatch(
+                "Workspace.check",
+                {"workspace_id": workspace_id, "domain_id": domain_id},
+                token=system_token,
+            ),
         )
 
-    def get_trusted_account(self, trusted_account_id):
-        return self.identity_conn.dispatch(
-            "TrustedAccount.get",
-            {"trusted_account_id": trusted_account_id},
+    def get_trusted_account(self, trusted_account_id, domain_id=None):
+        token = self.token
+        return self._get_with_cache(
+            f"{self._get_token_scope()}:trusted_account:{domain_id}:{trusted_account_id}",
+            lambda: self.identity_conn.dispatch(
+                "TrustedAccount.get",
+                {"trusted_account_id": trusted_account_id},
+                token=token,
+            ),
         )
 
     def list_trusted_accounts(self, query):
         return self.identity_conn.dispatch("TrustedAccount.list", {"query": query})
 
     def get_service_account(self, service_account_id: str, domain_id: str):
+        token = self.token
         if self.token_type == "SYSTEM_TOKEN":
-            return self.identity_conn.dispatch(
+            loader = lambda: self.identity_conn.dispatch(
                 "ServiceAccount.get",
                 {"service_account_id": service_account_id},
+                token=token,
                 x_domain_id=domain_id,
             )
         else:
-            return self.identity_conn.dispatch(
+            loader = lambda: self.identity_conn.dispatch(
                 "ServiceAccount.get",
                 {"service_account_id": service_account_id},
+                token=token,
             )
 
+        return self._get_with_cache(
+            f"{self._get_token_scope()}:service_account:{domain_id}:{service_account_id}",
+            loader,
+        )
+
     def list_service_accounts(self, query):
         return self.identity_conn.dispatch("ServiceAccount.list", {"query": query})
 
-    def get_project(self, project_id):
-        return self.identity_conn.dispatch("Project.get", {"project_id": project_id})
+    def get_project(self, project_id, domain_id=None):
+        token = self.token
+        return self._get_with_cache(
+            f"{self._get_token_scope()}:project:{domain_id}:{project_id}",
+            lambda: self.identity_conn.dispatch(
+                "Project.get", {"project_id": project_id}, token=token
+            ),
+        )
 
     def list_projects(self, query):
         return self.identity_conn.dispatch("Project.list", {"query": query})
+
+    def list_service_accounts_by_ids(self, service_account_ids, domain_id):
+        return self._list_by_ids(
+            "ServiceAccount.list", "service_account_id", service_account_ids, domain_id
+        )
+
+    def list_projects_by_ids(self, project_ids, domain_id):
+        return self._list_by_ids("Project.list", "project_id", project_ids, domain_id)
+
+    def list_trusted_accounts_by_ids(self, trusted_account_ids, domain_id):
+        return self._list_by_ids(
+            "TrustedAccount.list", "trusted_account_id", trusted_account_ids, domain_id
+        )
+
+    def _list_by_ids(self, method, id_key, resource_ids, domain_id) -> dict:
+        """
+        Returns:
+            resource_infos (dict): {resource_id: resource_info}, resources which are not found are omitted
+        """
+
+        if len(resource_ids) == 0:
+            return {}
+
+        query = {
+            "filter": [
+                {"k": id_key, "v": list(resource_ids), "o": "in"},
+                {"k": "domain_id", "v": domain_id, "o": "eq"},
+            ]
+        }
+
+        if self.token_type == "SYSTEM_TOKEN":
+            response = self.identity_conn.dispatch(
+                method, {"query": query}, x_domain_id=domain_id
+            )
+        else:
+            response = self.identity_conn.dispatch(method, {"query": query})
+
+        return {
+            resource_info[id_key]: resource_info
+            for resource_info in response.get("results", [])
+        }
+
+    def _get_token_scope(self) -> str:
+        # Results of user tokens are authorized per user, so they are not shared
+        if self.token_type == "SYSTEM_TOKEN" or self.token is None:
+            return "system"
+
+        return hashlib.sha256(self.token.encode()).hexdigest()
+
+    @staticmethod
+    def _get_with_cache(key, loader):
+        identity_cache = get_identity_cache()
+
+        if identity_cache is None:
+            return loader()
+
+        return identity_cache.get_or_load(key, loader)
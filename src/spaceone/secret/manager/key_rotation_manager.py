@@ -0,0 +1,255 @@
+import logging
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta
+
+from mongoengine import Q
+from spaceone.core.error import *
+from spaceone.core.manager import BaseManager
+
+from spaceone.secret.handler.encrypt_mutation_handler import (
+    EncryptMutationHandler,
+    get_encrypt_mutation_handler,
+)
+from spaceone.secret.lib.backend_executor import get_backend_executor
+from spaceone.secret.manager.secret_connector_manager import SecretConnectorManager
+from spaceone.secret.manager.secret_manager import SecretManager
+from spaceone.secret.model.key_rotation_checkpoint_model import KeyRotationCheckpoint
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHECKPOINT_NAME = "secret"
+
+
+class KeyRotationManager(BaseManager):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.secret_mgr: SecretManager = self.locator.get_manager("SecretManager")
+        self.secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager"
+        )
+        self.checkpoint_model: KeyRotationCheckpoint = self.locator.get_model(
+            "KeyRotationCheckpoint"
+        )
+
+    def rotate_secret_keys(self, params):
+        """Re-encrypt encrypted secrets with the current key of EncryptMutationHandler
+
+        Args:
+            params (dict): {
+                'batch_size': 'int',        # default: 100
+                'max_batches': 'int',       # default: unlimited
+                'lease': 'int'              # seconds, default: 600
+            }
+
+        Returns:
+            checkpoint_vo or None if rotation is running in other worker
+        """
+
+        batch_size = params.get("batch_size", 100)
+        max_batches = params.get("max_batches")
+        lease = params.get("lease", 600)
+
+        encrypt_handler = self._get_encrypt_handler()
+        key_id = encrypt_handler.get_current_key_id()
+
+        checkpoint_vo = self._acquire_checkpoint(key_id, lease)
+        if checkpoint_vo is None:
+            _LOGGER.debug("[rotate_secret_keys] rotation is running in other worker")
+            return None
+
+        if checkpoint_vo.state == "COMPLETED":
+            _LOGGER.debug(f"[rotate_secret_keys] rotation is already completed: {key_id}")
+            return checkpoint_vo.update({"locked_until": None})
+
+        batch_count = 0
+        try:
+            while max_batches is None or batch_count < max_batches:
+                secret_vos = self.secret_mgr.list_secrets_by_cursor(
+                    checkpoint_vo.last_secret_id, batch_size, encrypted=True
+                )
+
+                rotated_count, failed_count = self._rotate_secrets(
+                    encrypt_handler, secret_vos
+                )
+                batch_count += 1
+
+                checkpoint_data = {
+                    "rotated_count": checkpoint_vo.rotated_count + rotated_count,
+                    "failed_count": checkpoint_vo.failed_count + failed_count,
+                    "locked_until": datetime.utcnow() + timedelta(seconds=lease),
+                }
+
+                if len(secret_vos) > 0:
+                    checkpoint_data["last_secret_id"] = secret_vos[-1].secret_id
+
+                if len(secret_vos) < batch_size:
+                    checkpoint_data["state"] = "COMPLETED"
+
+                checkpoint_vo = checkpoint_vo.update(checkpoint_data)
+
+                _LOGGER.debug(
+                    f"[rotate_secret_keys] {key_id} batch #{batch_count}: "
+                    f"rotated = {rotated_count}, failed = {failed_count}, "
+                    f"last_secret_id = {checkpoint_vo.last_secret_id}"
+                )
+
+                if checkpoint_vo.state == "COMPLETED":
+                    _LOGGER.info(
+                        f"[rotate_secret_keys] rotation completed ({key_id}): "
+                        f"rotated = {checkpoint_vo.rotated_count}, "
+                        f"failed = {checkpoint_vo.failed_count}"
+                    )
+                    break
+        finally:
+            checkpoint_vo = checkpoint_vo.update({"locked_until": None})
+
+        return checkpoint_vo
+
+    def _rotate_secrets(self, encrypt_handler, secret_vos):
+        target_secret_vos = [
+            secret_vo
+            for secret_vo in secret_vos
+            if not encrypt_handler.is_rotated(secret_vo.encrypt_options)
+        ]
+
+        if len(target_secret_vos) == 0:
+            return 0, 0
+
+        secrets_data = self.secret_conn_mgr.get_secrets(
+            [secret_vo.secret_id for secret_vo in target_secret_vos],
+            {secret_vo.secret_id: secret_vo.backend for secret_vo in target_secret_vos},
+        )
+
+        rotated_count = 0
+        failed_count = 0
+        executor = get_backend_executor()
+        futures = {
+            executor.submit(
+                self._rotate_secret,
+                encrypt_handler,
+                self.secret_conn_mgr.for_backend(secret_vo.backend),
+                secret_vo,
+                secrets_data.get(secret_vo.secret_id),
+            ): secret_vo.secret_id
+            for secret_vo in target_secret_vos
+        }
+
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    rotated_count += 1
+            except Exception as e:
+                _LOGGER.error(
+                    f"[_rotate_secrets] failed to rotate secret: {futures[future]}, {e}"
+                )
+                failed_count += 1
+
+        return rotated_count, failed_count
+
+    def _rotate_secret(self, encrypt_handler, secret_conn_mgr, secret_vo, secret_data):
+        """Re-encrypt data of secret, unless it is updated by others during rotation
+
+        Metadata is only updated if data_version is not changed since secret_vo was read,
+        and data is written with check-and-set on its revision if the backend supports it.
+        In backends without revision, an update of data between the read and the write
+        can still be overwritten.
+
+        Returns:
+            rotated (bool): False if the secret is skipped
+        """
+
+        secret_id = secret_vo.secret_id
+        data_version = secret_vo.data_version
+        data_revision = secret_vo.data_revision
+
+        if data_revision is None and secret_conn_mgr.supports_revision():
+            # Data is read again with its revision, so that the write can be checked
+            secret_data, data_revision = secret_conn_mgr.get_secret_with_revision(
+                secret_id
+            )
+
+        if not secret_data or "encrypted_data" not in secret_data:
+            raise ERROR_NOT_FOUND(key="secret_data", value=secret_id)
+
+        (
+            rotated_data,
+            encrypt_options,
+            transition_encrypt_options,
+        ) = encrypt_handler.rotate(
+            secret_data, secret_vo.encrypt_options, secret_vo.domain_id
+        )
+
+        # Readers can decrypt both previous and rotated data during transition
+        if not self.secret_mgr.update_secret_if_data_version(
+            secret_id, data_version, {"encrypt_options": transition_encrypt_options}
+        ):
+            _LOGGER.debug(f"[_rotate_secret] secret is updated, skip: {secret_id}")
+            return False
+
+        data_revision = secret_conn_mgr.update_secret(
+            secret_id, rotated_data, data_revision
+        )
+
+        if not self.secret_mgr.update_secret_if_data_version(
+            secret_id,
+            data_version,
+            {"encrypt_options": encrypt_options, "data_revision": data_revision},
+            increase_data_version=True,
+        ):
+            _LOGGER.warning(
+                f"[_rotate_secret] secret is updated during rotation: {secret_id}"
+            )
+            return False
+
+        return True
+
+    def _acquire_checkpoint(self, key_id, lease):
+        now = datetime.utcnow()
+        checkpoint_vos = self.checkpoint_model.filter(name=_CHECKPOINT_NAME)
+
+        if checkpoint_vos.count() == 0:
+            try:
+                self.checkpoint_model.create({"name": _CHECKPOINT_NAME, "key_id": key_id})
+            except ERROR_SAVE_UNIQUE_VALUES:
+                pass
+
+        # Only one worker holds the lease of checkpoint,
+        # modify returns None if the lease is held by other worker
+        checkpoint_vo = (
+            self.checkpoint_model.filter(name=_CHECKPOINT_NAME)
+            .filter(Q(locked_until=None) | Q(locked_until__lt=now))
+            .modify(new=True, set__locked_until=now + timedelta(seconds=lease))
+        )
+
+        if checkpoint_vo is None:
+            return None
+
+        if checkpoint_vo.key_id != key_id:
+            _LOGGER.info(
+                f"[_acquire_checkpoint] start rotation: {checkpoint_vo.key_id} => {key_id}"
+            )
+            checkpoint_vo = self._reset_checkpoint(checkpoint_vo, key_id)
+        elif checkpoint_vo.state == "COMPLETED" and checkpoint_vo.failed_count > 0:
+            _LOGGER.info(f"[_acquire_checkpoint] retry failed secrets: {key_id}")
+            checkpoint_vo = self._reset_checkpoint(checkpoint_vo, key_id)
+
+        return checkpoint_vo
+
+    @staticmethod
+    def _reset_checkpoint(checkpoint_vo, key_id):
+        return checkpoint_vo.update(
+            {
+                "key_id": key_id,
+                "state": "IN_PROGRESS",
+                "last_secret_id": None,
+                "rotated_count": 0,
+                "failed_count": 0,
+            }
+        )
+
+    @staticmethod
+    def _get_encrypt_handler() -> EncryptMutationHandler:
+        if encrypt_handler := get_encrypt_mutation_handler():
+            return encrypt_handler
+
+        raise ERROR_CONFIGURATION(key="HANDLERS.mutation.EncryptMutationHandler")
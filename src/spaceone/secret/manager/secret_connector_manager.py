@@ -1,37 +1,500 @@
 import logging
 
 from spaceone.core import config
+from spaceone.core.error import ERROR_BASE
 from spaceone.core.manager import BaseManager
 from spaceone.secret.error import *
+from spaceone.secret.lib.backend_executor import get_backend_executor
+from spaceone.secret.lib.circuit_breaker import get_circuit_breaker
+from spaceone.secret.lib.connector_pool import get_connector
+from spaceone.secret.lib.deadline import call_with_retry, deadline_scope, get_deadline
+from spaceone.secret.lib.hedged_read import get_hedged_read
+from spaceone.secret.lib.secret_data_cache import get_secret_data_cache
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class SecretConnectorManager(BaseManager):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, backend=None, **kwargs):
+        """
+        Args:
+            backend (str): backend of the resource, BACKEND if None
+        """
+
         super().__init__(*args, **kwargs)
-        connector = config.get_global("CONNECTORS")
-        backend = config.get_global("BACKEND", "AWSSecretManagerConnector")
+        backend = backend or config.get_global("BACKEND", "AWSSecretManagerConnector")
+        self.backend = backend
         try:
             _LOGGER.debug(f"[SecretConnectorManager] Create {backend}")
-            self.secret_conn = self.locator.get_connector(backend)
+            self.secret_conn = get_connector(backend)
         except Exception as e:
             _LOGGER.error(f"[SecretConnectorManager] not defined backend {backend}")
             raise ERROR_DEFINE_SECRET_BACKEND(backend=backend)
 
+        self.data_cache = get_secret_data_cache()
+        self.circuit_breaker = get_circuit_breaker(backend)
+        self.hedged_read = get_hedged_read(backend)
+        self._secondary_conn_mgr = None
+
+        # Deadline of the gRPC request, which is applied to calls in executor threads as well
+        self.deadline = get_deadline()
+
     def create_secret(self, secret_id, data):
+        """
+        Returns:
+            revision (str): revision of secret data, None if the backend has no revision
+        """
+
         def _rollback(secret_id):
             _LOGGER.info(f"[ROLLBACK] Delete secret data in secret store : {secret_id}")
-            self.secret_conn.delete_secret(secret_id)
+            self._call(self.secret_conn.delete_secret, secret_id, retry=True)
+            self._invalidate_cache(secret_id)
 
-        response = self.secret_conn.create_secret(secret_id, data)
+        response = self._call(self.secret_conn.create_secret, secret_id, data)
+        self._invalidate_cache(secret_id)
         self.transaction.add_rollback(_rollback, secret_id)
 
-    def update_secret(self, secret_id, data):
-        self.secret_conn.update_secret(secret_id, data)
+        return response if self.supports_revision() else None
+
+    def create_secrets(self, secrets_data):
+        """Create secret data of multiple secrets
+
+        Args:
+            secrets_data (dict): {secret_id: data}
+
+        Returns:
+            errors (dict): {secret_id: error} of secrets which are not created
+            revisions (dict): {secret_id: revision} of created secrets, empty if the backend has no revision
+        """
+
+        def _rollback(secret_ids):
+            _LOGGER.info(f"[ROLLBACK] Delete secret data in secret store : {secret_ids}")
+            self.delete_secrets(secret_ids)
+
+        if len(secrets_data) == 0:
+            return {}, {}
+
+        errors, revisions = self._write_many(
+            "create_secrets", self.secret_conn.create_secret, secrets_data
+        )
+
+        created_secret_ids = [
+            secret_id for secret_id in secrets_data if secret_id not in errors
+        ]
+        for secret_id in secrets_data:
+            self._invalidate_cache(secret_id)
+
+        if created_secret_ids:
+            self.transaction.add_rollback(_rollback, created_secret_ids)
+
+        return errors, revisions
+
+    def delete_secrets(self, secret_ids):
+        errors, _ = self._run_in_parallel(
+            lambda secret_id, data: self.secret_conn.delete_secret(secret_id),
+            dict.fromkeys(secret_ids),
+        )
+
+        for secret_id in secret_ids:
+            self._invalidate_cache(secret_id)
+
+        return errors
+
+    def update_secret(self, secret_id, data, expected_revision=None):
+        """Update secret data, only if its revision is expected_revision
+
+        If expected_revision is unknown (None), the current revision is read before the update,
+        so that a concurrent update in between is still detected.
+
+        Returns:
+            revision (str): revision of updated secret data, None if the backend has no revision
+        """
+
+        try:
+            if self.supports_revision():
+                if expected_revision is None:
+                    expected_revision = self.get_secret_revision(secret_id)
+
+                return self._call(
+                    self.secret_conn.update_secret,
+                    secret_id,
+                    data,
+                    expected_revision=expected_revision,
+                )
+
+            self._call(self.secret_conn.update_secret, secret_id, data)
+            return None
+        finally:
+            self._invalidate_cache(secret_id)
+
+    def update_secrets(self, secrets_data, backends=None, expected_revisions=None):
+        """Update secret data of multiple secrets, only if their revisions are expected_revisions
+
+        Unknown expected revisions (None) are read before the update, as in update_secret.
+
+        Args:
+            secrets_data (dict): {secret_id: data}
+            backends (dict): {secret_id: backend} of secrets stored in other backends
+            expected_revisions (dict): {secret_id: revision} of data which is read with metadata
+
+        Returns:
+            errors (dict): {secret_id: error} of secrets which are not updated
+            revisions (dict): {secret_id: revision} of updated secrets, empty if the backend has no revision
+        """
+
+        if len(secrets_data) == 0:
+            return {}, {}
+
+        expected_revisions = expected_revisions or {}
+
+        if backends:
+            errors = {}
+            revisions = {}
+            groups = self._group_by_backend(secrets_data, backends)
+            for secret_conn_mgr, secret_ids in groups:
+                group_errors, group_revisions = secret_conn_mgr.update_secrets(
+                    {secret_id: secrets_data[secret_id] for secret_id in secret_ids},
+                    expected_revisions={
+                        secret_id: expected_revisions.get(secret_id)
+                        for secret_id in secret_ids
+                    },
+                )
+                errors.update(group_errors)
+                revisions.update(group_revisions)
+
+            return errors, revisions
+
+        if self.supports_revision():
+            read_errors, expected_revisions = self._get_expected_revisions(
+                secrets_data, expected_revisions
+            )
+            errors, revisions = self._write_many(
+                "update_secrets",
+                self.secret_conn.update_secret,
+                {
+                    secret_id: data
+                    for secret_id, data in secrets_data.items()
+                    if secret_id not in read_errors
+                },
+                expected_revisions,
+            )
+            errors.update(read_errors)
+        else:
+            errors, revisions = self._write_many(
+                "update_secrets", self.secret_conn.update_secret, secrets_data
+            )
+
+        for secret_id in secrets_data:
+            self._invalidate_cache(secret_id)
+
+        return errors, revisions
 
     def delete_secret(self, secret_id):
-        self.secret_conn.delete_secret(secret_id)
+        self._call(self.secret_conn.delete_secret, secret_id, retry=True)
+        self._invalidate_cache(secret_id)
 
     def get_secret(self, secret_id):
-        return self.secret_conn.get_secret(secret_id)
+        if self.data_cache is None:
+            return self._read("get_secret", secret_id)
+
+        data = self.data_cache.get(secret_id)
+        if data is not None:
+            return data
+
+        cache_version = self.data_cache.version
+        data = self._read("get_secret", secret_id)
+
+        if data is not None:
+            self.data_cache.set(secret_id, data, version=cache_version)
+
+        return data
+
+    def get_secret_revision(self, secret_id):
+        """Get current revision of secret data from the backend
+
+        Returns:
+            revision (str): None if the backend has no revision or the secret is not found
+        """
+
+        if not self.supports_revision() or not hasattr(
+            self.secret_conn, "get_secret_revision"
+        ):
+            return None
+
+        return self._call(self.secret_conn.get_secret_revision, secret_id, retry=True)
+
+    def get_secret_with_revision(self, secret_id):
+        """Get secret data with the revision read before it, for check-and-set updates
+
+        Data is read from the backend without the cache and hedged reads,
+        so that it is not older than the revision.
+
+        Returns:
+            data (dict), revision (str)
+        """
+
+        revision = self.get_secret_revision(secret_id)
+        data = self._call(self.secret_conn.get_secret, secret_id, retry=True)
+        return data, revision
+
+    def get_secrets(self, secret_ids, backends=None):
+        """Get secret data of multiple secrets
+
+        Args:
+            secret_ids (list)
+            backends (dict): {secret_id: backend} of secrets stored in other backends
+
+        Returns:
+            secrets_data (dict): {secret_id: data}, secrets not found in backend are omitted
+        """
+
+        secret_ids = list(dict.fromkeys(secret_ids))
+        secrets_data = {}
+
+        if backends:
+            groups = self._group_by_backend(secret_ids, backends)
+            for secret_conn_mgr, group_secret_ids in groups:
+                secrets_data.update(secret_conn_mgr.get_secrets(group_secret_ids))
+
+            return secrets_data
+
+        if self.data_cache is None:
+            return self._get_secrets_from_backend(secret_ids)
+
+        missing_secret_ids = []
+        for secret_id in secret_ids:
+            data = self.data_cache.get(secret_id)
+            if data is None:
+                missing_secret_ids.append(secret_id)
+            else:
+                secrets_data[secret_id] = data
+
+        cache_version = self.data_cache.version
+        for secret_id, data in self._get_secrets_from_backend(missing_secret_ids).items():
+            if data is not None:
+                self.data_cache.set(secret_id, data, version=cache_version)
+
+            secrets_data[secret_id] = data
+
+        return secrets_data
+
+    def for_backend(self, backend):
+        """SecretConnectorManager of the backend of a resource, BACKEND if None"""
+
+        if not backend or backend == self.backend:
+            return self
+
+        secret_conn_mgr = self.locator.get_manager(
+            "SecretConnectorManager", backend=backend
+        )
+        secret_conn_mgr.deadline = self.deadline
+        return secret_conn_mgr
+
+    def supports_revision(self):
+        """Whether the backend returns revisions of secret data and updates them with check-and-set"""
+        return getattr(self.secret_conn, "supports_revision", False)
+
+    def is_co_located(self):
+        """Whether secret data is stored in the same MongoDB database as the Secret model"""
+        return getattr(self.secret_conn, "co_located", False)
+
+    def get_data_collection_name(self):
+        return self.secret_conn.secret_data.name
+
+    def _invalidate_cache(self, secret_id):
+        if self.data_cache:
+            self.data_cache.delete(secret_id)
+
+    def _group_by_backend(self, secret_ids, backends):
+        groups = {}
+        for secret_id in secret_ids:
+            backend = backends.get(secret_id) or self.backend
+            groups.setdefault(backend, []).append(secret_id)
+
+        return [
+            (self.for_backend(backend), group_secret_ids)
+            for backend, group_secret_ids in groups.items()
+        ]
+
+    def _get_secrets_from_backend(self, secret_ids):
+        if len(secret_ids) == 0:
+            return {}
+
+        if hasattr(self.secret_conn, "get_secrets"):
+            return self._read("get_secrets", secret_ids)
+
+        # Backend has no batch read, so fall back to a bounded parallel loop
+        executor = get_backend_executor()
+        futures = {
+            secret_id: executor.submit(self._read, "get_secret", secret_id)
+            for secret_id in secret_ids
+        }
+
+        secrets_data = {}
+        for secret_id, future in futures.items():
+            try:
+                secrets_data[secret_id] = future.result()
+            except Exception as e:
+                _LOGGER.error(f"[_get_secrets_from_backend] {secret_id}: {e}")
+
+        return secrets_data
+
+    def _call(self, func, *args, retry=False, **kwargs):
+        """Call the backend within the deadline of the request
+
+        Idempotent calls (retry=True) are retried on errors which the connector reports
+        as retryable (is_retryable), and other calls only on throttling (is_throttled),
+        since a throttled request is rejected before it is applied.
+        """
+
+        with deadline_scope(self.deadline):
+            return call_with_retry(
+                lambda: self._call_once(func, *args, **kwargs),
+                self.backend,
+                self._is_retryable if retry else self._is_throttled,
+            )
+
+    def _is_retryable(self, error):
+        if isinstance(error, ERROR_BASE):
+            return False
+
+        is_retryable = getattr(self.secret_conn, "is_retryable", None)
+        return is_retryable is not None and is_retryable(error)
+
+    def _is_throttled(self, error):
+        if isinstance(error, ERROR_BASE):
+            return False
+
+        is_throttled = getattr(self.secret_conn, "is_throttled", None)
+        return is_throttled is not None and is_throttled(error)
+
+    def _call_once(self, func, *args, **kwargs):
+        """Call the backend through its circuit breaker
+
+        Errors of the service (ERROR_BASE, e.g. a conflict of check-and-set) are responses
+        of a healthy backend, so only other errors are counted as failures.
+        """
+
+        if self.circuit_breaker is None:
+            return func(*args, **kwargs)
+
+        if not self.circuit_breaker.allow_request():
+            raise ERROR_SECRET_BACKEND_UNAVAILABLE(backend=self.backend)
+
+        try:
+            response = func(*args, **kwargs)
+        except ERROR_BASE:
+            self.circuit_breaker.record_success()
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+
+        self.circuit_breaker.record_success()
+        return response
+
+    def _read(self, method, *args):
+        if self.hedged_read is None:
+            return self._call(getattr(self.secret_conn, method), *args, retry=True)
+
+        # Reads are idempotent, so they can be sent to the secondary backend as well
+        if self._secondary_conn_mgr is None:
+            self._secondary_conn_mgr = self.for_backend(
+                self.hedged_read.secondary_backend
+            )
+
+        secondary_conn_mgr = self._secondary_conn_mgr
+
+        def _primary():
+            return self._call(getattr(self.secret_conn, method), *args, retry=True)
+
+        def _secondary():
+            return secondary_conn_mgr._call(
+                getattr(secondary_conn_mgr.secret_conn, method), *args, retry=True
+            )
+
+        def _is_complete(result):
+            # Backends return empty data ({} or False) or omit secrets which are not found
+            if method == "get_secrets":
+                return all(result.get(secret_id) for secret_id in args[0])
+
+            return bool(result)
+
+        return self.hedged_read.read(_primary, _secondary, is_complete=_is_complete)
+
+    def _write_many(self, batch_method, method, secrets_data, expected_revisions=None):
+        """Batch write of the backend, batch methods of a backend with revision
+        return (errors, revisions) and check expected_revisions of update_secrets"""
+
+        if len(secrets_data) == 0:
+            return {}, {}
+
+        if expected_revisions is not None:
+            expected_revisions = {
+                secret_id: expected_revisions.get(secret_id)
+                for secret_id in secrets_data
+            }
+
+        if hasattr(self.secret_conn, batch_method):
+            if expected_revisions is None:
+                response = self._call(
+                    getattr(self.secret_conn, batch_method), secrets_data
+                )
+                return response if self.supports_revision() else (response, {})
+
+            return self._call(
+                getattr(self.secret_conn, batch_method),
+                secrets_data,
+                expected_revisions=expected_revisions,
+            )
+
+        if expected_revisions is not None:
+            return self._run_in_parallel(
+                lambda secret_id, data: method(
+                    secret_id, data, expected_revision=expected_revisions[secret_id]
+                ),
+                secrets_data,
+            )
+
+        errors, responses = self._run_in_parallel(method, secrets_data)
+        revisions = responses if self.supports_revision() else {}
+        return errors, revisions
+
+    def _get_expected_revisions(self, secrets_data, expected_revisions):
+        """Read revisions which are unknown, so that concurrent updates in between are detected
+
+        Returns:
+            errors (dict): {secret_id: error} of secrets whose revision can't be read
+            expected_revisions (dict): {secret_id: revision}
+        """
+
+        unknown_secret_ids = [
+            secret_id
+            for secret_id in secrets_data
+            if expected_revisions.get(secret_id) is None
+        ]
+        errors, revisions = self._run_in_parallel(
+            lambda secret_id, data: self.secret_conn.get_secret_revision(secret_id),
+            dict.fromkeys(unknown_secret_ids),
+        )
+
+        return errors, {**expected_revisions, **revisions}
+
+    def _run_in_parallel(self, func, secrets_data):
+        # Backend has no batch write, so fall back to a bounded parallel loop
+        executor = get_backend_executor()
+        futures = {
+            secret_id: executor.submit(self._call, func, secret_id, data)
+            for secret_id, data in secrets_data.items()
+        }
+
+        errors = {}
+        responses = {}
+        for secret_id, future in futures.items():
+            try:
+                responses[secret_id] = future.result()
+            except Exception as e:
+                _LOGGER.error(f"[_run_in_parallel] {secret_id}: {e}")
+                errors[secret_id] = e
+
+        return errors, responses
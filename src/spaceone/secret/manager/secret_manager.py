@@ -1,10 +1,20 @@
 import logging
 
+from mongoengine import Q
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from spaceone.core.error import *
 from spaceone.core.manager import BaseManager
-from spaceone.secret.model.secret_model import Secret
+from spaceone.secret.lib.bulk_insert import insert_many
+from spaceone.secret.lib.page_token import query_by_page_token, make_page
+from spaceone.secret.model.secret_model import Secret, SecretRecord
+from spaceone.secret.model.trusted_secret_model import TrustedSecret
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fields of Secret which are changed by update_data, with data_version
+_DATA_FIELDS = ["schema_id", "encrypted", "encrypt_options", "data_hash"]
+
 
 class SecretManager(BaseManager):
     def __init__(self, *args, **kwargs):
@@ -24,6 +34,30 @@ class SecretManager(BaseManager):
 
         return secret_vo
 
+    def create_secrets(self, params_list):
+        """Create secrets with one insert_many
+
+        Returns:
+            results (list): secret_vo or error of each params, in the order of params_list
+        """
+
+        def _rollback(secret_ids):
+            _LOGGER.info(f"[ROLLBACK] Delete secrets : {secret_ids}")
+            self.delete_secrets_by_ids(secret_ids)
+
+        results = insert_many(self.secret_model, params_list)
+
+        secret_ids = [
+            result.secret_id for result in results if isinstance(result, Secret)
+        ]
+        if secret_ids:
+            self.transaction.add_rollback(_rollback, secret_ids)
+
+        return results
+
+    def delete_secrets_by_ids(self, secret_ids):
+        self.secret_model.filter(secret_id=secret_ids).delete()
+
     def update_secret_by_vo(self, params, secret_vo):
         def _rollback(old_data):
             _LOGGER.info(
@@ -35,10 +69,120 @@ class SecretManager(BaseManager):
 
         return secret_vo.update(params)
 
+    def get_secret_documents(
+        self, secret_ids, domain_id, workspace_id=None, user_projects=None
+    ):
+        """Get data fields of multiple secrets with one query
+
+        Returns:
+            documents (dict): {secret_id: document}, secrets which are not found are omitted
+        """
+
+        conditions = {
+            "secret_id": list(secret_ids),
+            "domain_id": domain_id,
+        }
+
+        if workspace_id:
+            conditions["workspace_id"] = workspace_id
+
+        if user_projects:
+            conditions["project_id"] = user_projects
+
+        secret_vos = self.secret_model.filter(**conditions).only(
+            "secret_id", "backend", "data_revision", *_DATA_FIELDS
+        )
+
+        return {document["secret_id"]: document for document in secret_vos.as_pymongo()}
+
+    def update_secrets_data(self, secrets_params, revisions, unchanged_secret_ids=()):
+        """Update data fields and increase data_version of secrets with one bulk_write,
+        after their data is written to the backend
+
+        Args:
+            secrets_params (dict): {secret_id: params of update_data} of written or unchanged secrets
+            revisions (dict): {secret_id: revision} of written data, empty if the backend has no revision
+            unchanged_secret_ids (list): secrets whose data is not changed, only schema_id is updated
+        """
+
+        operations = []
+        for secret_id, params in secrets_params.items():
+            if secret_id in unchanged_secret_ids:
+                if "schema_id" in params:
+                    update = {"$set": {"schema_id": params["schema_id"]}}
+                    operations.append(UpdateOne({"secret_id": secret_id}, update))
+
+                continue
+
+            fields = {key: params[key] for key in _DATA_FIELDS if key in params}
+            fields["data_revision"] = revisions.get(secret_id)
+            update = {"$set": fields, "$inc": {"data_version": 1}}
+            operations.append(UpdateOne({"secret_id": secret_id}, update))
+
+        if operations:
+            self._bulk_write(operations)
+
+    def update_secrets_revision(self, revisions):
+        """Set data_revision of secrets whose data is written with a batch write
+
+        Args:
+            revisions (dict): {secret_id: revision}
+        """
+
+        operations = [
+            UpdateOne({"secret_id": secret_id}, {"$set": {"data_revision": revision}})
+            for secret_id, revision in revisions.items()
+            if revision is not None
+        ]
+
+        if operations:
+            self._bulk_write(operations)
+
     @staticmethod
     def delete_secret_by_vo(secret_vo):
         secret_vo.delete()
 
+    def update_secret_data_by_vo(self, params, secret_vo):
+        """Update data fields and increase data_version of secret with one update,
+        after its data is written to the backend"""
+
+        update = {
+            f"set__{key}": params[key]
+            for key in _DATA_FIELDS + ["data_revision"]
+            if key in params
+        }
+        update["inc__data_version"] = 1
+
+        return self.secret_model.filter(secret_id=secret_vo.secret_id).modify(
+            new=True, **update
+        )
+
+    def update_secret_if_data_version(
+        self, secret_id, data_version, params, increase_data_version=False
+    ):
+        """Update secret only if its data_version is not changed since it was read
+
+        Returns:
+            updated (bool): False if data of secret is updated by others
+        """
+
+        conditions = Q(data_version=data_version)
+        if data_version == 0:
+            # Secrets created before data_version was added don't have the field
+            conditions |= Q(data_version__exists=False)
+
+        update = {f"set__{key}": value for key, value in params.items()}
+        if increase_data_version:
+            update["inc__data_version"] = 1
+
+        # modify returns None if no secret matches the conditions
+        secret_vo = (
+            self.secret_model.filter(secret_id=secret_id)
+            .filter(conditions)
+            .modify(**update)
+        )
+        return secret_vo is not None
+
     def get_secret(self, secret_id, domain_id, workspace_id=None, user_projects=None):
         conditions = {
             "secret_id": secret_id,
@@ -53,11 +197,177 @@ class SecretManager(BaseManager):
 
         return self.secret_model.get(**conditions)
 
+    def get_secret_with_data(
+        self,
+        secret_id,
+        domain_id,
+        data_collection,
+        workspace_id=None,
+        user_projects=None,
+    ):
+        """Get secret, trusted secret and their data with one aggregation
+
+        Secret data must be stored in data_collection of the same database.
+
+        Returns:
+            secret_vo, secret_data, trusted_secret_vo, trusted_secret_data
+        """
+
+        conditions = {
+            "secret_id": secret_id,
+            "domain_id": domain_id,
+        }
+
+        if workspace_id:
+            conditions["workspace_id"] = workspace_id
+
+        if user_projects:
+            conditions["project_id"] = user_projects
+
+        match = {
+            key: {"$in": value} if isinstance(value, list) else value
+            for key, value in conditions.items()
+        }
+
+        pipeline = [
+            {"$match": match},
+            {"$limit": 1},
+            {
+                "$lookup": {
+                    "from": data_collection,
+                    "localField": "secret_id",
+                    "foreignField": "secret_id",
+                    "as": "_secret_data",
+                }
+            },
+            {
+                "$lookup": {
+                    "from": TrustedSecret._get_collection_name(),
+                    "localField": "trusted_secret_id",
+                    "foreignField": "trusted_secret_id",
+                    "as": "_trusted_secret",
+                }
+            },
+            {
+                "$lookup": {
+                    "from": data_collection,
+                    "localField": "trusted_secret_id",
+                    "foreignField": "secret_id",
+                    "as": "_trusted_secret_data",
+                }
+            },
+        ]
+
+        results = list(self.secret_model._get_collection().aggregate(pipeline))
+
+        if len(results) == 0:
+            raise ERROR_NOT_FOUND(
+                key=tuple(conditions.keys()), value=tuple(conditions.values())
+            )
+
+        secret_info = results[0]
+        trusted_secret_infos = secret_info.pop("_trusted_secret")
+        trusted_secret_data_infos = secret_info.pop("_trusted_secret_data")
+        secret_vo, secret_data = self._make_vo_and_data(
+            self.secret_model, secret_info, secret_info.pop("_secret_data"), "secret_id"
+        )
+
+        trusted_secret_vo = None
+        trusted_secret_data = None
+
+        if secret_vo.trusted_secret_id:
+            trusted_secret_infos = [
+                trusted_secret_info
+                for trusted_secret_info in trusted_secret_infos
+                if trusted_secret_info.get("domain_id") == domain_id
+            ]
+
+            if len(trusted_secret_infos) > 0:
+                trusted_secret_vo, trusted_secret_data = self._make_vo_and_data(
+                    TrustedSecret,
+                    trusted_secret_infos[0],
+                    trusted_secret_data_infos,
+                    "trusted_secret_id",
+                )
+
+        return secret_vo, secret_data, trusted_secret_vo, trusted_secret_data
+
+    def list_secrets_by_cursor(self, last_secret_id=None, limit=100, **conditions):
+        """List secrets ordered by secret_id after last_secret_id"""
+
+        secret_vos = self.secret_model.filter(**conditions)
+
+        if last_secret_id:
+            secret_vos = secret_vos.filter(secret_id__gt=last_secret_id)
+
+        return list(secret_vos.order_by("secret_id").limit(limit))
+
     def filter_secrets(self, **conditions):
         return self.secret_model.filter(**conditions)
 
     def list_secrets(self, query):
         return self.secret_model.query(**query)
 
+    def list_secret_records(self, query):
+        """List secrets as SecretRecord from raw documents
+
+        Only the fields of SecretInfo (minimal_fields if minimal) are read,
+        and mongoengine documents are not constructed.
+        """
+
+        secret_vos, total_count = self.secret_model.query(**query)
+
+        if not hasattr(secret_vos, "as_pymongo"):
+            return secret_vos, total_count
+
+        secret_vos = self._project_secret_records(secret_vos, query)
+        return list(map(SecretRecord, secret_vos.as_pymongo())), total_count
+
+    def list_secret_records_by_page_token(
+        self, query, page_token=None, include_count=False
+    ):
+        """List a page of SecretRecord ordered by (name, id) after page_token
+
+        Returns:
+            secret_records, total_count (0 unless include_count), next_token
+        """
+
+        secret_vos, total_count, limit = query_by_page_token(
+            self.secret_model, query, page_token, include_count
+        )
+
+        if isinstance(secret_vos, list):
+            return [], total_count, None
+
+        secret_vos = self._project_secret_records(secret_vos, query)
+        documents, next_token = make_page(
+            list(secret_vos.as_pymongo()),
+            limit,
+            lambda document: (document.get("name"), document["_id"]),
+        )
+
+        return list(map(SecretRecord, documents)), total_count, next_token
+
     def stat_secrets(self, query):
         return self.secret_model.stat(**query)
+
+    def _bulk_write(self, operations):
+        try:
+            self.secret_model._get_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            _LOGGER.error(f"[_bulk_write] {e.details.get('writeErrors')}")
+            raise ERROR_DB_QUERY(reason=e)
+
+    @staticmethod
+    def _project_secret_records(secret_vos, query):
+        if not query.get("minimal", False) and not query.get("only"):
+            secret_vos = secret_vos.only(*SecretRecord.__slots__)
+
+        return secret_vos
+
+    @staticmethod
+    def _make_vo_and_data(model, document, secret_data_infos, id_field):
+        if len(secret_data_infos) == 0:
+            raise ERROR_NOT_FOUND(key=id_field, value=document[id_field])
+
+        return model._from_son(document), secret_data_infos[0].get("data", {})
@@ -1,6 +1,9 @@
 import logging
 
+from pymongo import UpdateOne
 from spaceone.core.manager import BaseManager
+from spaceone.secret.lib.bulk_insert import insert_many
+from spaceone.secret.lib.page_token import query_by_page_token, make_page
 from spaceone.secret.model.trusted_secret_model import TrustedSecret
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +29,55 @@ class TrustedSecretManager(BaseManager):
 
         return trusted_secret_vo
 
+    def create_trusted_secrets(self, params_list):
+        """Create trusted secrets with one insert_many
+
+        Returns:
+            results (list): trusted_secret_vo or error of each params, in the order of params_list
+        """
+
+        def _rollback(trusted_secret_ids):
+            _LOGGER.info(f"[ROLLBACK] Delete trusted secrets : {trusted_secret_ids}")
+            self.delete_trusted_secrets_by_ids(trusted_secret_ids)
+
+        results = insert_many(self.trusted_secret_model, params_list)
+
+        trusted_secret_ids = [
+            result.trusted_secret_id
+            for result in results
+            if isinstance(result, TrustedSecret)
+        ]
+        if trusted_secret_ids:
+            self.transaction.add_rollback(_rollback, trusted_secret_ids)
+
+        return results
+
+    def delete_trusted_secrets_by_ids(self, trusted_secret_ids):
+        self.trusted_secret_model.filter(
+            trusted_secret_id=trusted_secret_ids
+        ).delete()
+
+    def update_trusted_secrets_revision(self, revisions):
+        """Set data_revision of trusted secrets whose data is written with a batch write
+
+        Args:
+            revisions (dict): {trusted_secret_id: revision}
+        """
+
+        operations = [
+            UpdateOne(
+                {"trusted_secret_id": trusted_secret_id},
+                {"$set": {"data_revision": revision}},
+            )
+            for trusted_secret_id, revision in revisions.items()
+            if revision is not None
+        ]
+
+        if operations:
+            self.trusted_secret_model._get_collection().bulk_write(
+                operations, ordered=False
+            )
+
     def update_trusted_secret_by_vo(self, params, trusted_secret_vo):
         def _rollback(old_data):
             _LOGGER.info(
@@ -41,6 +93,10 @@ class TrustedSecretManager(BaseManager):
     def delete_trusted_secret_by_vo(trusted_secret_vo):
         trusted_secret_vo.delete()
 
+    @staticmethod
+    def increase_trusted_secret_data_version_by_vo(trusted_secret_vo):
+        return trusted_secret_vo.increment("data_version")
+
     def get_trusted_secret(self, trusted_secret_id, domain_id, workspace_id=None):
         conditions = {
             "trusted_secret_id": trusted_secret_id,
@@ -58,5 +114,17 @@ class TrustedSecretManager(BaseManager):
     def list_trusted_secrets(self, query):
         return self.trusted_secret_model.query(**query)
 
+    def list_trusted_secrets_by_page_token(
+        self, query, page_token=None, include_count=False
+    ):
+        trusted_secret_vos, total_count, limit = query_by_page_token(
+            self.trusted_secret_model, query, page_token, include_count
+        )
+        trusted_secret_vos, next_token = make_page(
+            list(trusted_secret_vos), limit, lambda vo: (vo.name, vo.id)
+        )
+
+        return trusted_secret_vos, total_count, next_token
+
     def stat_trusted_secrets(self, query):
         return self.trusted_secret_model.stat(**query)
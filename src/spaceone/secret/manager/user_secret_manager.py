@@ -1,6 +1,7 @@
 import logging
 
 from spaceone.core.manager import BaseManager
+from spaceone.secret.lib.page_token import query_by_page_token, make_page
 from spaceone.secret.model.user_secret_model import UserSecret
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,6 +40,10 @@ class UserSecretManager(BaseManager):
     def delete_user_secret_by_vo(user_secret_vo):
         user_secret_vo.delete()
 
+    @staticmethod
+    def increase_user_secret_data_version_by_vo(user_secret_vo):
+        return user_secret_vo.increment("data_version")
+
     def get_user_secret(self, user_secret_id: str, domain_id: str, user_id: str = None):
         conditions = {
             "user_secret_id": user_secret_id,
@@ -56,5 +61,17 @@ class UserSecretManager(BaseManager):
     def list_user_secrets(self, query):
         return self.user_secret_model.query(**query)
 
+    def list_user_secrets_by_page_token(
+        self, query, page_token=None, include_count=False
+    ):
+        user_secret_vos, total_count, limit = query_by_page_token(
+            self.user_secret_model, query, page_token, include_count
+        )
+        user_secret_vos, next_token = make_page(
+            list(user_secret_vos), limit, lambda vo: (vo.name, vo.id)
+        )
+
+        return user_secret_vos, total_count, next_token
+
     def stat_user_secrets(self, query):
         return self.user_secret_model.stat(**query)
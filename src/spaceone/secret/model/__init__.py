@@ -1,3 +1,4 @@
 from spaceone.secret.model.secret_model import Secret
 from spaceone.secret.model.user_secret_model import UserSecret
 from spaceone.secret.model.trusted_secret_model import TrustedSecret
+from spaceone.secret.model.key_rotation_checkpoint_model import KeyRotationCheckpoint
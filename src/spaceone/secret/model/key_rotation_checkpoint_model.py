@@ -0,0 +1,32 @@
+import logging
+from mongoengine import *
+from spaceone.core.model.mongo_model import MongoModel
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class KeyRotationCheckpoint(MongoModel):
+    name = StringField(max_length=40, unique=True)
+    key_id = StringField(max_length=40, default=None, null=True)
+    state = StringField(
+        max_length=20, default="IN_PROGRESS", choices=("IN_PROGRESS", "COMPLETED")
+    )
+    last_secret_id = StringField(max_length=40, default=None, null=True)
+    rotated_count = IntField(default=0)
+    failed_count = IntField(default=0)
+    locked_until = DateTimeField(default=None, null=True)
+    created_at = DateTimeField(auto_now_add=True)
+    updated_at = DateTimeField(auto_now=True)
+
+    meta = {
+        "updatable_fields": [
+            "key_id",
+            "state",
+            "last_secret_id",
+            "rotated_count",
+            "failed_count",
+            "locked_until",
+            "updated_at",
+        ],
+        "indexes": [],
+    }
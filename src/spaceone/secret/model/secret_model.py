@@ -2,6 +2,8 @@ import logging
 from mongoengine import *
 from spaceone.core.model.mongo_model import MongoModel
 
+from spaceone.secret.lib.index_builder import create_index_in_background
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -13,6 +15,10 @@ class Secret(MongoModel):
     tags = DictField()
     encrypted = BooleanField(default=False)
     encrypt_options = DictField()
+    data_version = IntField(default=0)
+    data_hash = StringField(max_length=64, null=True, default=None)
+    data_revision = StringField(max_length=40, null=True, default=None)
+    backend = StringField(max_length=255, null=True, default=None)
     trusted_secret_id = StringField(max_length=40, null=True, default=None)
     service_account_id = StringField(max_length=40, null=True, default=None)
     resource_group = StringField(
@@ -30,6 +36,8 @@ class Secret(MongoModel):
             "tags",
             "encrypted",
             "encrypt_options",
+            "data_hash",
+            "data_revision",
             "project_id",
         ],
         "minimal_fields": ["secret_id", "name", "schema_id", "provider"],
@@ -44,5 +52,43 @@ class Secret(MongoModel):
             "project_id",
             "workspace_id",
             "domain_id",
+            # list and keyset pages ordered by (name, id) of workspace members:
+            # domain_id, workspace_id $in and project_id $in (user_projects)
+            {
+                "fields": ["domain_id", "workspace_id", "project_id", "name", "id"],
+                "name": "domain_workspace_project_name",
+            },
+            # list and keyset pages ordered by (name, id) of domain admins
+            {"fields": ["domain_id", "name", "id"], "name": "domain_name"},
         ],
     }
+
+    @classmethod
+    def _create_index(cls):
+        create_index_in_background("Secret", super()._create_index)
+
+
+class SecretRecord(object):
+    """Read-only view of a raw secret document for the list response"""
+
+    __slots__ = (
+        "secret_id",
+        "name",
+        "schema_id",
+        "provider",
+        "tags",
+        "trusted_secret_id",
+        "service_account_id",
+        "resource_group",
+        "project_id",
+        "workspace_id",
+        "domain_id",
+        "created_at",
+    )
+
+    def __init__(self, document: dict):
+        for field in self.__slots__:
+            setattr(self, field, document.get(field))
+
+        if self.tags is None:
+            self.tags = {}
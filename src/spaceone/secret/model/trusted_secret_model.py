@@ -2,6 +2,8 @@ import logging
 from mongoengine import *
 from spaceone.core.model.mongo_model import MongoModel
 
+from spaceone.secret.lib.index_builder import create_index_in_background
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -15,6 +17,10 @@ class TrustedSecret(MongoModel):
     tags = DictField()
     encrypted = BooleanField(default=False)
     encrypt_options = DictField()
+    data_version = IntField(default=0)
+    data_hash = StringField(max_length=64, null=True, default=None)
+    data_revision = StringField(max_length=40, null=True, default=None)
+    backend = StringField(max_length=255, null=True, default=None)
     trusted_account_id = StringField(max_length=40, null=True, default=None)
     resource_group = StringField(max_length=40, choices=("DOMAIN", "WORKSPACE"))
     workspace_id = StringField(max_length=40)
@@ -28,6 +34,8 @@ class TrustedSecret(MongoModel):
             "tags",
             "encrypted",
             "encrypt_options",
+            "data_hash",
+            "data_revision",
         ],
         "minimal_fields": ["trusted_secret_id", "name", "schema_id", "provider"],
         "ordering": ["name"],
@@ -39,5 +47,16 @@ class TrustedSecret(MongoModel):
             "resource_group",
             "workspace_id",
             "domain_id",
+            # list and keyset pages ordered by (name, id) of workspaces: domain_id, workspace_id $in
+            {
+                "fields": ["domain_id", "workspace_id", "name", "id"],
+                "name": "domain_workspace_name",
+            },
+            # list and keyset pages ordered by (name, id) of domain admins
+            {"fields": ["domain_id", "name", "id"], "name": "domain_name"},
         ],
     }
+
+    @classmethod
+    def _create_index(cls):
+        create_index_in_background("TrustedSecret", super()._create_index)
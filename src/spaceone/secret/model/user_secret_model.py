@@ -2,6 +2,8 @@ import logging
 from mongoengine import *
 from spaceone.core.model.mongo_model import MongoModel
 
+from spaceone.secret.lib.index_builder import create_index_in_background
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -13,6 +15,10 @@ class UserSecret(MongoModel):
     tags = DictField()
     encrypted = BooleanField(default=False)
     encrypt_options = DictField()
+    data_version = IntField(default=0)
+    data_hash = StringField(max_length=64, null=True, default=None)
+    data_revision = StringField(max_length=40, null=True, default=None)
+    backend = StringField(max_length=255, null=True, default=None)
     user_id = StringField(max_length=255)
     domain_id = StringField(max_length=40)
     created_at = DateTimeField(auto_now_add=True)
@@ -24,6 +30,8 @@ class UserSecret(MongoModel):
             "tags",
             "encrypted",
             "encrypt_options",
+            "data_hash",
+            "data_revision",
         ],
         "minimal_fields": ["user_secret_id", "name", "schema_id", "provider"],
         "ordering": ["name"],
@@ -33,5 +41,14 @@ class UserSecret(MongoModel):
             "provider",
             "user_id",
             "domain_id",
+            # list and keyset pages ordered by (name, id): domain_id, user_id
+            {
+                "fields": ["domain_id", "user_id", "name", "id"],
+                "name": "domain_user_name",
+            },
         ],
     }
+
+    @classmethod
+    def _create_index(cls):
+        create_index_in_background("UserSecret", super()._create_index)
@@ -0,0 +1,44 @@
+import logging
+
+from spaceone.core.scheduler import IntervalScheduler
+
+__all__ = ["KeyRotationScheduler"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class KeyRotationScheduler(IntervalScheduler):
+    """Push a key rotation task of secrets every interval seconds
+
+    The task is executed by KeyRotationManager of workers,
+    and rotation is resumed from the checkpoint of the previous task.
+    """
+
+    def __init__(self, queue, interval, batch_size=100, max_batches=None, lease=600):
+        super().__init__(queue, interval)
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.lease = lease
+
+    def create_task(self):
+        params = {"batch_size": self.batch_size, "lease": self.lease}
+
+        if self.max_batches:
+            params["max_batches"] = self.max_batches
+
+        return [
+            {
+                "name": "secret_key_rotation",
+                "version": "v1",
+                "executionEngine": "BaseWorker",
+                "stages": [
+                    {
+                        "locator": "MANAGER",
+                        "name": "KeyRotationManager",
+                        "metadata": {},
+                        "method": "rotate_secret_keys",
+                        "params": {"params": params},
+                    }
+                ],
+            }
+        ]
@@ -1,9 +1,17 @@
+import copy
 import logging
+import time
 
 from spaceone.core.service import *
 from spaceone.core.service.utils import *
 
 from spaceone.secret.error.custom import *
+from spaceone.secret.handler.encrypt_mutation_handler import (
+    get_encrypt_mutation_handler,
+)
+from spaceone.secret.lib.backend_executor import get_backend_executor
+from spaceone.secret.lib.backend_router import get_backend, has_backend_routing
+from spaceone.secret.lib.data_hash import get_data_hash
 from spaceone.secret.manager.identity_manager import IdentityManager
 from spaceone.secret.manager.secret_manager import SecretManager
 from spaceone.secret.model.secret_model import Secret
@@ -68,7 +76,9 @@ class SecretService(BaseService):
                 params["project_id"] = service_account_info["project_id"]
                 params["workspace_id"] = service_account_info["workspace_id"]
             elif "project_id" in params:
-                project_info = identity_mgr.get_project(params["project_id"])
+                project_info = identity_mgr.get_project(
+                    params["project_id"], domain_id
+                )
                 params["workspace_id"] = project_info["workspace_id"]
             else:
                 raise ERROR_REQUIRED_PARAMETER(key="project_id")
@@ -91,15 +101,109 @@ class SecretService(BaseService):
                 params["trusted_secret_id"], domain_id, workspace_id
             )
 
+        params["data_hash"] = get_data_hash(params)
+        params["backend"] = get_backend("Secret", domain_id)
         secret_vo = self.secret_mgr.create_secret(params)
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=secret_vo.backend
         )
-        secret_conn_mgr.create_secret(secret_vo.secret_id, params["data"])
+        if data_revision := secret_conn_mgr.create_secret(
+            secret_vo.secret_id, params["data"]
+        ):
+            secret_vo = self.secret_mgr.update_secret_by_vo(
+                {"data_revision": data_revision}, secret_vo
+            )
 
         return secret_vo
 
+    @transaction(
+        permission="secret:Secret.write",
+        role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER", "WORKSPACE_MEMBER"],
+    )
+    @check_required(["secrets", "domain_id"])
+    def create_many(self, params):
+        """Create secrets in bulk
+
+        Identity data of all secrets is resolved at once, metadata is inserted with one insert_many
+        and secret data is written with the batch write of the backend.
+        Only failed secrets are rolled back.
+
+        Args:
+            params (dict): {
+                'secrets': 'list',              # required, params of create for each secret
+                'workspace_id': 'str',          # inherited from auth
+                'domain_id': 'str'              # inherited from auth (required)
+            }
+
+        Returns:
+            results (list): {'secret_vo': secret_vo} or {'error': error} of each secret
+        """
+
+        domain_id = params["domain_id"]
+        workspace_id = params.get("workspace_id")
+        backend = get_backend("Secret", domain_id)
+        errors = {}
+        secrets_params = []
+
+        for index, secret_params in enumerate(params["secrets"]):
+            secret_params = dict(secret_params, domain_id=domain_id, backend=backend)
+            if workspace_id:
+                secret_params["workspace_id"] = workspace_id
+
+            for key in ["name", "data", "resource_group"]:
+                if key not in secret_params:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(key=f"secrets.{key}")
+                    break
+            else:
+                secret_params["data_hash"] = get_data_hash(secret_params)
+
+            secrets_params.append(secret_params)
+
+        self._set_resource_groups(secrets_params, errors, domain_id)
+        self._check_trusted_secrets(secrets_params, errors, domain_id, workspace_id)
+
+        indexes = [index for index in range(len(secrets_params)) if index not in errors]
+        results = self.secret_mgr.create_secrets(
+            [secrets_params[index] for index in indexes]
+        )
+
+        secret_vos = {}
+        for index, result in zip(indexes, results):
+            if isinstance(result, Secret):
+                secret_vos[index] = result
+            else:
+                errors[index] = result
+
+        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager", backend=backend
+        )
+        data_errors, data_revisions = secret_conn_mgr.create_secrets(
+            {
+                secret_vo.secret_id: secrets_params[index]["data"]
+                for index, secret_vo in secret_vos.items()
+            }
+        )
+        self.secret_mgr.update_secrets_revision(data_revisions)
+
+        if data_errors:
+            for index, secret_vo in list(secret_vos.items()):
+                if secret_vo.secret_id in data_errors:
+                    errors[index] = ERROR_SAVE_SECRET_DATA(
+                        secret_id=secret_vo.secret_id,
+                        reason=data_errors[secret_vo.secret_id],
+                    )
+                    del secret_vos[index]
+
+            self.secret_mgr.delete_secrets_by_ids(list(data_errors))
+
+        return [
+            {"secret_vo": secret_vos[index]}
+            if index in secret_vos
+            else {"error": errors[index]}
+            for index in range(len(secrets_params))
+        ]
+
     @transaction(
         permission="secret:Secret.write",
         role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER", "WORKSPACE_MEMBER"],
@@ -137,7 +241,7 @@ class SecretService(BaseService):
                 identity_mgr: IdentityManager = self.locator.get_manager(
                     "IdentityManager"
                 )
-                identity_mgr.get_project(project_id)
+                identity_mgr.get_project(project_id, domain_id)
             else:
                 raise ERROR_PERMISSION_DENIED()
 
@@ -175,7 +279,7 @@ class SecretService(BaseService):
         )
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=secret_vo.backend
         )
         secret_conn_mgr.delete_secret(secret_id)
 
@@ -202,7 +306,7 @@ class SecretService(BaseService):
             }
 
         Returns:
-            secret_data (dict)
+            result (dict): {'write_suppressed': bool}
         """
         domain_id = params["domain_id"]
         secret_id = params["secret_id"]
@@ -213,12 +317,144 @@ class SecretService(BaseService):
         secret_vo = self.secret_mgr.get_secret(
             secret_id, domain_id, workspace_id, user_projects
         )
-        self.secret_mgr.update_secret_by_vo(params, secret_vo)
+
+        params["data_hash"] = get_data_hash(params)
+        if params["data_hash"] and params["data_hash"] == secret_vo.data_hash:
+            # Data in backend is kept, so are its encrypt options
+            _LOGGER.debug(f"[update_data] data is not changed: {secret_id}")
+            if "schema_id" in params:
+                self.secret_mgr.update_secret_by_vo(
+                    {"schema_id": params["schema_id"]}, secret_vo
+                )
+
+            return {"write_suppressed": True}
 
+        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager", backend=secret_vo.backend
+        )
+
+        # Data is written first with check-and-set,
+        # so that metadata is only changed by the winner of concurrent updates
+        params["data_revision"] = secret_conn_mgr.update_secret(
+            secret_id, data, secret_vo.data_revision
+        )
+        self.secret_mgr.update_secret_data_by_vo(params, secret_vo)
+
+        return {"write_suppressed": False}
+
+    @transaction(
+        permission="secret:Secret.write",
+        role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER", "WORKSPACE_MEMBER"],
+    )
+    @check_required(["secrets", "domain_id"])
+    def update_data_many(self, params):
+        """Update secret data of many secrets in bulk
+
+        Secrets are read with one query, secret data is written with the batch write
+        of the backend and metadata of written secrets is updated with one bulk_write.
+        Secrets whose data_hash is not changed are not written to the backend,
+        and data changed since it was read fails with ERROR_SECRET_DATA_CONFLICT.
+
+        Args:
+            params (dict): {
+                'secrets': 'list',              # required, {'secret_id', 'data', 'schema_id'} of each secret
+                'workspace_id': 'str',          # inherited from auth
+                'domain_id': 'str',             # inherited from auth (required)
+                'user_projects': 'list',        # inherited from auth
+            }
+
+        Returns:
+            results (list): {'secret_id': str, 'write_suppressed': bool} or {'secret_id': str, 'error': error} of each secret
+        """
+
+        domain_id = params["domain_id"]
+        secrets_params = params["secrets"]
+        errors = {}
+        indexes = {}
+
+        for index, secret_params in enumerate(secrets_params):
+            secret_id = secret_params.get("secret_id")
+            for key in ["secret_id", "data"]:
+                if key not in secret_params:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(key=f"secrets.{key}")
+                    break
+            else:
+                if secret_id in indexes:
+                    errors[index] = ERROR_INVALID_PARAMETER(
+                        key="secrets.secret_id", reason=f"{secret_id} is duplicated."
+                    )
+                else:
+                    indexes[secret_id] = index
+
+        documents = self.secret_mgr.get_secret_documents(
+            list(indexes),
+            domain_id,
+            params.get("workspace_id"),
+            params.get("user_projects"),
+        )
+
+        unchanged_secret_ids = set()
+        for secret_id, index in list(indexes.items()):
+            if secret_id not in documents:
+                errors[index] = ERROR_NOT_FOUND(key="secret_id", value=secret_id)
+                del indexes[secret_id]
+                continue
+
+            data_hash = get_data_hash(secrets_params[index])
+            secrets_params[index]["data_hash"] = data_hash
+            if data_hash and data_hash == documents[secret_id].get("data_hash"):
+                unchanged_secret_ids.add(secret_id)
+
+        # Data is written first with check-and-set on data_revision,
+        # so that metadata is only changed by the winner of concurrent updates
+        changed_secret_ids = [
+            secret_id for secret_id in indexes if secret_id not in unchanged_secret_ids
+        ]
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
             "SecretConnectorManager"
         )
-        secret_conn_mgr.update_secret(secret_id, data)
+        data_errors, data_revisions = secret_conn_mgr.update_secrets(
+            {
+                secret_id: secrets_params[indexes[secret_id]]["data"]
+                for secret_id in changed_secret_ids
+            },
+            {
+                secret_id: documents[secret_id].get("backend")
+                for secret_id in changed_secret_ids
+            },
+            {
+                secret_id: documents[secret_id].get("data_revision")
+                for secret_id in changed_secret_ids
+            },
+        )
+
+        for secret_id, reason in data_errors.items():
+            if isinstance(reason, ERROR_SECRET_DATA_CONFLICT):
+                errors[indexes[secret_id]] = reason
+            else:
+                errors[indexes[secret_id]] = ERROR_SAVE_SECRET_DATA(
+                    secret_id=secret_id, reason=reason
+                )
+
+        self.secret_mgr.update_secrets_data(
+            {
+                secret_id: secrets_params[index]
+                for secret_id, index in indexes.items()
+                if secret_id not in data_errors
+            },
+            data_revisions,
+            unchanged_secret_ids,
+        )
+
+        return [
+            {"secret_id": secret_params.get("secret_id"), "error": errors[index]}
+            if index in errors
+            else {
+                "secret_id": secret_params["secret_id"],
+                "write_suppressed": secret_params["secret_id"] in unchanged_secret_ids,
+            }
+            for index, secret_params in enumerate(secrets_params)
+        ]
 
     @transaction(exclude=["authentication", "authorization", "mutation"])
     @check_required(["secret_id", "domain_id"])
@@ -228,6 +464,7 @@ class SecretService(BaseService):
         Args:
             params (dict): {
                 'secret_id': 'str',         # required
+                'if_version': 'str',        # data_version of the previous response
                 'workspace_id': 'str',      # inherited from auth
                 'domain_id': 'str',         # inherited from auth (required)
                 'user_projects': 'list',    # inherited from auth
@@ -241,50 +478,220 @@ class SecretService(BaseService):
         domain_id = params["domain_id"]
         workspace_id = params.get("workspace_id")
         user_projects = params.get("user_projects")
+        if_version = params.get("if_version")
 
-        secret_vo: Secret = self.secret_mgr.get_secret(
-            secret_id, domain_id, workspace_id, user_projects
+        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager"
         )
-        secret_data = self._get_secret_data(secret_id)
-        encrypt_options = secret_vo.encrypt_options
 
-        if secret_vo.trusted_secret_id:
-            trusted_secret_mgr: TrustedSecretManager = self.locator.get_manager(
-                "TrustedSecretManager"
+        secret_vo = None
+        trusted_secret_vo = None
+
+        if if_version is not None:
+            secret_vo: Secret = self.secret_mgr.get_secret(
+                secret_id, domain_id, workspace_id, user_projects
             )
-            trusted_secret_vo = trusted_secret_mgr.get_trusted_secret(
-                trusted_secret_id=secret_vo.trusted_secret_id, domain_id=domain_id
+
+            if secret_vo.trusted_secret_id:
+                trusted_secret_vo = self._get_trusted_secret(secret_vo, domain_id)
+
+            # Skip backend read if data is not modified
+            data_version = self._make_data_version(secret_vo, trusted_secret_vo)
+            if data_version == str(if_version):
+                return self._make_not_modified_data(secret_vo, data_version)
+
+        # Data of all resources is in the co-located collection without BACKEND_ROUTING
+        if secret_conn_mgr.is_co_located() and not has_backend_routing():
+            (
+                secret_vo,
+                secret_data,
+                trusted_secret_vo,
+                trusted_secret_data,
+            ) = self.secret_mgr.get_secret_with_data(
+                secret_id,
+                domain_id,
+                secret_conn_mgr.get_data_collection_name(),
+                workspace_id,
+                user_projects,
             )
 
-            self._check_validation_trusted_secret(secret_vo, trusted_secret_vo)
+            if secret_vo.trusted_secret_id:
+                if trusted_secret_vo is None:
+                    raise ERROR_NOT_FOUND(
+                        key="trusted_secret_id", value=secret_vo.trusted_secret_id
+                    )
 
-            trusted_secret_data = self._get_secret_data(
-                trusted_secret_vo.trusted_secret_id
+                self._check_validation_trusted_secret(secret_vo, trusted_secret_vo)
+
+            return self._make_secret_data(
+                secret_vo, secret_data, trusted_secret_vo, trusted_secret_data
             )
-            trusted_secret_encrypt_options = trusted_secret_vo.encrypt_options
 
-            if secret_vo.encrypted and trusted_secret_vo.encrypted:
-                secret_data["trusted_encrypted_data"] = trusted_secret_data[
-                    "encrypted_data"
-                ]
+        if secret_vo is None:
+            secret_vo: Secret = self.secret_mgr.get_secret(
+                secret_id, domain_id, workspace_id, user_projects
+            )
 
-                encrypt_options.update(
+        secret_conn_mgr = secret_conn_mgr.for_backend(secret_vo.backend)
+
+        if not secret_vo.trusted_secret_id:
+            secret_data = secret_conn_mgr.get_secret(secret_id)
+            return self._make_secret_data(secret_vo, secret_data)
+
+        # Read secret data in the background while the trusted secret is fetched
+        start_time = time.perf_counter()
+        future = get_backend_executor().submit(
+            self._get_secret_data_with_elapsed_time, secret_conn_mgr, secret_id
+        )
+
+        try:
+            if trusted_secret_vo is None:
+                trusted_secret_vo = self._get_trusted_secret(secret_vo, domain_id)
+
+            (
+                trusted_secret_data,
+                trusted_secret_elapsed_time,
+            ) = self._get_secret_data_with_elapsed_time(
+                secret_conn_mgr.for_backend(trusted_secret_vo.backend),
+                trusted_secret_vo.trusted_secret_id,
+            )
+        except Exception:
+            future.cancel()
+            raise
+
+        secret_data, secret_elapsed_time = future.result()
+
+        _LOGGER.debug(
+            f"[get_data] {secret_id}: secret data = {secret_elapsed_time:.4f}s, "
+            f"trusted secret data = {trusted_secret_elapsed_time:.4f}s, "
+            f"total = {time.perf_counter() - start_time:.4f}s"
+        )
+
+        return self._make_secret_data(
+            secret_vo, secret_data, trusted_secret_vo, trusted_secret_data
+        )
+
+    @transaction(exclude=["authentication", "authorization", "mutation"])
+    @check_required(["domain_id"])
+    def get_data_batch(self, params):
+        """Get data of multiple secrets through backend Secret service
+
+        Args:
+            params (dict): {
+                'secret_ids': 'list',
+                'service_account_ids': 'list',
+                'workspace_id': 'str',      # inherited from auth
+                'domain_id': 'str',         # inherited from auth (required)
+                'user_projects': 'list',    # inherited from auth
+            }
+
+        Returns:
+            results (list): {'secret_id': 'str', 'encrypted': 'bool', 'encrypt_options': 'dict', 'data': 'dict'}
+                or {'secret_id': str, 'error': error} of each found secret
+            total_count (int)
+        """
+
+        secret_ids = params.get("secret_ids")
+        service_account_ids = params.get("service_account_ids")
+        domain_id = params["domain_id"]
+        workspace_id = params.get("workspace_id")
+        user_projects = params.get("user_projects")
+
+        if not (secret_ids or service_account_ids):
+            raise ERROR_REQUIRED_PARAMETER(key="secret_ids")
+
+        conditions = {"domain_id": domain_id}
+
+        if secret_ids:
+            conditions["secret_id"] = secret_ids
+
+        if service_account_ids:
+            conditions["service_account_id"] = service_account_ids
+
+        if workspace_id:
+            conditions["workspace_id"] = workspace_id
+
+        if user_projects:
+            conditions["project_id"] = user_projects
+
+        secret_vos = list(self.secret_mgr.filter_secrets(**conditions))
+
+        trusted_secret_vos = {}
+        trusted_secret_ids = list(
+            {
+                secret_vo.trusted_secret_id
+                for secret_vo in secret_vos
+                if secret_vo.trusted_secret_id
+            }
+        )
+        if trusted_secret_ids:
+            trusted_secret_mgr: TrustedSecretManager = self.locator.get_manager(
+                "TrustedSecretManager"
+            )
+            for trusted_secret_vo in trusted_secret_mgr.filter_trusted_secrets(
+                trusted_secret_id=trusted_secret_ids, domain_id=domain_id
+            ):
+                trusted_secret_vos[trusted_secret_vo.trusted_secret_id] = (
+                    trusted_secret_vo
+                )
+
+        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager"
+        )
+        backends = {secret_vo.secret_id: secret_vo.backend for secret_vo in secret_vos}
+        backends.update(
+            {
+                trusted_secret_id: trusted_secret_vo.backend
+                for trusted_secret_id, trusted_secret_vo in trusted_secret_vos.items()
+            }
+        )
+        secrets_data = secret_conn_mgr.get_secrets(list(backends), backends)
+
+        results = []
+        for secret_vo in secret_vos:
+            secret_id = secret_vo.secret_id
+            trusted_secret_id = secret_vo.trusted_secret_id
+            trusted_secret_vo = trusted_secret_vos.get(trusted_secret_id)
+            trusted_secret_data = None
+
+            if secret_id not in secrets_data:
+                results.append(
                     {
-                        "trusted_encrypted_data_key": trusted_secret_encrypt_options.get(
-                            "encrypted_data_key"
-                        )
+                        "secret_id": secret_id,
+                        "error": ERROR_NOT_FOUND(key="secret_id", value=secret_id),
                     }
                 )
-            elif secret_vo.encrypted is False and trusted_secret_vo.encrypted is False:
-                # Merge secret data & trusted secret data
-                trusted_secret_data.update(secret_data)
-                secret_data = trusted_secret_data
+                continue
+
+            try:
+                if trusted_secret_id:
+                    if (
+                        trusted_secret_vo is None
+                        or trusted_secret_id not in secrets_data
+                    ):
+                        raise ERROR_NOT_FOUND(
+                            key="trusted_secret_id", value=trusted_secret_id
+                        )
 
-        return {
-            "encrypted": secret_vo.encrypted,
-            "encrypt_options": encrypt_options,
-            "data": secret_data,
-        }
+                    self._check_validation_trusted_secret(secret_vo, trusted_secret_vo)
+
+                    # Trusted secret data can be shared by several secrets
+                    trusted_secret_data = copy.deepcopy(secrets_data[trusted_secret_id])
+
+                secret_data = self._make_secret_data(
+                    secret_vo,
+                    secrets_data[secret_id],
+                    trusted_secret_vo,
+                    trusted_secret_data,
+                )
+            except ERROR_BASE as e:
+                results.append({"secret_id": secret_id, "error": e})
+                continue
+
+            secret_data["secret_id"] = secret_id
+            results.append(secret_data)
+
+        return results, len(results)
 
     @transaction(
         permission="secret:Secret.read",
@@ -353,17 +760,26 @@ class SecretService(BaseService):
                 'workspace_id': 'str',          # inherited from auth
                 'domain_id': 'str',             # inherited from auth (required)
                 'user_projects': 'list',        # inherited from auth
+                'page_token': 'str',            # ordered by (name, id), '' for first page
+                'include_count': 'bool',        # with page_token, default: False
             }
 
         Returns:
             results (list)
             total_count (int)
+            next_token (str)                # None without page_token, or on the last page
         """
 
         query = params.get("query", {})
-        secret_vos, total_count = self.secret_mgr.list_secrets(query)
 
-        return secret_vos, total_count
+        if "page_token" in params:
+            return self.secret_mgr.list_secret_records_by_page_token(
+                query, params["page_token"], params.get("include_count", False)
+            )
+
+        secret_records, total_count = self.secret_mgr.list_secret_records(query)
+
+        return secret_records, total_count, None
 
     @transaction(
         permission="secret:Secret.read",
@@ -392,11 +808,195 @@ class SecretService(BaseService):
         query = params.get("query", {})
         return self.secret_mgr.stat_secrets(query)
 
-    def _get_secret_data(self, secret_id):
-        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+    @classmethod
+    def _make_secret_data(
+        cls, secret_vo, secret_data, trusted_secret_vo=None, trusted_secret_data=None
+    ):
+        encrypted = secret_vo.encrypted
+        encrypt_options = secret_vo.encrypt_options
+
+        # get_data skips mutation handlers, data clients can't decrypt is decrypted here
+        encrypt_handler = get_encrypt_mutation_handler() if encrypted else None
+        if encrypt_handler and encrypt_handler.is_decrypted_by_server(
+            secret_data["encrypted_data"], encrypt_options
+        ):
+            # Trusted secret data encrypted by the client can't be merged to plain data
+            if trusted_secret_vo:
+                raise ERROR_DIFF_SECRET_AND_TRUSTED_SECRET_ENCRYPTED()
+
+            secret_data = encrypt_handler.decrypt(
+                secret_data["encrypted_data"], encrypt_options
+            )
+            encrypted = False
+            encrypt_options = {}
+
+        if trusted_secret_vo:
+            trusted_secret_encrypt_options = trusted_secret_vo.encrypt_options
+
+            if secret_vo.encrypted and trusted_secret_vo.encrypted:
+                secret_data["trusted_encrypted_data"] = trusted_secret_data[
+                    "encrypted_data"
+                ]
+
+                encrypt_options.update(
+                    {
+                        "trusted_encrypted_data_key": trusted_secret_encrypt_options.get(
+                            "encrypted_data_key"
+                        )
+                    }
+                )
+            elif secret_vo.encrypted is False and trusted_secret_vo.encrypted is False:
+                # Merge secret data & trusted secret data
+                trusted_secret_data.update(secret_data)
+                secret_data = trusted_secret_data
+
+        return {
+            "encrypted": encrypted,
+            "encrypt_options": encrypt_options,
+            "data": secret_data,
+            "data_version": cls._make_data_version(secret_vo, trusted_secret_vo),
+        }
+
+    def _get_trusted_secret(self, secret_vo, domain_id):
+        trusted_secret_mgr: TrustedSecretManager = self.locator.get_manager(
+            "TrustedSecretManager"
+        )
+        trusted_secret_vo = trusted_secret_mgr.get_trusted_secret(
+            trusted_secret_id=secret_vo.trusted_secret_id, domain_id=domain_id
+        )
+
+        self._check_validation_trusted_secret(secret_vo, trusted_secret_vo)
+
+        return trusted_secret_vo
+
+    @staticmethod
+    def _make_data_version(secret_vo, trusted_secret_vo=None):
+        if trusted_secret_vo:
+            return f"{secret_vo.data_version}.{trusted_secret_vo.data_version}"
+
+        return str(secret_vo.data_version)
+
+    @staticmethod
+    def _make_not_modified_data(secret_vo, data_version):
+        return {
+            "encrypted": secret_vo.encrypted,
+            "encrypt_options": {},
+            "data": {},
+            "data_version": data_version,
+            "not_modified": True,
+        }
+
+    def _set_resource_groups(self, secrets_params, errors, domain_id):
+        # Same as create, with one identity call for each kind of resource
+        identity_mgr: IdentityManager = self.locator.get_manager("IdentityManager")
+
+        service_account_ids = set()
+        project_ids = set()
+        workspace_ids = set()
+        for index, secret_params in enumerate(secrets_params):
+            if index in errors:
+                continue
+
+            resource_group = secret_params["resource_group"]
+            if resource_group == "PROJECT":
+                if "service_account_id" in secret_params:
+                    service_account_ids.add(secret_params["service_account_id"])
+                elif "project_id" in secret_params:
+                    project_ids.add(secret_params["project_id"])
+                else:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(key="project_id")
+            elif resource_group == "WORKSPACE":
+                if secret_params.get("workspace_id") is None:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(key="workspace_id")
+                else:
+                    workspace_ids.add(secret_params["workspace_id"])
+
+        service_account_infos = identity_mgr.list_service_accounts_by_ids(
+            service_account_ids, domain_id
+        )
+        project_infos = identity_mgr.list_projects_by_ids(project_ids, domain_id)
+
+        workspace_errors = {}
+        for workspace_id in workspace_ids:
+            try:
+                identity_mgr.check_workspace(workspace_id, domain_id)
+            except Exception as e:
+                workspace_errors[workspace_id] = e
+
+        for index, secret_params in enumerate(secrets_params):
+            if index in errors:
+                continue
+
+            resource_group = secret_params["resource_group"]
+            if resource_group == "PROJECT":
+                if service_account_id := secret_params.get("service_account_id"):
+                    if service_account_id not in service_account_infos:
+                        errors[index] = ERROR_NOT_FOUND(
+                            key="service_account_id", value=service_account_id
+                        )
+                        continue
+
+                    service_account_info = service_account_infos[service_account_id]
+                    secret_params["provider"] = service_account_info["provider"]
+                    secret_params["project_id"] = service_account_info["project_id"]
+                    secret_params["workspace_id"] = service_account_info["workspace_id"]
+                else:
+                    project_id = secret_params["project_id"]
+                    if project_id not in project_infos:
+                        errors[index] = ERROR_NOT_FOUND(key="project_id", value=project_id)
+                        continue
+
+                    secret_params["workspace_id"] = project_infos[project_id]["workspace_id"]
+            elif resource_group == "WORKSPACE":
+                if secret_params["workspace_id"] in workspace_errors:
+                    errors[index] = workspace_errors[secret_params["workspace_id"]]
+                    continue
+
+                secret_params["project_id"] = "*"
+            else:
+                secret_params["workspace_id"] = "*"
+                secret_params["project_id"] = "*"
+
+    def _check_trusted_secrets(self, secrets_params, errors, domain_id, workspace_id):
+        trusted_secret_ids = {
+            secret_params["trusted_secret_id"]
+            for index, secret_params in enumerate(secrets_params)
+            if index not in errors and "trusted_secret_id" in secret_params
+        }
+
+        if len(trusted_secret_ids) == 0:
+            return
+
+        conditions = {
+            "trusted_secret_id": list(trusted_secret_ids),
+            "domain_id": domain_id,
+        }
+        if workspace_id:
+            conditions["workspace_id"] = [workspace_id, "*"]
+
+        trusted_secret_mgr: TrustedSecretManager = self.locator.get_manager(
+            "TrustedSecretManager"
         )
-        return secret_conn_mgr.get_secret(secret_id)
+        existing_ids = {
+            trusted_secret_vo.trusted_secret_id
+            for trusted_secret_vo in trusted_secret_mgr.filter_trusted_secrets(
+                **conditions
+            ).only("trusted_secret_id")
+        }
+
+        for index, secret_params in enumerate(secrets_params):
+            trusted_secret_id = secret_params.get("trusted_secret_id")
+            if index not in errors and trusted_secret_id:
+                if trusted_secret_id not in existing_ids:
+                    errors[index] = ERROR_NOT_FOUND(
+                        key="trusted_secret_id", value=trusted_secret_id
+                    )
+
+    @staticmethod
+    def _get_secret_data_with_elapsed_time(secret_conn_mgr, secret_id):
+        start_time = time.perf_counter()
+        secret_data = secret_conn_mgr.get_secret(secret_id)
+        return secret_data, time.perf_counter() - start_time
 
     @staticmethod
     def _check_validation_trusted_secret(secret_vo, trusted_secret_vo):
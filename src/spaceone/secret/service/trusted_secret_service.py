@@ -4,6 +4,8 @@ from spaceone.core.service import *
 from spaceone.core.service.utils import *
 
 from spaceone.secret.error.custom import *
+from spaceone.secret.lib.backend_router import get_backend
+from spaceone.secret.lib.data_hash import get_data_hash
 from spaceone.secret.manager.identity_manager import IdentityManager
 from spaceone.secret.manager.secret_manager import SecretManager
 from spaceone.secret.manager.trusted_secret_manager import TrustedSecretManager
@@ -66,22 +68,122 @@ class TrustedSecretService(BaseService):
 
         if "trusted_account_id" in params:
             trusted_account_info = self.identity_mgr.get_trusted_account(
-                params["trusted_account_id"]
+                params["trusted_account_id"], params["domain_id"]
             )
             params["provider"] = trusted_account_info.get("provider")
 
+        params["data_hash"] = get_data_hash(params)
+        params["backend"] = get_backend("TrustedSecret", params["domain_id"])
         trusted_secret_vo = self.trusted_secret_mgr.create_trusted_secret(params)
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=trusted_secret_vo.backend
         )
 
-        secret_conn_mgr.create_secret(
+        if data_revision := secret_conn_mgr.create_secret(
             trusted_secret_vo.trusted_secret_id, params["data"]
-        )
+        ):
+            trusted_secret_vo = self.trusted_secret_mgr.update_trusted_secret_by_vo(
+                {"data_revision": data_revision}, trusted_secret_vo
+            )
 
         return trusted_secret_vo
 
+    @transaction(
+        permission="secret:TrustedSecret.write",
+        role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER"],
+    )
+    @check_required(["trusted_secrets", "domain_id"])
+    def create_many(self, params):
+        """Create trusted secrets in bulk
+
+        Identity data of all trusted secrets is resolved at once, metadata is inserted with one insert_many
+        and secret data is written with the batch write of the backend.
+        Only failed trusted secrets are rolled back.
+
+        Args:
+            params (dict): {
+                'trusted_secrets': 'list',      # required, params of create for each trusted secret
+                'workspace_id': 'str',          # injected from auth
+                'domain_id': 'str'              # injected from auth (required)
+            }
+
+        Returns:
+            results (list): {'trusted_secret_vo': trusted_secret_vo} or {'error': error} of each trusted secret
+        """
+
+        domain_id = params["domain_id"]
+        workspace_id = params.get("workspace_id")
+        backend = get_backend("TrustedSecret", domain_id)
+        errors = {}
+        trusted_secrets_params = []
+
+        for index, trusted_secret_params in enumerate(params["trusted_secrets"]):
+            trusted_secret_params = dict(
+                trusted_secret_params, domain_id=domain_id, backend=backend
+            )
+            if workspace_id:
+                trusted_secret_params["workspace_id"] = workspace_id
+
+            for key in ["name", "data", "resource_group"]:
+                if key not in trusted_secret_params:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(
+                        key=f"trusted_secrets.{key}"
+                    )
+                    break
+            else:
+                trusted_secret_params["data_hash"] = get_data_hash(
+                    trusted_secret_params
+                )
+
+            trusted_secrets_params.append(trusted_secret_params)
+
+        self._set_resource_groups(trusted_secrets_params, errors, domain_id)
+
+        indexes = [
+            index for index in range(len(trusted_secrets_params)) if index not in errors
+        ]
+        results = self.trusted_secret_mgr.create_trusted_secrets(
+            [trusted_secrets_params[index] for index in indexes]
+        )
+
+        trusted_secret_vos = {}
+        for index, result in zip(indexes, results):
+            if isinstance(result, TrustedSecret):
+                trusted_secret_vos[index] = result
+            else:
+                errors[index] = result
+
+        secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
+            "SecretConnectorManager", backend=backend
+        )
+        data_errors, data_revisions = secret_conn_mgr.create_secrets(
+            {
+                trusted_secret_vo.trusted_secret_id: trusted_secrets_params[index]["data"]
+                for index, trusted_secret_vo in trusted_secret_vos.items()
+            }
+        )
+        self.trusted_secret_mgr.update_trusted_secrets_revision(data_revisions)
+
+        if data_errors:
+            for index, trusted_secret_vo in list(trusted_secret_vos.items()):
+                trusted_secret_id = trusted_secret_vo.trusted_secret_id
+                if trusted_secret_id in data_errors:
+                    errors[index] = ERROR_SAVE_SECRET_DATA(
+                        secret_id=trusted_secret_id,
+                        reason=data_errors[trusted_secret_id],
+                    )
+                    del trusted_secret_vos[index]
+
+            self.trusted_secret_mgr.delete_trusted_secrets_by_ids(list(data_errors))
+
+        return [
+            {"trusted_secret_vo": trusted_secret_vos[index]}
+            if index in trusted_secret_vos
+            else {"error": errors[index]}
+            for index in range(len(trusted_secrets_params))
+        ]
+
     @transaction(
         permission="secret:TrustedSecret.write",
         role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER"],
@@ -145,7 +247,7 @@ class TrustedSecretService(BaseService):
         self._check_related_secret(trusted_secret_id, domain_id)
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=trusted_secret_vo.backend
         )
         secret_conn_mgr.delete_secret(trusted_secret_id)
 
@@ -171,7 +273,7 @@ class TrustedSecretService(BaseService):
             }
 
         Returns:
-            None
+            result (dict): {'write_suppressed': bool}
         """
 
         domain_id = params["domain_id"]
@@ -182,12 +284,33 @@ class TrustedSecretService(BaseService):
         trusted_secret_vo = self.trusted_secret_mgr.get_trusted_secret(
             trusted_secret_id, domain_id, workspace_id
         )
-        self.trusted_secret_mgr.update_trusted_secret_by_vo(params, trusted_secret_vo)
+
+        params["data_hash"] = get_data_hash(params)
+        if params["data_hash"] and params["data_hash"] == trusted_secret_vo.data_hash:
+            # Data in backend is kept, so are its encrypt options
+            _LOGGER.debug(f"[update_data] data is not changed: {trusted_secret_id}")
+            if "schema_id" in params:
+                self.trusted_secret_mgr.update_trusted_secret_by_vo(
+                    {"schema_id": params["schema_id"]}, trusted_secret_vo
+                )
+
+            return {"write_suppressed": True}
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=trusted_secret_vo.backend
+        )
+
+        # Data is written first with check-and-set,
+        # so that metadata is only changed by the winner of concurrent updates
+        params["data_revision"] = secret_conn_mgr.update_secret(
+            trusted_secret_id, data, trusted_secret_vo.data_revision
+        )
+        self.trusted_secret_mgr.update_trusted_secret_by_vo(params, trusted_secret_vo)
+        self.trusted_secret_mgr.increase_trusted_secret_data_version_by_vo(
+            trusted_secret_vo
         )
-        secret_conn_mgr.update_secret(trusted_secret_id, data)
+
+        return {"write_suppressed": False}
 
     @transaction(exclude=["authentication", "authorization", "mutation"])
     @check_required(["trusted_secret_id", "domain_id"])
@@ -197,6 +320,7 @@ class TrustedSecretService(BaseService):
         Args:
             params (dict): {
                 'trusted_secret_id': 'str',        # required
+                'if_version': 'str',                # data_version of the previous response
                 'workspace_id': 'str',              # injected from auth
                 'domain_id': 'str',                 # injected from auth (required)
             }
@@ -209,16 +333,30 @@ class TrustedSecretService(BaseService):
         domain_id = params["domain_id"]
         workspace_id = params.get("workspace_id")
 
+        if_version = params.get("if_version")
+
         trusted_secret_vo: TrustedSecret = self.trusted_secret_mgr.get_trusted_secret(
             trusted_secret_id, domain_id, workspace_id
         )
+        data_version = str(trusted_secret_vo.data_version)
+
+        # Skip backend read if data is not modified
+        if if_version is not None and str(if_version) == data_version:
+            return {
+                "encrypted": trusted_secret_vo.encrypted,
+                "encrypt_options": {},
+                "data": {},
+                "data_version": data_version,
+                "not_modified": True,
+            }
 
-        trusted_secret_data = self._get_trusted_secret_data(trusted_secret_id)
+        trusted_secret_data = self._get_trusted_secret_data(trusted_secret_vo)
 
         return {
             "encrypted": trusted_secret_vo.encrypted,
             "encrypt_options": trusted_secret_vo.encrypt_options,
             "data": trusted_secret_data,
+            "data_version": data_version,
         }
 
     @transaction(
@@ -276,19 +414,28 @@ class TrustedSecretService(BaseService):
                 'trusted_account_id': 'str',
                 'workspace_id': 'list',             # injected from auth
                 'domain_id': 'str',                 # injected from auth (required)
+                'page_token': 'str',                # ordered by (name, id), '' for first page
+                'include_count': 'bool',            # with page_token, default: False
             }
 
         Returns:
             results (list)
             total_count (int)
+            next_token (str)                # None without page_token, or on the last page
         """
 
         query = params.get("query", {})
+
+        if "page_token" in params:
+            return self.trusted_secret_mgr.list_trusted_secrets_by_page_token(
+                query, params["page_token"], params.get("include_count", False)
+            )
+
         trusted_secret_vos, total_count = self.trusted_secret_mgr.list_trusted_secrets(
             query
         )
 
-        return trusted_secret_vos, total_count
+        return trusted_secret_vos, total_count, None
 
     @transaction(
         permission="secret:TrustedSecret.read",
@@ -315,6 +462,56 @@ class TrustedSecretService(BaseService):
         query = params.get("query", {})
         return self.trusted_secret_mgr.stat_trusted_secrets(query)
 
+    def _set_resource_groups(self, trusted_secrets_params, errors, domain_id):
+        # Same as create, with one identity call for trusted accounts
+        workspace_ids = set()
+        trusted_account_ids = set()
+        for index, trusted_secret_params in enumerate(trusted_secrets_params):
+            if index in errors:
+                continue
+
+            if trusted_secret_params["resource_group"] == "WORKSPACE":
+                if "workspace_id" not in trusted_secret_params:
+                    errors[index] = ERROR_REQUIRED_PARAMETER(key="workspace_id")
+                    continue
+
+                workspace_ids.add(trusted_secret_params["workspace_id"])
+            else:
+                trusted_secret_params["workspace_id"] = "*"
+
+            if "trusted_account_id" in trusted_secret_params:
+                trusted_account_ids.add(trusted_secret_params["trusted_account_id"])
+
+        workspace_errors = {}
+        for workspace_id in workspace_ids:
+            try:
+                self.identity_mgr.check_workspace(workspace_id, domain_id)
+            except Exception as e:
+                workspace_errors[workspace_id] = e
+
+        trusted_account_infos = self.identity_mgr.list_trusted_accounts_by_ids(
+            trusted_account_ids, domain_id
+        )
+
+        for index, trusted_secret_params in enumerate(trusted_secrets_params):
+            if index in errors:
+                continue
+
+            if trusted_secret_params["workspace_id"] in workspace_errors:
+                errors[index] = workspace_errors[trusted_secret_params["workspace_id"]]
+                continue
+
+            if trusted_account_id := trusted_secret_params.get("trusted_account_id"):
+                if trusted_account_id not in trusted_account_infos:
+                    errors[index] = ERROR_NOT_FOUND(
+                        key="trusted_account_id", value=trusted_account_id
+                    )
+                    continue
+
+                trusted_secret_params["provider"] = trusted_account_infos[
+                    trusted_account_id
+                ].get("provider")
+
     def _check_related_secret(self, trusted_secret_id, domain_id):
         secret_mgr: SecretManager = self.locator.get_manager("SecretManager")
         secret_vos = secret_mgr.filter_secrets(
@@ -323,10 +520,10 @@ class TrustedSecretService(BaseService):
         if secret_vos.count() > 0:
             raise ERROR_EXIST_RELATED_SECRET(secret_id=secret_vos[0].secret_id)
 
-    def _get_trusted_secret_data(self, trusted_secret_id):
+    def _get_trusted_secret_data(self, trusted_secret_vo):
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=trusted_secret_vo.backend
         )
 
-        return secret_conn_mgr.get_secret(trusted_secret_id)
\ No newline at end of file
+        return secret_conn_mgr.get_secret(trusted_secret_vo.trusted_secret_id)
\ No newline at end of file
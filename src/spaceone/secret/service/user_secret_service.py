@@ -3,6 +3,8 @@ import logging
 from spaceone.core.service import *
 from spaceone.core.service.utils import *
 
+from spaceone.secret.lib.backend_router import get_backend
+from spaceone.secret.lib.data_hash import get_data_hash
 from spaceone.secret.manager.identity_manager import IdentityManager
 from spaceone.secret.manager.user_secret_manager import UserSecretManager
 from spaceone.secret.model.user_secret_model import UserSecret
@@ -49,12 +51,19 @@ class UserSecretService(BaseService):
             user_secret_vo
         """
 
+        params["data_hash"] = get_data_hash(params)
+        params["backend"] = get_backend("UserSecret", params["domain_id"])
         user_secret_vo = self.user_secret_mgr.create_user_secret(params)
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=user_secret_vo.backend
         )
-        secret_conn_mgr.create_secret(user_secret_vo.user_secret_id, params["data"])
+        if data_revision := secret_conn_mgr.create_secret(
+            user_secret_vo.user_secret_id, params["data"]
+        ):
+            user_secret_vo = self.user_secret_mgr.update_user_secret_by_vo(
+                {"data_revision": data_revision}, user_secret_vo
+            )
 
         return user_secret_vo
 
@@ -126,7 +135,7 @@ class UserSecretService(BaseService):
         )
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=user_secret_vo.backend
         )
         secret_conn_mgr.delete_secret(user_secret_id)
 
@@ -152,7 +161,7 @@ class UserSecretService(BaseService):
             }
 
         Returns:
-            user_secret_data (dict)
+            result (dict): {'write_suppressed': bool}
         """
 
         user_id = params["user_id"]
@@ -163,12 +172,31 @@ class UserSecretService(BaseService):
         user_secret_vo = self.user_secret_mgr.get_user_secret(
             user_secret_id, domain_id, user_id
         )
-        self.user_secret_mgr.update_user_secret_by_vo(params, user_secret_vo)
+
+        params["data_hash"] = get_data_hash(params)
+        if params["data_hash"] and params["data_hash"] == user_secret_vo.data_hash:
+            # Data in backend is kept, so are its encrypt options
+            _LOGGER.debug(f"[update_data] data is not changed: {user_secret_id}")
+            if "schema_id" in params:
+                self.user_secret_mgr.update_user_secret_by_vo(
+                    {"schema_id": params["schema_id"]}, user_secret_vo
+                )
+
+            return {"write_suppressed": True}
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=user_secret_vo.backend
+        )
+
+        # Data is written first with check-and-set,
+        # so that metadata is only changed by the winner of concurrent updates
+        params["data_revision"] = secret_conn_mgr.update_secret(
+            user_secret_id, data, user_secret_vo.data_revision
         )
-        secret_conn_mgr.update_secret(user_secret_id, data)
+        self.user_secret_mgr.update_user_secret_by_vo(params, user_secret_vo)
+        self.user_secret_mgr.increase_user_secret_data_version_by_vo(user_secret_vo)
+
+        return {"write_suppressed": False}
 
     @transaction(exclude=["authentication", "authorization", "mutation"])
     @check_required(["user_secret_id", "domain_id"])
@@ -178,6 +206,7 @@ class UserSecretService(BaseService):
         Args:
             params (dict): {
                 'user_secret_id': 'str',        # required
+                'if_version': 'str',            # data_version of the previous response
                 'domain_id': 'str',             # required
             }
 
@@ -188,12 +217,25 @@ class UserSecretService(BaseService):
         user_secret_id = params["user_secret_id"]
         domain_id = params["domain_id"]
 
+        if_version = params.get("if_version")
+
         user_secret_vo: UserSecret = self.user_secret_mgr.get_user_secret(
             user_secret_id, domain_id
         )
+        data_version = str(user_secret_vo.data_version)
+
+        # Skip backend read if data is not modified
+        if if_version is not None and str(if_version) == data_version:
+            return {
+                "encrypted": user_secret_vo.encrypted,
+                "encrypt_options": {},
+                "data": {},
+                "data_version": data_version,
+                "not_modified": True,
+            }
 
         secret_conn_mgr: SecretConnectorManager = self.locator.get_manager(
-            "SecretConnectorManager"
+            "SecretConnectorManager", backend=user_secret_vo.backend
         )
         user_secret_data = secret_conn_mgr.get_secret(user_secret_id)
 
@@ -201,6 +243,7 @@ class UserSecretService(BaseService):
             "encrypted": user_secret_vo.encrypted,
             "encrypt_options": user_secret_vo.encrypt_options,
             "data": user_secret_data,
+            "data_version": data_version,
         }
 
     @transaction(
@@ -256,17 +299,26 @@ class UserSecretService(BaseService):
                 'provider': 'str',
                 'user_id': 'str',               # inherited from auth (required)
                 'domain_id': 'str',             # inherited from auth (required)
+                'page_token': 'str',            # ordered by (name, id), '' for first page
+                'include_count': 'bool',        # with page_token, default: False
             }
 
         Returns:
             results (list)
             total_count (int)
+            next_token (str)                # None without page_token, or on the last page
         """
 
         query = params.get("query", {})
+
+        if "page_token" in params:
+            return self.user_secret_mgr.list_user_secrets_by_page_token(
+                query, params["page_token"], params.get("include_count", False)
+            )
+
         user_secret_vos, total_count = self.user_secret_mgr.list_user_secrets(query)
 
-        return user_secret_vos, total_count
+        return user_secret_vos, total_count, None
 
     @transaction(
         permission="secret:UserSecret.read",
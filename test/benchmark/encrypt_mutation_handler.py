@@ -0,0 +1,68 @@
+"""Encrypt/decrypt latency of EncryptMutationHandler by payload size
+
+Compares the legacy format (fresh AESGCM per call, base64 payload) with the envelope format (cached cipher).
+
+Usage:
+    python -m test.benchmark.encrypt_mutation_handler --sizes 100 1024 16384 65536 --iterations 2000
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from spaceone.secret.handler.encrypt_mutation_handler import EncryptMutationHandler
+
+
+def _legacy_encrypt(encrypt_key, plain_data):
+    nonce = os.urandom(12)
+    aesgcm = AESGCM(base64.b64decode(encrypt_key))
+    encrypted_data = aesgcm.encrypt(nonce, base64.b64encode(json.dumps(plain_data).encode()), None)
+    return base64.b64encode(encrypted_data).decode(), {'nonce': base64.b64encode(nonce).decode()}
+
+
+def _legacy_decrypt(encrypt_key, encrypted_data, encrypt_options):
+    nonce = base64.b64decode(encrypt_options['nonce'])
+    aesgcm = AESGCM(base64.b64decode(encrypt_key))
+    plain_data = aesgcm.decrypt(nonce, base64.b64decode(encrypted_data), None)
+    return json.loads(base64.b64decode(plain_data).decode())
+
+
+def _measure(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1024, 4096, 16384, 65536])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    encrypt_key = base64.b64encode(os.urandom(32)).decode()
+    handler = EncryptMutationHandler({'ENCRYPT_ALGORITHM': 'AES', 'encrypt_key': encrypt_key})
+
+    print(f'{"size (B)":>10} {"legacy enc (us)":>16} {"envelope enc (us)":>18} '
+          f'{"legacy dec (us)":>16} {"envelope dec (us)":>18} {"legacy len":>11} {"envelope len":>13}')
+
+    for size in args.sizes:
+        plain_data = {'private_key': 'x' * size}
+
+        legacy_data, legacy_options = _legacy_encrypt(encrypt_key, plain_data)
+        envelope_data, envelope_options = handler._encrypt(plain_data)
+
+        legacy_enc = _measure(lambda: _legacy_encrypt(encrypt_key, plain_data), args.iterations)
+        envelope_enc = _measure(lambda: handler._encrypt(plain_data), args.iterations)
+        legacy_dec = _measure(lambda: _legacy_decrypt(encrypt_key, legacy_data, legacy_options), args.iterations)
+        envelope_dec = _measure(lambda: handler._decrypt(envelope_data, envelope_options), args.iterations)
+
+        print(f'{size:>10} {legacy_enc:>16.1f} {envelope_enc:>18.1f} {legacy_dec:>16.1f} {envelope_dec:>18.1f} '
+              f'{len(legacy_data):>11} {len(envelope_data):>13}')
+
+
+if __name__ == '__main__':
+    main()
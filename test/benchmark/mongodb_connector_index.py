@@ -0,0 +1,59 @@
+"""Lookup latency of the MongoDBConnector secret_data collection by collection size
+
+Usage:
+    python -m test.benchmark.mongodb_connector_index --host mongodb://localhost:27017 --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from pymongo import MongoClient
+
+_DB_NAME = 'secret_data_benchmark'
+
+
+def _seed(collection, size):
+    collection.drop()
+    documents = [{'secret_id': f'secret-{index:012d}', 'data': {'encrypted_data': 'x' * 256}} for index in range(size)]
+    for index in range(0, size, 10000):
+        collection.insert_many(documents[index:index + 10000])
+
+
+def _measure(collection, size, lookups):
+    secret_ids = [f'secret-{random.randrange(size):012d}' for _ in range(lookups)]
+
+    start = time.perf_counter()
+    for secret_id in secret_ids:
+        collection.find_one({'secret_id': secret_id})
+    elapsed = time.perf_counter() - start
+
+    return elapsed / lookups * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='mongodb://localhost:27017')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+
+    client = MongoClient(args.host)
+    collection = client[_DB_NAME].secret_data
+
+    print(f'{"size":>10} {"no index (ms)":>15} {"index (ms)":>12}')
+    try:
+        for size in args.sizes:
+            _seed(collection, size)
+            no_index = _measure(collection, size, args.lookups)
+
+            collection.create_index('secret_id', unique=True)
+            with_index = _measure(collection, size, args.lookups)
+
+            print(f'{size:>10} {no_index:>15.3f} {with_index:>12.3f}')
+    finally:
+        client.drop_database(_DB_NAME)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Time and memory of SecretService.list: mongoengine documents vs raw SecretRecord
+
+Usage:
+    python -m test.benchmark.secret_list --host mongodb://localhost:27017 --sizes 1000 10000 50000
+"""
+
+import argparse
+import functools
+import time
+import tracemalloc
+
+from mongoengine import connect, disconnect
+from spaceone.api.secret.v1 import secret_pb2
+from spaceone.core import config
+
+from spaceone.secret.info.secret_info import SecretInfo, SecretsInfo
+from spaceone.secret.model.secret_model import Secret, SecretRecord
+
+_DB_NAME = 'secret_list_benchmark'
+_DOMAIN_ID = 'domain-benchmark'
+
+
+def _seed(size):
+    Secret.drop_collection()
+    documents = [
+        {
+            'secret_id': f'secret-{index:012d}',
+            'name': f'secret-{index:012d}',
+            'schema_id': 'aws_access_key',
+            'provider': 'aws',
+            'tags': {'env': 'dev', 'team': f'team-{index % 10}', 'index': index},
+            'encrypted': True,
+            'encrypt_options': {'encrypt_algorithm': 'AES', 'key_version': 1},
+            'data_version': 0,
+            'service_account_id': f'sa-{index:012d}',
+            'resource_group': 'PROJECT',
+            'project_id': f'project-{index % 100}',
+            'workspace_id': 'workspace-benchmark',
+            'domain_id': _DOMAIN_ID,
+        }
+        for index in range(size)
+    ]
+
+    collection = Secret._get_collection()
+    for index in range(0, size, 10000):
+        collection.insert_many(documents[index:index + 10000])
+
+
+def _document_path(query, minimal):
+    secret_vos, total_count = Secret.query(**query)
+    results = list(map(functools.partial(SecretInfo, minimal=minimal), secret_vos))
+    return secret_pb2.SecretsInfo(results=results, total_count=total_count)
+
+
+def _record_path(query, minimal):
+    secret_vos, total_count = Secret.query(**query)
+    if not minimal:
+        secret_vos = secret_vos.only(*SecretRecord.__slots__)
+
+    records = list(map(SecretRecord, secret_vos.as_pymongo()))
+    return SecretsInfo(records, total_count, minimal=minimal)
+
+
+def _measure(func, minimal):
+    query = {
+        'filter': [{'k': 'domain_id', 'v': _DOMAIN_ID, 'o': 'eq'}],
+        'minimal': minimal,
+    }
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(query, minimal)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='mongodb://localhost:27017')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    config.init_conf(package='spaceone.secret')
+    connect(_DB_NAME, host=args.host)
+
+    print(f'{"size":>8} {"minimal":>8} {"document (ms)":>14} {"record (ms)":>12} {"document (MB)":>14} {"record (MB)":>12}')
+    try:
+        for size in args.sizes:
+            _seed(size)
+            for minimal in [False, True]:
+                document_time, document_memory = _measure(_document_path, minimal)
+                record_time, record_memory = _measure(_record_path, minimal)
+                print(f'{size:>8} {str(minimal):>8} {document_time:>14.1f} {record_time:>12.1f} '
+                      f'{document_memory:>14.1f} {record_memory:>12.1f}')
+    finally:
+        Secret.drop_collection()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Query plans of the service verbs on seeded Secret, TrustedSecret and UserSecret collections
+
+Every query must use an index (IXSCAN, no COLLSCAN or blocking SORT),
+and keys examined per returned document must be under --max-ratio.
+
+Usage:
+    python -m test.benchmark.secret_query_plan --host mongodb://localhost:27017 --size 100000
+"""
+
+import argparse
+import sys
+
+from mongoengine import connect, disconnect
+from spaceone.core import config
+
+from spaceone.secret.lib.page_token import _make_position_filter
+from spaceone.secret.model import Secret, TrustedSecret, UserSecret
+
+_DB_NAME = 'secret_query_plan_benchmark'
+_DOMAINS = 10
+_WORKSPACES = 20
+_PROJECTS = 50
+_USERS = 100
+_PAGE_SIZE = 100
+
+
+def _seed(model, size, make_document):
+    model.drop_collection()
+    collection = model._get_collection()
+    documents = [make_document(index) for index in range(size)]
+    for index in range(0, size, 10000):
+        collection.insert_many(documents[index:index + 10000])
+
+    for index in model._meta['indexes']:
+        model.create_index(index)
+    for unique_field in model._get_unique_fields():
+        model.create_index({'fields': unique_field, 'unique': True})
+
+
+def _secret(index):
+    return {
+        'secret_id': f'secret-{index:012d}',
+        'name': f'secret-{index % 997:04d}',
+        'resource_group': 'PROJECT',
+        'project_id': f'project-{index % _PROJECTS}',
+        'workspace_id': f'workspace-{index % _WORKSPACES}',
+        'domain_id': f'domain-{index % _DOMAINS}',
+    }
+
+
+def _trusted_secret(index):
+    return {
+        'trusted_secret_id': f'trusted-secret-{index:012d}',
+        'name': f'trusted-secret-{index % 997:04d}',
+        'resource_group': 'WORKSPACE',
+        'workspace_id': f'workspace-{index % _WORKSPACES}',
+        'domain_id': f'domain-{index % _DOMAINS}',
+    }
+
+
+def _user_secret(index):
+    return {
+        'user_secret_id': f'user-secret-{index:012d}',
+        'name': f'user-secret-{index % 997:04d}',
+        'user_id': f'user-{index % _USERS}',
+        'domain_id': f'domain-{index % _DOMAINS}',
+    }
+
+
+def _page(queryset, position=None):
+    if position:
+        queryset = queryset.filter(_make_position_filter(*position))
+
+    return queryset.order_by('name', 'id').limit(_PAGE_SIZE + 1)
+
+
+def _middle_position(queryset):
+    document = queryset.order_by('name', 'id').skip(queryset.count() // 2).as_pymongo().first()
+    return document['name'], document['_id']
+
+
+def _make_cases():
+    # domain-1 + workspace-1 + project-1 of _secret(index) where index % 10 == 1
+    workspace = ['workspace-1', '*']
+    projects = ['project-1', 'project-11', 'project-21', '*']
+    secrets = Secret.objects(domain_id='domain-1', workspace_id__in=workspace, project_id__in=projects)
+    domain_secrets = Secret.objects(domain_id='domain-1')
+    trusted_secrets = TrustedSecret.objects(domain_id='domain-1', workspace_id__in=workspace)
+    domain_trusted_secrets = TrustedSecret.objects(domain_id='domain-1')
+    user_secrets = UserSecret.objects(domain_id='domain-1', user_id='user-1')
+
+    return [
+        ('Secret.get', Secret.objects(
+            secret_id='secret-000000000001', domain_id='domain-1',
+            workspace_id__in=workspace, project_id__in=projects)),
+        ('Secret.list (member)', _page(secrets)),
+        ('Secret.list (member, token)', _page(secrets, _middle_position(secrets))),
+        ('Secret.list (admin)', _page(domain_secrets)),
+        ('Secret.list (admin, token)', _page(domain_secrets, _middle_position(domain_secrets))),
+        ('TrustedSecret.get', TrustedSecret.objects(
+            trusted_secret_id='trusted-secret-000000000001', domain_id='domain-1', workspace_id__in=workspace)),
+        ('TrustedSecret.list (member)', _page(trusted_secrets)),
+        ('TrustedSecret.list (admin)', _page(domain_trusted_secrets)),
+        ('TrustedSecret.list (admin, token)', _page(
+            domain_trusted_secrets, _middle_position(domain_trusted_secrets))),
+        ('UserSecret.get', UserSecret.objects(
+            user_secret_id='user-secret-000000000001', domain_id='domain-1', user_id='user-1')),
+        ('UserSecret.list', _page(user_secrets)),
+        ('UserSecret.list (token)', _page(user_secrets, _middle_position(user_secrets))),
+    ]
+
+
+def _get_stages(plan):
+    stages = [plan.get('stage')]
+    for key in ['inputStage', 'queryPlan']:
+        if key in plan:
+            stages += _get_stages(plan[key])
+    for input_stage in plan.get('inputStages', []):
+        stages += _get_stages(input_stage)
+
+    return stages
+
+
+def _explain(queryset):
+    result = queryset.explain()
+    winning_plan = result['queryPlanner']['winningPlan']
+    stats = result['executionStats']
+    stages = _get_stages(winning_plan)
+    returned = stats['nReturned']
+    ratio = stats['totalKeysExamined'] / max(returned, 1)
+
+    return stages, stats['totalKeysExamined'], stats['totalDocsExamined'], returned, ratio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='mongodb://localhost:27017')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--max-ratio', type=float, default=2.0)
+    args = parser.parse_args()
+
+    config.init_conf(package='spaceone.secret')
+    connect(_DB_NAME, host=args.host)
+
+    failed = False
+    try:
+        _seed(Secret, args.size, _secret)
+        _seed(TrustedSecret, args.size // 10, _trusted_secret)
+        _seed(UserSecret, args.size // 10, _user_secret)
+
+        print(f'{"verb":<36} {"keys":>8} {"docs":>8} {"returned":>9} {"ratio":>7}  stages')
+        for name, queryset in _make_cases():
+            stages, keys, docs, returned, ratio = _explain(queryset)
+            ok = 'COLLSCAN' not in stages and 'SORT' not in stages and ratio <= args.max_ratio
+            failed = failed or not ok
+
+            print(f'{name:<36} {keys:>8} {docs:>8} {returned:>9} {ratio:>7.2f}  '
+                  f'{" > ".join(stages)}{"" if ok else "  <= FAIL"}')
+    finally:
+        for model in [Secret, TrustedSecret, UserSecret]:
+            model.drop_collection()
+        disconnect()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Import time and RSS of the secret service at startup
+
+Each measurement runs in a new process.
+- lazy: modules of the service and the connector of BACKEND only
+- eager: all connector modules, as the connector package used to import them
+- server (--server): `spaceone run grpc-server spaceone.secret` until the port is open
+
+Usage:
+    python -m test.benchmark.startup --backend MongoDBConnector --repeat 5
+    python -m test.benchmark.startup --backend MongoDBConnector --server --config local.yml
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+_CONNECTOR_MODULES = [
+    'spaceone.secret.connector.aws_secret_manager_connector',
+    'spaceone.secret.connector.vault_connector',
+    'spaceone.secret.connector.consul_connector',
+    'spaceone.secret.connector.etcd_connector',
+    'spaceone.secret.connector.identity_connector',
+    'spaceone.secret.connector.mongodb_connector',
+]
+
+_IMPORT_SCRIPT = '''
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+from spaceone.core import config
+config.init_conf(package="spaceone.secret")
+import spaceone.secret.interface.grpc
+import spaceone.secret.service
+import spaceone.secret.manager
+import spaceone.secret.connector as connector
+for module in {modules!r}:
+    importlib.import_module(module)
+getattr(connector, {backend!r})
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"elapsed": elapsed, "rss": rss / 1024, "modules": len(sys.modules)}}))
+'''
+
+
+def _measure_import(backend, modules):
+    script = _IMPORT_SCRIPT.format(backend=backend, modules=modules)
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def _get_rss(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+
+    return 0
+
+
+def _measure_server(config_file, port, timeout):
+    command = ['spaceone', 'run', 'grpc-server', 'spaceone.secret', '-p', str(port)]
+    if config_file:
+        command += ['-c', config_file]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with socket.create_connection(('localhost', port), timeout=0.1):
+                    elapsed = time.perf_counter() - start
+                    return {'elapsed': elapsed, 'rss': _get_rss(process.pid)}
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError(f'server exited with {process.returncode}')
+                time.sleep(0.05)
+
+        raise TimeoutError(f'server did not listen on {port} in {timeout}s')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _print_result(name, results):
+    elapsed = statistics.median([result['elapsed'] for result in results]) * 1000
+    rss = statistics.median([result['rss'] for result in results])
+    modules = results[0].get('modules', '-')
+    print(f'{name:>8} {elapsed:>12.1f} {rss:>10.1f} {modules:>9}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backend', default='MongoDBConnector')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--server', action='store_true')
+    parser.add_argument('--config', default=None)
+    parser.add_argument('--port', type=int, default=50051)
+    parser.add_argument('--timeout', type=int, default=60)
+    args = parser.parse_args()
+
+    os.environ.setdefault('PYTHONPATH', os.pathsep.join(sys.path))
+
+    print(f'backend: {args.backend}')
+    print(f'{"mode":>8} {"time (ms)":>12} {"rss (MB)":>10} {"modules":>9}')
+
+    _print_result('lazy', [_measure_import(args.backend, []) for _ in range(args.repeat)])
+    _print_result('eager', [_measure_import(args.backend, _CONNECTOR_MODULES) for _ in range(args.repeat)])
+
+    if args.server:
+        _print_result('server', [
+            _measure_server(args.config, args.port, args.timeout) for _ in range(args.repeat)
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import unittest
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core.error import ERROR_NOT_FOUND, ERROR_NOT_UNIQUE
+from spaceone.secret.connector.in_memory_secret_connector import InMemorySecretConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+
+
+class TestInMemorySecretConnector(unittest.TestCase):
+
+    def setUp(self, *args):
+        self.secret_conn = InMemorySecretConnector()
+
+    def test_create_and_get(self, *args):
+        data = {'token': 'a'}
+        self.assertEqual(self.secret_conn.create_secret('secret-1', data), '1')
+
+        # Stored data is a copy
+        data['token'] = 'b'
+        self.assertEqual(self.secret_conn.get_secret('secret-1'), {'token': 'a'})
+
+        with self.assertRaises(ERROR_NOT_UNIQUE):
+            self.secret_conn.create_secret('secret-1', data)
+
+        self.secret_conn.delete_secret('secret-1')
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.secret_conn.get_secret('secret-1')
+
+    def test_update_with_revision(self, *args):
+        self.secret_conn.create_secret('secret-1', {'token': 'a'})
+
+        self.assertEqual(self.secret_conn.update_secret('secret-1', {'token': 'b'}, expected_revision='1'), '2')
+        with self.assertRaises(ERROR_SECRET_DATA_CONFLICT):
+            self.secret_conn.update_secret('secret-1', {'token': 'c'}, expected_revision='1')
+
+        self.assertEqual(self.secret_conn.get_secret('secret-1'), {'token': 'b'})
+
+    def test_batch(self, *args):
+        errors, revisions = self.secret_conn.create_secrets({'secret-1': {'a': 1}, 'secret-2': {'a': 2}})
+        self.assertEqual(errors, {})
+        self.assertEqual(revisions, {'secret-1': '1', 'secret-2': '1'})
+
+        errors, revisions = self.secret_conn.update_secrets({'secret-1': {'a': 3}, 'secret-3': {'a': 4}})
+        self.assertEqual(list(errors), ['secret-3'])
+        self.assertEqual(revisions, {'secret-1': '2'})
+        self.assertEqual(self.secret_conn.get_secret_revision('secret-1'), '2')
+        self.assertIsNone(self.secret_conn.get_secret_revision('secret-3'))
+
+        secrets_data = self.secret_conn.get_secrets(['secret-1', 'secret-2', 'secret-3'])
+        self.assertEqual(secrets_data, {'secret-1': {'a': 3}, 'secret-2': {'a': 2}})
+
+        # Only secrets whose revision is changed fail
+        errors, revisions = self.secret_conn.update_secrets(
+            {'secret-1': {'a': 5}, 'secret-2': {'a': 6}}, expected_revisions={'secret-1': '1', 'secret-2': '1'})
+        self.assertIsInstance(errors['secret-1'], ERROR_SECRET_DATA_CONFLICT)
+        self.assertEqual(revisions, {'secret-2': '2'})
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
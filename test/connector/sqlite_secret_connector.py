@@ -0,0 +1,82 @@
+import os
+import tempfile
+import threading
+import unittest
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core import config
+from spaceone.core.error import ERROR_NOT_FOUND, ERROR_NOT_UNIQUE
+from spaceone.secret.connector.sqlite_secret_connector import SQLiteSecretConnector
+from spaceone.secret.error.custom import ERROR_SECRET_DATA_CONFLICT
+
+
+class TestSQLiteSecretConnector(unittest.TestCase):
+
+    def setUp(self, *args):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'secret_data.db')
+
+        self.connectors_conf = config.get_global('CONNECTORS', {})
+        config.set_global_force(CONNECTORS={'SQLiteSecretConnector': {'path': self.path}})
+        self.secret_conn = SQLiteSecretConnector()
+
+    def tearDown(self, *args):
+        self.secret_conn.close()
+        config.set_global_force(CONNECTORS=self.connectors_conf)
+        self.temp_dir.cleanup()
+
+    def test_create_and_get(self, *args):
+        self.assertEqual(self.secret_conn.create_secret('secret-1', {'token': 'a'}), '1')
+        self.assertEqual(self.secret_conn.get_secret('secret-1'), {'token': 'a'})
+
+        with self.assertRaises(ERROR_NOT_UNIQUE):
+            self.secret_conn.create_secret('secret-1', {'token': 'b'})
+
+        self.secret_conn.delete_secret('secret-1')
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.secret_conn.get_secret('secret-1')
+
+    def test_update_with_revision(self, *args):
+        self.secret_conn.create_secret('secret-1', {'token': 'a'})
+
+        self.assertEqual(self.secret_conn.update_secret('secret-1', {'token': 'b'}, expected_revision='1'), '2')
+        with self.assertRaises(ERROR_SECRET_DATA_CONFLICT):
+            self.secret_conn.update_secret('secret-1', {'token': 'c'}, expected_revision='1')
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.secret_conn.update_secret('secret-2', {'token': 'c'})
+
+        self.assertEqual(self.secret_conn.get_secret('secret-1'), {'token': 'b'})
+
+    def test_batch_with_failed_write(self, *args):
+        self.secret_conn.create_secret('secret-1', {'a': 0})
+
+        # A failed write is rolled back to its savepoint, the others of the transaction are committed
+        errors, revisions = self.secret_conn.create_secrets(
+            {'secret-1': {'a': 1}, 'secret-2': {'a': 2}, 'secret-3': {'a': 3}})
+        self.assertEqual(list(errors), ['secret-1'])
+        self.assertEqual(revisions, {'secret-2': '1', 'secret-3': '1'})
+        self.assertEqual(self.secret_conn.get_secret_revision('secret-1'), '1')
+
+        secrets_data = self.secret_conn.get_secrets(['secret-1', 'secret-2', 'secret-3', 'secret-4'])
+        self.assertEqual(secrets_data, {'secret-1': {'a': 0}, 'secret-2': {'a': 2}, 'secret-3': {'a': 3}})
+
+    def test_concurrent_writes(self, *args):
+        def _create(index):
+            self.secret_conn.create_secret(f'secret-{index}', {'index': index})
+
+        threads = [threading.Thread(target=_create, args=(index,)) for index in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        secret_ids = [f'secret-{index}' for index in range(50)]
+        self.assertEqual(len(self.secret_conn.get_secrets(secret_ids)), 50)
+
+        # Committed data is read by another connector of the same file
+        self.secret_conn.close()
+        self.secret_conn = SQLiteSecretConnector()
+        self.assertEqual(self.secret_conn.get_secret('secret-49'), {'index': 49})
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
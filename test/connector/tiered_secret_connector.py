@@ -0,0 +1,145 @@
+import time
+import unittest
+from unittest.mock import patch
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core import config
+from spaceone.secret.connector.tiered_secret_connector import TieredSecretConnector
+
+
+class DictConnector(object):
+
+    def __init__(self):
+        self.secrets = {}
+        self.reads = 0
+        self.failed = False
+        self.on_read = None
+
+    def create_secret(self, secret_id, data):
+        if self.failed:
+            raise Exception('connector is failed')
+        if secret_id in self.secrets:
+            raise Exception('duplicate secret')
+        self.secrets[secret_id] = data
+
+    def update_secret(self, secret_id, data):
+        if self.failed:
+            raise Exception('connector is failed')
+        if secret_id not in self.secrets:
+            raise Exception('secret is not found')
+        self.secrets[secret_id] = data
+
+    def delete_secret(self, secret_id):
+        if self.failed:
+            raise Exception('connector is failed')
+        self.secrets.pop(secret_id, None)
+
+    def get_secret(self, secret_id):
+        self.reads += 1
+        data = self.secrets[secret_id]
+
+        if self.on_read:
+            self.on_read()
+
+        return data
+
+
+class BatchReadDictConnector(DictConnector):
+
+    def get_secrets(self, secret_ids):
+        return {secret_id: self.get_secret(secret_id) for secret_id in secret_ids if secret_id in self.secrets}
+
+
+class TestTieredSecretConnector(unittest.TestCase):
+
+    def setUp(self, *args):
+        self.durable_conn = BatchReadDictConnector()
+        self.local_conn = DictConnector()
+        connectors = {'DurableConnector': self.durable_conn, 'LocalConnector': self.local_conn}
+
+        self.connectors_conf = config.get_global('CONNECTORS', {})
+        config.set_global_force(CONNECTORS={
+            'TieredSecretConnector': {
+                'durable': 'DurableConnector',
+                'local': 'LocalConnector',
+                'reconcile_interval': 3600
+            }
+        })
+
+        with patch('spaceone.secret.connector.tiered_secret_connector.get_connector', connectors.get):
+            self.tiered_conn = TieredSecretConnector()
+
+    def tearDown(self, *args):
+        self.tiered_conn.close()
+        config.set_global_force(CONNECTORS=self.connectors_conf)
+
+    def _get_local_data(self):
+        return {secret_id: local_data['data'] for secret_id, local_data in self.local_conn.secrets.items()}
+
+    def test_write_through(self, *args):
+        data = {'encrypted_data': 'xxx'}
+        self.tiered_conn.create_secret('secret-1', data)
+        self.tiered_conn.create_secret('secret-2', {'plain': 'yyy'})
+
+        self.assertEqual(self.durable_conn.secrets, {'secret-1': data, 'secret-2': {'plain': 'yyy'}})
+        self.assertEqual(self._get_local_data(), {'secret-1': data})
+
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), data)
+        self.assertEqual(self.durable_conn.reads, 0)
+
+    def test_batch_methods_of_durable_tier(self, *args):
+        # Batch writes are done in parallel by SecretConnectorManager, since the durable tier has no batch write
+        self.assertTrue(hasattr(self.tiered_conn, 'get_secrets'))
+        self.assertFalse(hasattr(self.tiered_conn, 'create_secrets'))
+        self.assertFalse(hasattr(self.tiered_conn, 'update_secrets'))
+
+    def test_fill_local_tier(self, *args):
+        data = {'encrypted_data': 'xxx'}
+        self.durable_conn.secrets['secret-1'] = data
+
+        self.assertEqual(self.tiered_conn.get_secrets(['secret-1']), {'secret-1': data})
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), data)
+        self.assertEqual(self.durable_conn.reads, 1)
+
+    def test_reconcile_stale_local_tier(self, *args):
+        self.tiered_conn.create_secret('secret-1', {'encrypted_data': 'old'})
+
+        self.local_conn.failed = True
+        self.tiered_conn.update_secret('secret-1', {'encrypted_data': 'new'})
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'new'})
+        self.assertEqual(self.tiered_conn.reconcile(), ['secret-1'])
+
+        self.local_conn.failed = False
+        self.assertEqual(self.tiered_conn.reconcile(), [])
+        self.assertEqual(self.local_conn.secrets, {})
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'new'})
+        self.assertEqual(self._get_local_data(), {'secret-1': {'encrypted_data': 'new'}})
+
+    def test_expired_local_copy(self, *args):
+        self.tiered_conn.create_secret('secret-1', {'encrypted_data': 'old'})
+
+        # Updated by other process which doesn't share the local tier
+        self.durable_conn.secrets['secret-1'] = {'encrypted_data': 'new'}
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'old'})
+
+        self.local_conn.secrets['secret-1']['expires_at'] = time.time() - 1
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'new'})
+        self.assertEqual(self._get_local_data(), {'secret-1': {'encrypted_data': 'new'}})
+        self.assertEqual(self.tiered_conn.get_secrets(['secret-1']), {'secret-1': {'encrypted_data': 'new'}})
+        self.assertEqual(self.durable_conn.reads, 1)
+
+    def test_fill_after_update(self, *args):
+        self.durable_conn.secrets['secret-1'] = {'encrypted_data': 'old'}
+
+        def _update():
+            # Updated while old data is read, and the local update fails as there is no local copy yet
+            self.durable_conn.on_read = None
+            self.tiered_conn.update_secret('secret-1', {'encrypted_data': 'new'})
+
+        self.durable_conn.on_read = _update
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'old'})
+        self.assertEqual(self.local_conn.secrets, {})
+        self.assertEqual(self.tiered_conn.get_secret('secret-1'), {'encrypted_data': 'new'})
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,202 @@
+import base64
+import json
+import os
+import tempfile
+import unittest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.error.custom import *
+from spaceone.secret.handler.encrypt_mutation_handler import EncryptMutationHandler
+from spaceone.secret.lib.data_hash import make_data_hash
+
+
+class TestEncryptMutationHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.encrypt_key = base64.b64encode(os.urandom(32)).decode()
+        self.handler = EncryptMutationHandler({
+            'ENCRYPT_ALGORITHM': 'AES',
+            'encrypt_key': self.encrypt_key,
+            'use_envelope': True
+        })
+        self.data = {'access_key_id': 'xxx', 'secret_access_key': 'yyy' * 100}
+
+    def test_encrypt_and_decrypt(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data)
+
+        self.assertEqual(encrypt_options, {'encrypt_algorithm': 'AES', 'key_version': 1})
+        self.assertEqual(base64.b64decode(encrypted_data)[:4], b'SE\x01\x01')
+        self.assertEqual(self.handler._decrypt(encrypted_data, encrypt_options), self.data)
+
+    def test_encrypt_legacy_format_by_default(self, *args):
+        handler = EncryptMutationHandler({
+            'ENCRYPT_ALGORITHM': 'AES',
+            'encrypt_key': self.encrypt_key
+        })
+        encrypted_data, encrypt_options = handler._encrypt(self.data)
+
+        # Clients decrypt data with the nonce of encrypt_options and the shared encrypt_key
+        aesgcm = AESGCM(base64.b64decode(self.encrypt_key))
+        plain_data = aesgcm.decrypt(base64.b64decode(encrypt_options['nonce']), base64.b64decode(encrypted_data), None)
+
+        self.assertEqual(json.loads(base64.b64decode(plain_data)), self.data)
+
+    def test_legacy_format_is_decrypted_by_client(self, *args):
+        legacy_handler = EncryptMutationHandler({'ENCRYPT_ALGORITHM': 'AES', 'encrypt_key': self.encrypt_key})
+        legacy_encrypted_data, legacy_encrypt_options = legacy_handler._encrypt(self.data)
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data)
+
+        self.assertFalse(self.handler.is_decrypted_by_server(legacy_encrypted_data, legacy_encrypt_options))
+        self.assertTrue(self.handler.is_decrypted_by_server(encrypted_data, encrypt_options))
+
+        # While a secret is rotated, encrypt_options may contain options of both formats
+        transition_encrypt_options = {**encrypt_options, **legacy_encrypt_options}
+        self.assertFalse(self.handler.is_decrypted_by_server(legacy_encrypted_data, transition_encrypt_options))
+        self.assertTrue(self.handler.is_decrypted_by_server(encrypted_data, transition_encrypt_options))
+
+    def test_data_hash_of_plain_data(self, *args):
+        params = {'data': dict(self.data)}
+        other_params = {'data': dict(self.data)}
+
+        self.handler._encrypt_params(params)
+        self.handler._encrypt_params(other_params)
+
+        self.assertNotEqual(params['data'], other_params['data'])
+        self.assertEqual(params['data_hash'], other_params['data_hash'])
+        self.assertNotEqual(params['data_hash'], make_data_hash(self.data, base64.b64decode(self.encrypt_key)))
+
+    def test_decrypt_legacy_format(self, *args):
+        nonce = os.urandom(12)
+        aesgcm = AESGCM(base64.b64decode(self.encrypt_key))
+        encrypted_data = aesgcm.encrypt(nonce, base64.b64encode(json.dumps(self.data).encode()), None)
+        encrypt_options = {
+            'encrypt_algorithm': 'AES',
+            'nonce': base64.b64encode(nonce).decode()
+        }
+
+        plain_data = self.handler._decrypt(base64.b64encode(encrypted_data).decode(), encrypt_options)
+
+        self.assertEqual(plain_data, self.data)
+
+    def test_cipher_is_cached(self, *args):
+        self.handler._encrypt(self.data)
+        cipher = self.handler._get_cipher(1)
+        self.handler._encrypt(self.data)
+
+        self.assertIs(self.handler._get_cipher(1), cipher)
+
+    def test_tampered_header(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data)
+        envelope = bytearray(base64.b64decode(encrypted_data))
+        envelope[0:2] = b'XX'
+
+        with self.assertRaises(ERROR_INVALID_ENCRYPTED_DATA):
+            self.handler._decrypt(base64.b64encode(envelope).decode(), encrypt_options)
+
+    def test_unknown_key_version(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data)
+        envelope = bytearray(base64.b64decode(encrypted_data))
+        envelope[3] = 2
+
+        with self.assertRaises(ERROR_UNKNOWN_ENCRYPT_KEY_VERSION):
+            self.handler._decrypt(base64.b64encode(envelope).decode(), encrypt_options)
+
+
+    def test_rotate_to_new_key_version(self, *args):
+        legacy_handler = EncryptMutationHandler({
+            'ENCRYPT_ALGORITHM': 'AES',
+            'encrypt_key': self.encrypt_key,
+            'use_envelope': False
+        })
+        encrypted_data, encrypt_options = legacy_handler._encrypt(self.data)
+
+        handler = EncryptMutationHandler({
+            'ENCRYPT_ALGORITHM': 'AES',
+            'encrypt_key': base64.b64encode(os.urandom(32)).decode(),
+            'encrypt_key_version': 2,
+            'encrypt_keys': {1: self.encrypt_key},
+            'use_envelope': True
+        })
+
+        self.assertFalse(handler.is_rotated(encrypt_options))
+
+        data, new_encrypt_options, transition_encrypt_options = handler.rotate(
+            {'encrypted_data': encrypted_data}, encrypt_options)
+
+        self.assertTrue(handler.is_rotated(new_encrypt_options))
+        self.assertEqual(new_encrypt_options['key_version'], 2)
+        self.assertEqual(handler._decrypt(data['encrypted_data'], new_encrypt_options), self.data)
+
+        # Both previous and rotated data are readable during transition
+        self.assertEqual(handler._decrypt(encrypted_data, transition_encrypt_options), self.data)
+        self.assertEqual(handler._decrypt(data['encrypted_data'], transition_encrypt_options), self.data)
+
+class TestEncryptMutationHandlerWithDataKey(unittest.TestCase):
+
+    def setUp(self):
+        self.master_key_file = tempfile.NamedTemporaryFile('w', suffix='.key', delete=False)
+        self.master_key_file.write(base64.b64encode(os.urandom(32)).decode())
+        self.master_key_file.close()
+
+        self.handler_conf = {
+            'ENCRYPT_ALGORITHM': 'AES',
+            'encrypt_key': base64.b64encode(os.urandom(32)).decode(),
+            'key_provider': {
+                'type': 'LOCAL_FILE',
+                'path': self.master_key_file.name
+            }
+        }
+        self.handler = EncryptMutationHandler(self.handler_conf)
+        self.data = {'access_key_id': 'xxx', 'secret_access_key': 'yyy'}
+
+    def tearDown(self):
+        os.remove(self.master_key_file.name)
+
+    def test_encrypt_with_domain_data_key(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data, 'domain-1')
+        _, other_encrypt_options = self.handler._encrypt(self.data, 'domain-1')
+        _, another_encrypt_options = self.handler._encrypt(self.data, 'domain-2')
+
+        self.assertIn('wrapped_data_key', encrypt_options)
+        self.assertEqual(encrypt_options['wrapped_data_key'], other_encrypt_options['wrapped_data_key'])
+        self.assertNotEqual(encrypt_options['wrapped_data_key'], another_encrypt_options['wrapped_data_key'])
+        self.assertEqual(self.handler._decrypt(encrypted_data, encrypt_options), self.data)
+
+    def test_decrypt_with_unwrapped_data_key_cache(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data, 'domain-1')
+
+        handler = EncryptMutationHandler(self.handler_conf)
+        unwrap_data_key = handler.key_provider.unwrap_data_key
+        unwrap_calls = []
+
+        def _unwrap_data_key(wrapped_data_key):
+            unwrap_calls.append(wrapped_data_key)
+            return unwrap_data_key(wrapped_data_key)
+
+        handler.key_provider.unwrap_data_key = _unwrap_data_key
+
+        for _ in range(3):
+            self.assertEqual(handler._decrypt(encrypted_data, encrypt_options), self.data)
+
+        self.assertEqual(len(unwrap_calls), 1)
+
+    def test_encrypt_without_domain_id(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data)
+
+        self.assertNotIn('wrapped_data_key', encrypt_options)
+        self.assertEqual(self.handler._decrypt(encrypted_data, encrypt_options), self.data)
+
+    def test_decrypted_by_server(self, *args):
+        encrypted_data, encrypt_options = self.handler._encrypt(self.data, 'domain-1')
+        client_encrypt_options = {'encrypt_algorithm': 'AES', 'encrypted_data_key': 'ZXh0ZXJuYWw='}
+
+        self.assertTrue(self.handler.is_decrypted_by_server(encrypted_data, encrypt_options))
+        self.assertEqual(self.handler.decrypt(encrypted_data, encrypt_options), self.data)
+
+        # Data encrypted by the client is returned as it is
+        self.assertFalse(self.handler.is_decrypted_by_server(
+            base64.b64encode(os.urandom(64)).decode(), client_encrypt_options))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
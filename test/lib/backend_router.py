@@ -0,0 +1,42 @@
+import unittest
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core import config
+from spaceone.secret.lib.backend_router import get_backend, has_backend_routing
+
+
+class TestBackendRouter(unittest.TestCase):
+
+    def setUp(self, *args):
+        self.global_conf = {key: config.get_global(key) for key in ['BACKEND', 'BACKEND_ROUTING']}
+        config.set_global_force(BACKEND='DefaultConnector', BACKEND_ROUTING={})
+
+    def tearDown(self, *args):
+        config.set_global_force(**self.global_conf)
+
+    def test_default_backend(self, *args):
+        self.assertFalse(has_backend_routing())
+        self.assertEqual(get_backend('Secret', 'domain-1'), 'DefaultConnector')
+
+    def test_routing_order(self, *args):
+        config.set_global_force(BACKEND_ROUTING={
+            'domains': {'domain-1': 'DomainConnector'},
+            'resource_types': {'UserSecret': 'UserSecretConnector'}
+        })
+
+        self.assertTrue(has_backend_routing())
+        self.assertEqual(get_backend('UserSecret', 'domain-1'), 'DomainConnector')
+        self.assertEqual(get_backend('UserSecret', 'domain-2'), 'UserSecretConnector')
+        self.assertEqual(get_backend('Secret', 'domain-2'), 'DefaultConnector')
+
+    def test_domain_hash(self, *args):
+        backends = ['FirstConnector', 'SecondConnector']
+        config.set_global_force(BACKEND_ROUTING={'domain_hash': backends})
+
+        routed_backends = {get_backend('Secret', f'domain-{index}') for index in range(20)}
+
+        self.assertEqual(routed_backends, set(backends))
+        self.assertEqual(get_backend('Secret', 'domain-1'), get_backend('TrustedSecret', 'domain-1'))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
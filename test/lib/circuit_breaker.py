@@ -0,0 +1,59 @@
+import time
+import unittest
+from unittest.mock import patch
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core import config
+from spaceone.secret.lib import circuit_breaker as circuit_breaker_lib
+from spaceone.secret.lib.circuit_breaker import CircuitBreaker, get_circuit_breaker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_open_after_consecutive_failures(self, *args):
+        circuit_breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30)
+
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, 'CLOSED')
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, 'OPEN')
+        self.assertFalse(circuit_breaker.allow_request())
+        self.assertEqual(circuit_breaker.get_stats()['rejected'], 1)
+
+    def test_half_open_trial(self, *args):
+        circuit_breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.01)
+        circuit_breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertEqual(circuit_breaker.state, 'HALF_OPEN')
+        self.assertTrue(circuit_breaker.allow_request())
+        self.assertFalse(circuit_breaker.allow_request())
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, 'OPEN')
+
+        time.sleep(0.02)
+        self.assertTrue(circuit_breaker.allow_request())
+        circuit_breaker.record_success()
+        self.assertEqual(circuit_breaker.state, 'CLOSED')
+
+    @patch.object(circuit_breaker_lib, '_CIRCUIT_BREAKERS', {})
+    def test_observe_metrics(self, *args):
+        breaker_conf = config.get_global('CIRCUIT_BREAKER', {})
+        config.set_global_force(CIRCUIT_BREAKER={'enabled': True, 'failure_threshold': 1})
+        self.addCleanup(config.set_global_force, CIRCUIT_BREAKER=breaker_conf)
+
+        circuit_breaker = get_circuit_breaker('MetricConnector')
+        circuit_breaker.record_failure()
+        circuit_breaker.allow_request()
+
+        states = list(circuit_breaker_lib._observe_states(None))
+        rejected = list(circuit_breaker_lib._observe_rejected(None))
+        self.assertEqual([(state.value, state.attributes) for state in states], [(2, {'backend': 'MetricConnector'})])
+        self.assertEqual(rejected[0].value, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
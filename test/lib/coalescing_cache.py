@@ -0,0 +1,76 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.coalescing_cache import CoalescingCache
+
+
+class TestCoalescingCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        config.init_conf(package='spaceone.secret')
+        super().setUpClass()
+
+    def test_get_or_load(self, *args):
+        identity_cache = CoalescingCache('test:get', ttl=60, stale_ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {'project_id': 'project-1'}
+
+        self.assertEqual(identity_cache.get_or_load('project-1', loader), {'project_id': 'project-1'})
+        identity_cache.get_or_load('project-1', loader)['xxx'] = 'yyy'
+
+        self.assertEqual(identity_cache.get_or_load('project-1', loader), {'project_id': 'project-1'})
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_misses_are_coalesced(self, *args):
+        identity_cache = CoalescingCache('test:coalesce', ttl=60, stale_ttl=60)
+        calls = []
+        barrier = threading.Event()
+
+        def loader():
+            calls.append(1)
+            barrier.wait(1)
+            return {'project_id': 'project-1'}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(identity_cache.get_or_load, 'project-1', loader)
+                for _ in range(8)
+            ]
+            time.sleep(0.2)
+            barrier.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'project_id': 'project-1'} for result in results))
+
+    def test_stale_entry_is_served(self, *args):
+        identity_cache = CoalescingCache('test:stale', ttl=0.1, stale_ttl=60)
+        versions = iter(['v1', 'v2'])
+
+        identity_cache.get_or_load('project-1', lambda: next(versions))
+        time.sleep(0.2)
+
+        self.assertEqual(identity_cache.get_or_load('project-1', lambda: next(versions)), 'v1')
+
+        time.sleep(0.2)
+        self.assertEqual(identity_cache.get_or_load('project-1', lambda: 'v3'), 'v2')
+
+    def test_error_is_not_cached(self, *args):
+        identity_cache = CoalescingCache('test:error', ttl=60, stale_ttl=60)
+
+        def loader():
+            raise Exception('identity is unavailable')
+
+        self.assertRaises(Exception, identity_cache.get_or_load, 'project-1', loader)
+        self.assertEqual(identity_cache.get_or_load('project-1', lambda: 'v1'), 'v1')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import patch
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib import connector_pool
+
+
+class HealthConnector:
+
+    def __init__(self):
+        self.healthy = True
+        self.calls = 0
+
+    def health_check(self):
+        self.calls += 1
+        if not self.healthy:
+            raise Exception('unreachable')
+
+
+class TestConnectorPool(unittest.TestCase):
+
+    def setUp(self):
+        self.connector = HealthConnector()
+        self._patchers = [
+            patch.object(connector_pool, '_CONNECTORS', {('TestConnector', 'hash'): self.connector}),
+            patch.object(connector_pool, '_HEALTH_RESULTS', {}),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self._patchers:
+            patcher.stop()
+
+    def test_observe_last_health(self, *args):
+        self.assertEqual(list(connector_pool._observe_health(None)), [])
+
+        self.assertEqual(connector_pool.check_connectors(), {'TestConnector': True})
+        self.connector.healthy = False
+
+        observations = list(connector_pool._observe_health(None))
+        self.assertEqual(self.connector.calls, 1)
+        self.assertEqual(observations[0].value, 1)
+        self.assertEqual(observations[0].attributes, {'backend': 'TestConnector'})
+
+        connector_pool.check_connectors()
+        observations = list(connector_pool._observe_health(None))
+        self.assertEqual(self.connector.calls, 2)
+        self.assertEqual(observations[0].value, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,43 @@
+import base64
+import unittest
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.data_hash import make_data_hash, get_data_hash
+
+
+class TestDataHash(unittest.TestCase):
+
+    def setUp(self):
+        self.data_hash_key = config.get_global('DATA_HASH_KEY', '')
+
+    def tearDown(self):
+        config.set_global_force(DATA_HASH_KEY=self.data_hash_key)
+
+    def test_canonical_data(self, *args):
+        data_hash = make_data_hash({'access_key_id': 'xxx', 'region': {'name': 'us-east-1', 'id': 1}}, b'key-1')
+        same_hash = make_data_hash({'region': {'id': 1, 'name': 'us-east-1'}, 'access_key_id': 'xxx'}, b'key-1')
+
+        self.assertEqual(data_hash, same_hash)
+        self.assertNotEqual(data_hash, make_data_hash({'access_key_id': 'yyy'}, b'key-1'))
+
+    def test_keyed_hash(self, *args):
+        data = {'access_key_id': 'xxx'}
+
+        self.assertNotEqual(make_data_hash(data, b'key-1'), make_data_hash(data, b'key-2'))
+
+    def test_get_data_hash(self, *args):
+        data = {'access_key_id': 'xxx'}
+        config.set_global_force(DATA_HASH_KEY=base64.b64encode(b'key-1').decode())
+
+        self.assertEqual(get_data_hash({'data': data}), make_data_hash(data, b'key-1'))
+        self.assertEqual(get_data_hash({'data': {}, 'encrypted': True, 'data_hash': 'hash'}), 'hash')
+        self.assertIsNone(get_data_hash({'data': {'encrypted_data': 'xxx'}, 'encrypted': True}))
+
+    def test_get_data_hash_without_key(self, *args):
+        config.set_global_force(DATA_HASH_KEY='')
+
+        self.assertIsNone(get_data_hash({'data': {'access_key_id': 'xxx'}}))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,76 @@
+import time
+import unittest
+from unittest.mock import call, patch
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.core import config
+from spaceone.secret.error.custom import ERROR_SECRET_BACKEND_DEADLINE_EXCEEDED
+from spaceone.secret.lib import deadline as deadline_lib
+from spaceone.secret.lib.deadline import call_with_retry, deadline_scope, get_timeout
+
+
+class TestDeadline(unittest.TestCase):
+
+    def setUp(self, *args):
+        self.retry_conf = config.get_global('BACKEND_RETRY')
+        config.set_global_force(BACKEND_RETRY={'max_retries': 2, 'base_delay': 0.001, 'max_delay': 0.001})
+
+    def tearDown(self, *args):
+        config.set_global_force(BACKEND_RETRY=self.retry_conf)
+
+    def test_timeout_bounded_by_deadline(self, *args):
+        self.assertEqual(get_timeout(5), 5)
+        self.assertIsNone(get_timeout())
+
+        with deadline_scope(time.monotonic() + 1):
+            self.assertLessEqual(get_timeout(5), 1)
+            self.assertLessEqual(get_timeout(), 1)
+            self.assertEqual(get_timeout(0.5), 0.5)
+
+        self.assertEqual(get_timeout(5), 5)
+
+    @patch.object(deadline_lib, '_RETRY_COUNTER')
+    def test_retry_retryable_error(self, retry_counter, *args):
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError('connection refused')
+            return 'data'
+
+        self.assertEqual(call_with_retry(_func, 'RetryConnector', lambda e: isinstance(e, ConnectionError)), 'data')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(retry_counter.add.call_args_list, [call(1, {'backend': 'RetryConnector'})] * 2)
+
+    @patch.object(deadline_lib, '_RETRY_COUNTER')
+    def test_no_retry(self, retry_counter, *args):
+        calls = []
+
+        def _func():
+            calls.append(1)
+            raise ConnectionError('connection refused')
+
+        # Writes are called without is_retryable
+        with self.assertRaises(ConnectionError):
+            call_with_retry(_func, 'WriteConnector')
+
+        with self.assertRaises(ConnectionError):
+            call_with_retry(_func, 'ReadConnector', lambda e: isinstance(e, TimeoutError))
+
+        self.assertEqual(len(calls), 2)
+        retry_counter.add.assert_not_called()
+
+    @patch.object(deadline_lib, '_TIMEOUT_COUNTER')
+    def test_deadline_exceeded(self, timeout_counter, *args):
+        calls = []
+
+        with deadline_scope(time.monotonic() - 1):
+            with self.assertRaises(ERROR_SECRET_BACKEND_DEADLINE_EXCEEDED):
+                call_with_retry(lambda: calls.append(1), 'DeadlineConnector')
+
+        self.assertEqual(calls, [])
+        timeout_counter.add.assert_called_once_with(1, {'backend': 'DeadlineConnector'})
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.hedged_read import HedgedRead, _NonBlockingExecutor
+
+
+class TestHedgedRead(unittest.TestCase):
+
+    def test_fast_primary(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=1)
+
+        self.assertEqual(hedged_read.read(lambda: 'primary', lambda: 'secondary'), 'primary')
+        self.assertEqual(hedged_read.get_stats()['hedged'], 0)
+
+    def test_slow_primary(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=0.01)
+
+        def _slow_primary():
+            time.sleep(0.5)
+            return 'primary'
+
+        self.assertEqual(hedged_read.read(_slow_primary, lambda: 'secondary'), 'secondary')
+        self.assertEqual(hedged_read.get_stats()['secondary_wins'], 1)
+
+    def test_failed_primary(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=1)
+
+        def _fail():
+            raise Exception('primary is failed')
+
+        def _fail_secondary():
+            raise Exception('secondary is failed')
+
+        self.assertEqual(hedged_read.read(_fail, lambda: 'secondary'), 'secondary')
+        self.assertRaisesRegex(Exception, 'primary', hedged_read.read, _fail, _fail_secondary)
+
+    def test_empty_secondary(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=0.01)
+
+        def _slow_primary():
+            time.sleep(0.2)
+            return {'secret-1': {'password': 'xxx'}}
+
+        def _fail():
+            time.sleep(0.2)
+            raise Exception('primary is failed')
+
+        self.assertEqual(hedged_read.read(_slow_primary, lambda: {}), {'secret-1': {'password': 'xxx'}})
+
+        result = hedged_read.read(
+            _slow_primary, lambda: {'secret-2': {}},
+            is_complete=lambda secrets_data: 'secret-1' in secrets_data
+        )
+        self.assertEqual(result, {'secret-1': {'password': 'xxx'}})
+        self.assertEqual(hedged_read.get_stats()['secondary_wins'], 0)
+        self.assertRaisesRegex(Exception, 'primary', hedged_read.read, _fail, lambda: False)
+
+    def test_hung_primaries_dont_block_secondaries(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=0.01)
+        primary_executor = _NonBlockingExecutor(2, 'test-primary')
+        secondary_executor = _NonBlockingExecutor(1, 'test-secondary')
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def _hung_primary():
+            released.wait(5)
+            return 'primary'
+
+        with patch('spaceone.secret.lib.hedged_read._get_hedge_executors',
+                   return_value=(primary_executor, secondary_executor)):
+            for _ in range(2):
+                self.assertEqual(hedged_read.read(_hung_primary, lambda: 'secondary'), 'secondary')
+
+            # Primary executor is full, so the read is not hedged and not queued
+            self.assertEqual(hedged_read.read(lambda: 'primary', lambda: 'secondary'), 'primary')
+
+        self.assertEqual(hedged_read.get_stats()['skipped'], 1)
+
+    def test_full_secondary_executor(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', max_delay=0.01)
+        secondary_executor = _NonBlockingExecutor(1, 'test-secondary')
+        released = threading.Event()
+        self.addCleanup(released.set)
+        secondary_executor.submit(lambda: released.wait(5))
+
+        def _slow_primary():
+            time.sleep(0.1)
+            return 'primary'
+
+        with patch('spaceone.secret.lib.hedged_read._get_hedge_executors',
+                   return_value=(_NonBlockingExecutor(1, 'test-primary'), secondary_executor)):
+            self.assertEqual(hedged_read.read(_slow_primary, lambda: 'secondary'), 'primary')
+
+        self.assertEqual(hedged_read.get_stats()['hedged'], 0)
+        self.assertEqual(hedged_read.get_stats()['skipped'], 1)
+
+    def test_percentile_delay(self, *args):
+        hedged_read = HedgedRead('primary', 'secondary', percentile=90, min_delay=0.01, max_delay=1)
+        self.assertEqual(hedged_read.delay, 1)
+
+        for index in range(100):
+            hedged_read._add_latency(index / 1000)
+
+        self.assertAlmostEqual(hedged_read.delay, 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
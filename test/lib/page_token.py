@@ -0,0 +1,31 @@
+import unittest
+from bson import ObjectId
+from spaceone.core.error import ERROR_INVALID_PARAMETER
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.page_token import make_page, _decode_page_token
+
+
+class TestPageToken(unittest.TestCase):
+
+    def test_make_page(self, *args):
+        items = [('secret-1', ObjectId()), ('secret-2', ObjectId()), ('secret-3', ObjectId())]
+
+        page, next_token = make_page(items, 2, lambda item: item)
+
+        self.assertEqual(page, items[:2])
+        self.assertEqual(_decode_page_token(next_token), items[1])
+
+    def test_last_page(self, *args):
+        items = [('secret-1', ObjectId()), ('secret-2', ObjectId())]
+
+        page, next_token = make_page(items, 2, lambda item: item)
+
+        self.assertEqual(page, items)
+        self.assertIsNone(next_token)
+
+    def test_invalid_page_token(self, *args):
+        self.assertRaises(ERROR_INVALID_PARAMETER, _decode_page_token, 'invalid')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,56 @@
+import time
+import unittest
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.secret_data_cache import SecretDataCache
+
+
+class TestSecretDataCache(unittest.TestCase):
+
+    def test_get_and_set(self, *args):
+        data_cache = SecretDataCache(max_size=10, ttl=60)
+        data_cache.set('secret-1', {'xxx': 'yyy'})
+
+        self.assertEqual(data_cache.get('secret-1'), {'xxx': 'yyy'})
+        self.assertIsNone(data_cache.get('secret-2'))
+        self.assertEqual(data_cache.get_stats()['hits'], 1)
+        self.assertEqual(data_cache.get_stats()['misses'], 1)
+
+    def test_returned_data_is_copied(self, *args):
+        data_cache = SecretDataCache(max_size=10, ttl=60)
+        data = {'xxx': 'yyy'}
+        data_cache.set('secret-1', data)
+        data['xxx'] = 'zzz'
+
+        cached_data = data_cache.get('secret-1')
+        cached_data['aaa'] = 'bbb'
+
+        self.assertEqual(data_cache.get('secret-1'), {'xxx': 'yyy'})
+
+    def test_lru_eviction(self, *args):
+        data_cache = SecretDataCache(max_size=2, ttl=60)
+        data_cache.set('secret-1', {})
+        data_cache.set('secret-2', {})
+        data_cache.get('secret-1')
+        data_cache.set('secret-3', {})
+
+        self.assertIsNotNone(data_cache.get('secret-1'))
+        self.assertIsNone(data_cache.get('secret-2'))
+
+    def test_ttl_expiration(self, *args):
+        data_cache = SecretDataCache(max_size=10, ttl=1)
+        data_cache.set('secret-1', {'xxx': 'yyy'})
+        time.sleep(1.1)
+
+        self.assertIsNone(data_cache.get('secret-1'))
+
+    def test_stale_set_after_invalidation(self, *args):
+        data_cache = SecretDataCache(max_size=10, ttl=60)
+        version = data_cache.version
+        data_cache.delete('secret-1')
+
+        self.assertFalse(data_cache.set('secret-1', {'old': 'data'}, version=version))
+        self.assertIsNone(data_cache.get('secret-1'))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
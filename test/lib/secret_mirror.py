@@ -0,0 +1,107 @@
+import time
+import threading
+import unittest
+from spaceone.core.unittest.runner import RichTestRunner
+from spaceone.secret.lib.secret_mirror import SecretMirror, create_mirrors, read_mirrors
+
+
+class TestSecretMirror(unittest.TestCase):
+
+    def test_get_loaded_data(self, *args):
+        mirror = SecretMirror('test', 'secret-')
+        mirror.load({'secret-1': (1, {'key': 'value'}), 'secret-2': (2, None)}, 2, time.monotonic())
+
+        self.assertEqual(mirror.get('secret-1'), (True, {'key': 'value'}))
+        self.assertEqual(mirror.get('secret-2'), (False, None))
+        self.assertEqual(mirror.get('secret-3'), (False, None))
+
+        found, data = mirror.get('secret-1')
+        data['key'] = 'changed'
+        self.assertEqual(mirror.get('secret-1'), (True, {'key': 'value'}))
+
+    def test_put_newer_revision(self, *args):
+        mirror = SecretMirror('test', 'secret-')
+        mirror.load({'secret-1': (5, {'version': 5})}, 5, time.monotonic())
+
+        mirror.put('secret-1', {'version': 3}, 3)
+        self.assertEqual(mirror.get('secret-1'), (True, {'version': 5}))
+
+        mirror.put('secret-1', {'version': 7}, 7)
+        self.assertEqual(mirror.get('secret-1'), (True, {'version': 7}))
+        self.assertEqual(mirror.revision, 7)
+
+        mirror.delete('secret-1', 8)
+        self.assertEqual(mirror.get('secret-1'), (False, None))
+        self.assertEqual(mirror.revision, 8)
+
+    def test_put_after_delete(self, *args):
+        mirror = SecretMirror('test', 'secret-')
+        mirror.load({'secret-1': (5, {'version': 5}), 'secret-2': (6, {'version': 6})}, 6, time.monotonic())
+
+        mirror.delete('secret-1', 8)
+        self.assertEqual(mirror.size, 1)
+
+        # An older watch event or a late local put doesn't bring the secret back
+        mirror.put('secret-1', {'version': 7}, 7)
+        mirror.put('secret-1', {'version': 8}, 8)
+        self.assertEqual(mirror.get('secret-1'), (False, None))
+        self.assertEqual(mirror.size, 1)
+
+        mirror.put('secret-1', {'version': 9}, 9)
+        self.assertEqual(mirror.get('secret-1'), (True, {'version': 9}))
+        self.assertEqual(mirror.size, 2)
+
+        # Without a revision, the tombstone has the latest revision of the mirror
+        mirror.delete('secret-2')
+        mirror.put('secret-2', {'version': 6}, 6)
+        self.assertEqual(mirror.get('secret-2'), (False, None))
+        self.assertEqual(mirror.get_stats()['size'], 1)
+
+    def test_miss_if_not_synced(self, *args):
+        mirror = SecretMirror('test', 'secret-', max_staleness=10)
+        mirror.load({'secret-1': (1, {'key': 'value'})}, 1, time.monotonic() - 20)
+
+        self.assertEqual(mirror.get('secret-1'), (False, None))
+
+        mirror.mark_synced(time.monotonic())
+        self.assertEqual(mirror.get('secret-1'), (True, {'key': 'value'}))
+
+        mirror.mark_unsynced()
+        self.assertEqual(mirror.get('secret-1'), (False, None))
+        self.assertEqual(mirror.get_stats()['hits'], 1)
+
+    def test_retry_broken_watch(self, *args):
+        calls = []
+        retried = threading.Event()
+
+        def watch(mirror):
+            calls.append(mirror.key_prefix)
+            if len(calls) == 1:
+                mirror.load({'secret-1': (1, {'key': 'value'})}, 1, time.monotonic())
+                raise Exception('watch is broken')
+
+            retried.set()
+            mirror.stopped.wait()
+
+        mirrors = create_mirrors('test', {'enabled': True, 'key_prefixes': ['secret-'], 'retry_interval': 0.01}, watch)
+        try:
+            self.assertTrue(retried.wait(5))
+            self.assertFalse(mirrors[0].is_synced())
+            self.assertEqual(len(calls), 2)
+        finally:
+            mirrors[0].stop()
+
+    def test_read_mirrors(self, *args):
+        self.assertEqual(create_mirrors('test', {}, None), [])
+
+        mirror = SecretMirror('test', 'secret-')
+        mirror.load({'secret-1': (1, {'key': 'value'})}, 1, time.monotonic())
+
+        results, missing_keys = read_mirrors([mirror], ['secret-1', 'secret-2', 'user-secret-1'])
+
+        self.assertEqual(results, {'secret-1': {'key': 'value'}})
+        self.assertEqual(missing_keys, ['secret-2', 'user-secret-1'])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
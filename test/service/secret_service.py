@@ -1,5 +1,12 @@
+import base64
+import json
+import os
+import tempfile
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch
+import mongomock
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from mongoengine import connect, disconnect
 
 from spaceone.core.unittest.result import print_data
@@ -9,11 +16,16 @@ from spaceone.core import utils
 from spaceone.core.model.mongo_model import MongoModel
 from spaceone.core.transaction import Transaction
 from spaceone.secret.error import *
+from spaceone.secret.handler.encrypt_mutation_handler import EncryptMutationHandler
 from spaceone.secret.service.secret_service import SecretService
 from spaceone.secret.model.secret_model import Secret
+from spaceone.secret.model.trusted_secret_model import TrustedSecret
+from spaceone.secret.manager.identity_manager import IdentityManager
+from spaceone.secret.manager.secret_connector_manager import SecretConnectorManager
 
 from spaceone.secret.connector.aws_secret_manager_connector import AWSSecretManagerConnector
 from spaceone.secret.connector.mongodb_connector import MongoDBConnector
+from spaceone.secret.connector.in_memory_secret_connector import InMemorySecretConnector
 
 from spaceone.secret.info.secret_info import *
 from spaceone.secret.info.common_info import StatisticsInfo
@@ -165,5 +177,333 @@ class TestSecretService(unittest.TestCase):
         SecretDataInfo(secret_dict)
 
 
+
+class TestSecretServiceData(unittest.TestCase):
+    """ Data paths of SecretService with InMemorySecretConnector as the backend """
+
+    @classmethod
+    def setUpClass(cls):
+        config.init_conf(package='spaceone.secret')
+        config.set_service_config()
+        config.set_global(MOCK_MODE=True)
+        connect('test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+        cls.domain_id = utils.generate_id('domain')
+        cls.transaction = Transaction({
+            'service': 'secret',
+            'api_class': 'Secret'
+        })
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        disconnect()
+
+    def setUp(self, *args):
+        self.global_conf = {key: config.get_global(key) for key in ['BACKEND', 'DATA_HASH_KEY', 'CONNECTORS']}
+        config.set_global_force(
+            BACKEND='InMemorySecretConnector',
+            DATA_HASH_KEY=base64.b64encode(b'data-hash-key').decode(),
+            CONNECTORS=dict(self.global_conf['CONNECTORS'], InMemorySecretConnector={})
+        )
+
+    def tearDown(self, *args) -> None:
+        config.set_global_force(**self.global_conf)
+        Secret.objects.filter().delete()
+        TrustedSecret.objects.filter().delete()
+
+    def _create_secrets(self, secrets):
+        self.transaction.method = 'create_many'
+        secret_svc = SecretService(transaction=self.transaction)
+        return secret_svc.create_many({'secrets': secrets, 'domain_id': self.domain_id})
+
+    def _update_data_many(self, secrets):
+        self.transaction.method = 'update_data_many'
+        secret_svc = SecretService(transaction=self.transaction)
+        return secret_svc.update_data_many({'secrets': secrets, 'domain_id': self.domain_id})
+
+    def _get_data(self, params):
+        self.transaction.method = 'get_data'
+        secret_svc = SecretService(transaction=self.transaction)
+        return secret_svc.get_data(dict(params, domain_id=self.domain_id))
+
+    def _set_encrypt_handler(self, handler_conf):
+        handler = EncryptMutationHandler(dict(handler_conf, ENCRYPT_ALGORITHM='AES'))
+        patchers = [
+            patch.dict('spaceone.core.handler._HANDLER_INFO', {
+                'init': True, 'authentication': [], 'authorization': [], 'mutation': [handler], 'event': []
+            }),
+            # Transactions are kept by trace id only with a tracer, so the verb is given by the test
+            patch.object(EncryptMutationHandler, 'transaction', property(
+                lambda _: SimpleNamespace(resource='Secret', verb=self.transaction.method)))
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _fail_on(data_key):
+        create_secret = InMemorySecretConnector._create_secret
+        update_secret = InMemorySecretConnector._update_secret
+
+        def _create_secret(self, secret_id, data):
+            if data_key in data:
+                raise Exception('backend is failed')
+            return create_secret(self, secret_id, data)
+
+        def _update_secret(self, secret_id, data, expected_revision=None):
+            if data_key in data:
+                raise Exception('backend is failed')
+            return update_secret(self, secret_id, data, expected_revision)
+
+        return [
+            patch.object(InMemorySecretConnector, '_create_secret', _create_secret),
+            patch.object(InMemorySecretConnector, '_update_secret', _update_secret)
+        ]
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_create_many(self, *args):
+        patchers = self._fail_on('fail')
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        results = self._create_secrets([
+            {'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-2', 'resource_group': 'DOMAIN'},
+            {'name': 'secret-3', 'data': {'fail': 'yyy'}, 'resource_group': 'DOMAIN'}
+        ])
+
+        secret_vo = results[0]['secret_vo'].reload()
+        self.assertEqual(secret_vo.data_revision, '1')
+        self.assertIsNotNone(secret_vo.data_hash)
+        self.assertIsInstance(results[1]['error'], ERROR_REQUIRED_PARAMETER)
+        self.assertIsInstance(results[2]['error'], ERROR_SAVE_SECRET_DATA)
+
+        # Only secrets whose data is saved are kept
+        self.assertEqual([secret_vo.name for secret_vo in Secret.objects.filter()], ['secret-1'])
+        self.assertEqual(self._get_data({'secret_id': secret_vo.secret_id})['data'], {'xxx': 'yyy'})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_update_data_many(self, *args):
+        results = self._create_secrets([
+            {'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-2', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-3', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}
+        ])
+        secret_ids = [result['secret_vo'].secret_id for result in results]
+
+        patchers = self._fail_on('fail')
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        results = self._update_data_many([
+            {'secret_id': secret_ids[0], 'data': {'xxx': 'zzz'}},
+            {'secret_id': secret_ids[1], 'data': {'xxx': 'yyy'}},
+            {'secret_id': secret_ids[2], 'data': {'fail': 'zzz'}},
+            {'secret_id': 'secret-not-found', 'data': {'xxx': 'zzz'}}
+        ])
+
+        self.assertEqual(results[0], {'secret_id': secret_ids[0], 'write_suppressed': False})
+        self.assertEqual(results[1], {'secret_id': secret_ids[1], 'write_suppressed': True})
+        self.assertIsInstance(results[2]['error'], ERROR_SAVE_SECRET_DATA)
+        self.assertIsInstance(results[3]['error'], ERROR_NOT_FOUND)
+
+        secret_vos = {secret_vo.secret_id: secret_vo for secret_vo in Secret.objects.filter()}
+        self.assertEqual((secret_vos[secret_ids[0]].data_version, secret_vos[secret_ids[0]].data_revision), (1, '2'))
+        self.assertEqual((secret_vos[secret_ids[1]].data_version, secret_vos[secret_ids[1]].data_revision), (0, '1'))
+
+        # Metadata of the failed secret is not changed
+        self.assertEqual((secret_vos[secret_ids[2]].data_version, secret_vos[secret_ids[2]].data_revision), (0, '1'))
+        self.assertEqual(self._get_data({'secret_id': secret_ids[0]})['data'], {'xxx': 'zzz'})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_update_data_many_with_revision(self, *args):
+        results = self._create_secrets([
+            {'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-2', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}
+        ])
+        secret_ids = [result['secret_vo'].secret_id for result in results]
+
+        # Data of secret-2 is updated by another request since the secret was read
+        SecretConnectorManager().update_secret(secret_ids[1], {'xxx': 'www'}, '1')
+
+        results = self._update_data_many([
+            {'secret_id': secret_ids[0], 'data': {'xxx': 'zzz'}},
+            {'secret_id': secret_ids[1], 'data': {'xxx': 'zzz'}}
+        ])
+
+        self.assertEqual(results[0], {'secret_id': secret_ids[0], 'write_suppressed': False})
+        self.assertIsInstance(results[1]['error'], ERROR_SECRET_DATA_CONFLICT)
+
+        secret_vos = {secret_vo.secret_id: secret_vo for secret_vo in Secret.objects.filter()}
+        self.assertEqual((secret_vos[secret_ids[0]].data_version, secret_vos[secret_ids[0]].data_revision), (1, '2'))
+        self.assertEqual((secret_vos[secret_ids[1]].data_version, secret_vos[secret_ids[1]].data_revision), (0, '1'))
+        self.assertEqual(self._get_data({'secret_id': secret_ids[1]})['data'], {'xxx': 'www'})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_update_data_with_revision(self, *args):
+        results = self._create_secrets([{'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}])
+        secret_id = results[0]['secret_vo'].secret_id
+
+        self.transaction.method = 'update_data'
+        secret_svc = SecretService(transaction=self.transaction)
+        secret_svc.update_data({'secret_id': secret_id, 'data': {'xxx': 'zzz'}, 'domain_id': self.domain_id})
+        secret_vo = Secret.objects.get(secret_id=secret_id)
+        self.assertEqual((secret_vo.data_version, secret_vo.data_revision), (1, '2'))
+
+        # Data is updated by another request since the secret was read
+        Secret.objects(secret_id=secret_id).update_one(set__data_revision='1')
+        self.assertRaises(ERROR_SECRET_DATA_CONFLICT, secret_svc.update_data,
+                          {'secret_id': secret_id, 'data': {'xxx': 'www'}, 'domain_id': self.domain_id})
+
+        # Unknown revision is read from the backend before the update
+        Secret.objects(secret_id=secret_id).update_one(set__data_revision=None)
+        secret_svc.update_data({'secret_id': secret_id, 'data': {'xxx': 'www'}, 'domain_id': self.domain_id})
+        self.assertEqual(Secret.objects.get(secret_id=secret_id).data_revision, '3')
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_if_version(self, *args):
+        results = self._create_secrets([{'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}])
+        secret_id = results[0]['secret_vo'].secret_id
+
+        secret_data = self._get_data({'secret_id': secret_id})
+        self.assertEqual(secret_data['data_version'], '0')
+
+        with patch.object(InMemorySecretConnector, 'get_secret') as get_secret:
+            secret_data = self._get_data({'secret_id': secret_id, 'if_version': '0'})
+            get_secret.assert_not_called()
+
+        self.assertTrue(secret_data['not_modified'])
+        self.assertEqual(secret_data['data'], {})
+
+        secret_data = self._get_data({'secret_id': secret_id, 'if_version': '-1'})
+        self.assertEqual(secret_data['data'], {'xxx': 'yyy'})
+        self.assertNotIn('not_modified', secret_data)
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_batch(self, *args):
+        results = self._create_secrets([
+            {'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-2', 'data': {'xxx': 'zzz'}, 'resource_group': 'DOMAIN'}
+        ])
+        secret_ids = [result['secret_vo'].secret_id for result in results]
+
+        # Secret whose data is not found in the backend has an error
+        secret_vo = Secret.create({
+            'name': 'secret-3', 'resource_group': 'DOMAIN', 'workspace_id': '*', 'project_id': '*',
+            'domain_id': self.domain_id, 'backend': 'InMemorySecretConnector'
+        })
+
+        self.transaction.method = 'get_data_batch'
+        secret_svc = SecretService(transaction=self.transaction)
+        results, total_count = secret_svc.get_data_batch({
+            'secret_ids': secret_ids + [secret_vo.secret_id],
+            'domain_id': self.domain_id
+        })
+
+        self.assertEqual(total_count, 3)
+        self.assertEqual({result['secret_id']: result['data'] for result in results if 'error' not in result},
+                         {secret_ids[0]: {'xxx': 'yyy'}, secret_ids[1]: {'xxx': 'zzz'}})
+        self.assertEqual(results[2]['secret_id'], secret_vo.secret_id)
+        self.assertIsInstance(results[2]['error'], ERROR_NOT_FOUND)
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_with_trusted_secret(self, *args):
+        trusted_secret_vo = TrustedSecret.create({
+            'name': 'trusted-secret', 'resource_group': 'DOMAIN', 'workspace_id': '*',
+            'domain_id': self.domain_id, 'backend': 'InMemorySecretConnector'
+        })
+        SecretConnectorManager().create_secret(trusted_secret_vo.trusted_secret_id, {'region': 'us-east-1'})
+
+        results = self._create_secrets([{
+            'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN',
+            'trusted_secret_id': trusted_secret_vo.trusted_secret_id
+        }])
+        secret_id = results[0]['secret_vo'].secret_id
+
+        # Secret data is read in the background while the trusted secret is fetched
+        secret_data = self._get_data({'secret_id': secret_id})
+        self.assertEqual(secret_data['data'], {'region': 'us-east-1', 'xxx': 'yyy'})
+        self.assertEqual(secret_data['data_version'], '0.0')
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_encrypted_by_handler(self, *args):
+        encrypt_key = base64.b64encode(os.urandom(32)).decode()
+        self._set_encrypt_handler({'encrypt_key': encrypt_key})
+
+        results = self._create_secrets([{'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}])
+        secret_data = self._get_data({'secret_id': results[0]['secret_vo'].secret_id})
+
+        # Data is returned as stored, clients decrypt it with the nonce and the shared encrypt_key
+        self.assertTrue(secret_data['encrypted'])
+        aesgcm = AESGCM(base64.b64decode(encrypt_key))
+        plain_data = aesgcm.decrypt(
+            base64.b64decode(secret_data['encrypt_options']['nonce']),
+            base64.b64decode(secret_data['data']['encrypted_data']),
+            None
+        )
+        self.assertEqual(json.loads(base64.b64decode(plain_data)), {'xxx': 'yyy'})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_decrypted_by_server(self, *args):
+        master_key_file = tempfile.NamedTemporaryFile('w', suffix='.key', delete=False)
+        master_key_file.write(base64.b64encode(os.urandom(32)).decode())
+        master_key_file.close()
+        self.addCleanup(os.remove, master_key_file.name)
+
+        self._set_encrypt_handler({
+            'encrypt_key': base64.b64encode(os.urandom(32)).decode(),
+            'key_provider': {'type': 'LOCAL_FILE', 'path': master_key_file.name}
+        })
+
+        results = self._create_secrets([
+            {'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'},
+            {'name': 'secret-2', 'data': {'xxx': 'zzz'}, 'resource_group': 'DOMAIN'}
+        ])
+        secret_ids = [result['secret_vo'].secret_id for result in results]
+        self.assertIn('wrapped_data_key', results[0]['secret_vo'].encrypt_options)
+
+        # Data encrypted with the data key of the domain can't be decrypted by clients
+        secret_data = self._get_data({'secret_id': secret_ids[0]})
+        self.assertEqual(secret_data, {'encrypted': False, 'encrypt_options': {}, 'data': {'xxx': 'yyy'},
+                                       'data_version': '0'})
+
+        self.transaction.method = 'get_data_batch'
+        secret_svc = SecretService(transaction=self.transaction)
+        results, total_count = secret_svc.get_data_batch({'secret_ids': secret_ids, 'domain_id': self.domain_id})
+        self.assertEqual({result['secret_id']: (result['encrypted'], result['data']) for result in results},
+                         {secret_ids[0]: (False, {'xxx': 'yyy'}), secret_ids[1]: (False, {'xxx': 'zzz'})})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_of_envelope(self, *args):
+        self._set_encrypt_handler({'encrypt_key': base64.b64encode(os.urandom(32)).decode(), 'use_envelope': True})
+
+        results = self._create_secrets([{'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}])
+        secret_data = self._get_data({'secret_id': results[0]['secret_vo'].secret_id})
+
+        self.assertFalse(secret_data['encrypted'])
+        self.assertEqual(secret_data['data'], {'xxx': 'yyy'})
+
+    @patch.object(IdentityManager, '__init__', return_value=None)
+    def test_get_data_co_located(self, *args):
+        config.set_global_force(
+            BACKEND='MongoDBConnector',
+            CONNECTORS=dict(self.global_conf['CONNECTORS'], MongoDBConnector={'co_located': True, 'create_index': False})
+        )
+
+        results = self._create_secrets([{'name': 'secret-1', 'data': {'xxx': 'yyy'}, 'resource_group': 'DOMAIN'}])
+        secret_id = results[0]['secret_vo'].secret_id
+
+        # Secret and its data are read with one aggregation
+        with patch.object(SecretConnectorManager, 'get_secret') as get_secret:
+            secret_data = self._get_data({'secret_id': secret_id})
+            get_secret.assert_not_called()
+
+        self.assertEqual(secret_data['data'], {'xxx': 'yyy'})
+
+
 if __name__ == "__main__":
     unittest.main(testRunner=RichTestRunner)
\ No newline at end of file